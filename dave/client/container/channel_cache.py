@@ -0,0 +1,67 @@
+from __future__ import annotations
+from typing import Callable, Generic, Hashable, List, TypeVar, Union
+
+import numpy as np
+
+# The per channel data derived from the samples, eg. MinMaxPyramid. Must have an
+# extend(samples, evicted) -> bool method
+ChannelData = TypeVar("ChannelData")
+
+
+class ChannelCache(Generic[ChannelData]):
+    """
+    The data derived from every channel of a render array, built on first use
+    and kept as long as the array and the rendering parameters don't change
+    """
+
+    def __init__(self, factory: Callable[[np.ndarray], ChannelData]) -> None:
+        self.__factory = factory
+        self.__source: Union[np.ndarray, None] = None
+        self.__key: Hashable = None
+        self.__channels: List[ChannelData] = []
+
+    def matches(self, source: np.ndarray, key: Hashable) -> bool:
+        return self.__source is source and self.__key == key
+
+    def get(
+        self,
+        source: np.ndarray,
+        key: Hashable,
+        render: Callable[[np.ndarray], np.ndarray],
+    ) -> List[ChannelData]:
+        """
+        Get the data of the channels of render(source). key must identify the
+        rendering parameters
+        """
+        if not self.matches(source, key):
+            self.__channels = [self.__factory(channel) for channel in render(source)]
+            self.__source = source
+            self.__key = key
+        return self.__channels
+
+    def extend(
+        self,
+        previous: np.ndarray,
+        source: np.ndarray,
+        key: Hashable,
+        render: Callable[[np.ndarray], np.ndarray],
+        evicted: int = 0,
+    ):
+        """
+        Update the channels data when the evicted oldest samples of every channel
+        of previous were dropped, and new samples appended, to give source.
+
+        Does nothing if they were not built for previous, they will be built on
+        the next get
+        """
+        if not self.matches(previous, key):
+            return
+        for data, channel in zip(self.__channels, render(source)):
+            if not data.extend(channel, evicted):
+                self.clear()
+                return
+        self.__source = source
+
+    def clear(self):
+        self.__source = None
+        self.__channels = []
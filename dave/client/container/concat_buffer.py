@@ -0,0 +1,147 @@
+from __future__ import annotations
+import os
+import re
+from typing import Union
+
+import numpy as np
+
+from dave.common.logger import Logger
+
+# Maximum length of concatenated data, per channel. Either a number of samples
+# ("480000") or a duration in seconds ("60s")
+CONCAT_CAPACITY = os.environ.get("DAVE_CONCAT_CAPACITY", "60s")
+
+_CAPACITY_REGEX = re.compile(r"^\s*(\d+(?:\.\d*)?)\s*(s?)\s*$")
+
+
+def parse_capacity(capacity: str, samplerate: int) -> int:
+    """
+    Convert a concat capacity, in samples or in seconds with a "s" suffix, to a
+    number of samples
+
+    Raises
+    ------
+    ValueError
+        If the capacity is not valid
+    """
+    match = _CAPACITY_REGEX.match(capacity)
+    if match is None:
+        raise ValueError(f"{capacity} is not a valid concat capacity")
+    value = float(match.group(1))
+    if match.group(2):
+        value *= samplerate
+    if value < 1:
+        raise ValueError(f"{capacity} is not a valid concat capacity")
+    return int(value)
+
+
+def concat_capacity(samplerate: int) -> int:
+    """
+    The concat capacity set by the user, in samples
+    """
+    try:
+        return parse_capacity(CONCAT_CAPACITY, samplerate)
+    except ValueError as e:
+        Logger().warning(f"{e}, using 60s")
+        return 60 * samplerate
+
+
+class ConcatBuffer:
+    """
+    Bounded storage of concatenated data, along the last axis.
+
+    Data is appended to the end of a preallocated buffer, oldest samples are
+    evicted by moving the start of the window. When the buffer is full, the
+    window is copied to the front of a new buffer twice the capacity, so appends
+    are amortized O(1) per sample.
+
+    data always is a contiguous view of the buffer. Regions of the buffer that
+    were handed out are never written again, so a view stays valid after later
+    appends: it can be kept as a snapshot (eg. frozen data) without copy.
+    """
+
+    def __init__(self) -> None:
+        self.__buffer: Union[np.ndarray, None] = None
+        self.__start = 0
+        self.__end = 0
+
+    @property
+    def data(self) -> Union[np.ndarray, None]:
+        if self.__buffer is None:
+            return None
+        return self.__buffer[..., self.__start : self.__end]
+
+    @property
+    def length(self) -> int:
+        return self.__end - self.__start
+
+    def reset(self, data: Union[np.ndarray, None] = None):
+        """
+        Drop the stored data, and start again from data if given. data is not
+        copied, it is only read and copied to a new buffer by the first append
+        """
+        self.__buffer = None
+        self.__start = self.__end = 0
+        if data is not None:
+            self.__buffer = data
+            self.__end = data.shape[-1]
+
+    def drop(self, count: int):
+        """
+        Evict the count oldest samples
+        """
+        self.__start = min(self.__end, self.__start + max(0, count))
+
+    def append(self, data: np.ndarray, capacity: Union[int, None] = None) -> int:
+        """
+        Append data, evicting the oldest samples above capacity if given
+
+        Returns
+        -------
+        int
+            The number of evicted samples, per channel
+        """
+        length = data.shape[-1]
+        if capacity is None:
+            capacity = self.length + length + 1
+        assert capacity > 0
+        if (
+            self.__buffer is None
+            or self.__buffer.shape[:-1] != data.shape[:-1]
+            or self.__buffer.dtype != data.dtype
+        ):
+            # Incompatible with the stored data, start over
+            evicted = self.length
+            self.reset()
+            self.__allocate(data[..., -capacity:], capacity)
+            return evicted + max(0, length - capacity)
+
+        if length >= capacity:
+            evicted = self.length + length - capacity
+            self.__allocate(data[..., -capacity:], capacity)
+            return evicted
+
+        kept = min(self.length, capacity - length)
+        evicted = self.length - kept
+        if self.__end + length > self.__buffer.shape[-1]:
+            # Make room in a new buffer, the current one might still be viewed
+            previous = self.__buffer[..., self.__end - kept : self.__end]
+            self.__allocate(previous, capacity, kept + length)
+        else:
+            self.__start = self.__end - kept
+
+        self.__buffer[..., self.__end : self.__end + length] = data
+        self.__end += length
+        return evicted
+
+    def __allocate(self, data: np.ndarray, capacity: int, needed: int = 0):
+        """
+        Allocate a new buffer starting with data, big enough for needed samples
+        """
+        length = data.shape[-1]
+        previous_size = 0 if self.__buffer is None else self.__buffer.shape[-1]
+        size = max(min(2 * capacity, 2 * previous_size), needed, length, 1)
+        self.__buffer = np.empty(data.shape[:-1] + (size,), dtype=data.dtype)
+        self.__buffer[..., :length] = data
+        self.__start = 0
+        self.__end = length
@@ -1,9 +1,10 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Any, List, Tuple, Union
+from typing import Any, Dict, FrozenSet, List, Tuple, Union
 import warnings
 
 from PySide6.QtCore import Signal
+import pyqtgraph as pg
 from PySide6.QtWidgets import QFrame
 
 from dave.common.logger import Logger
@@ -16,12 +17,17 @@ from .raw_to_numpy import (
     raw_container_to_numpy,
 )
 
+from dave.client.global_settings import GlobalSettings
+from .concat_buffer import ConcatBuffer, concat_capacity
+from .channel_cache import ChannelCache
+from .special_values import SpecialValueCounts
 from .container_views import (
     ContainerView,
     WaveformView,
     CurveView,
     SpectrogramView,
     PSDView,
+    ChannelsHeatmapView,
     MagnitudeView,
     PhaseView,
 )
@@ -41,14 +47,30 @@ class ContainerModel(EntityModel):
         self.__data_layout: RawContainer.Layout = raw.default_layout
         super().__init__(raw)
         self._data = raw_container_to_numpy(raw)
-        self.__count_special_values()
+        self.__special_values = SpecialValueCounts()
+        self.__special_values.reset(self._data)
         self.__concat = False
+        self.__concat_buffer = ConcatBuffer()
+        # The samplerate used for the last draw, to convert the concat capacity
+        self.__default_sr = GlobalSettings.DEFAULT_SAMPLERATE
         self.__interleaved = raw.interleaved
         self.__mid_side = False
+        # The per channel data of the views, eg. MinMaxPyramid, by type and by
+        # frozen state. While the frozen data is the live data, the data built
+        # for one state is used by both
+        self.__channel_caches: Dict[Tuple[type, bool], ChannelCache] = dict()
+        # The last render array of the live and frozen data : the data, the
+        # render key and the array
+        self.__render_arrays: Dict[bool, Tuple[np.ndarray, Tuple, np.ndarray]] = dict()
+        # Storage of the live mid/side render array while concatenating, and
+        # the data it was computed from
+        self.__mid_side_buffer = ConcatBuffer()
+        self.__mid_side_source: Union[np.ndarray, None] = None
 
         # Connect all settings signal to the update signal
         self.interleaved_signal.connect(lambda: self._emit_update("interleaved"))
         self.mid_side_signal.connect(lambda: self._emit_update("mid_side"))
+        self.frozen_signal.connect(self.__on_frozen_signal)
 
     # ==============================================================================
     @staticmethod
@@ -58,7 +80,13 @@ class ContainerModel(EntityModel):
     @staticmethod
     def get_views_for_layout(layout: RawContainer.Layout) -> List[type[ContainerView]]:
         if layout in (RawContainer.Layout.REAL_1D, RawContainer.Layout.REAL_2D):
-            return [WaveformView, CurveView, SpectrogramView, PSDView]
+            return [
+                WaveformView,
+                CurveView,
+                SpectrogramView,
+                PSDView,
+                ChannelsHeatmapView,
+            ]
         else:
             return [MagnitudeView, PhaseView]
 
@@ -97,6 +125,8 @@ class ContainerModel(EntityModel):
         if concat == self.concat:
             return
         self.__concat = concat
+        # Following updates are appended to the current data
+        self.__concat_buffer.reset(self._data if concat else None)
         self.concat_signal.emit(concat)
 
     @property
@@ -133,12 +163,38 @@ class ContainerModel(EntityModel):
             self.mid_side_signal.emit(value)
 
     @property
-    def nan(self):
-        return self.__nan
+    def nan(self) -> int:
+        return self.__special_values.nan
 
     @property
-    def inf(self):
-        return self.__inf
+    def inf(self) -> int:
+        return self.__special_values.inf
+
+    @property
+    def special_values_span(self) -> Union[Tuple[int, int], None]:
+        """
+        The first and last sample indices holding a NaN or Inf in any channel,
+        None if there are none
+        """
+        span = self.__special_values.span()
+        if span is None or self._channels == 0:
+            return span
+        if not self.interleaved and self._data.shape[0] == self._channels:
+            # Each row is a channel
+            return span
+        if self.interleaved and self._data.shape[0] == 1:
+            # The row holds a frame every channels values
+            return (span[0] // self._channels, span[1] // self._channels)
+        # The columns mix the samples of different channels, look for the
+        # special values of each channel
+        samples = self.samples
+        flat = self._data.reshape(-1)
+        if self.interleaved:
+            channels = flat.reshape(samples, self._channels).T
+        else:
+            channels = flat.reshape(self._channels, samples)
+        columns = np.flatnonzero(np.any(~np.isfinite(channels), axis=0))
+        return (int(columns[0]), int(columns[-1]))
 
     @property
     def are_dimensions_fixed(self) -> bool:
@@ -158,11 +214,37 @@ class ContainerModel(EntityModel):
         """
         Returns the live data as it should be drawn
         """
-        return self.__compute_render_array(self._data)
+        return self.__render_array(self._data, False)
 
     def _frozen_render_data(self) -> np.ndarray:
         assert self._frozen_data is not None
-        return self.__compute_render_array(self._frozen_data)
+        return self.__render_array(self._frozen_data, True)
+
+    def _channel_render_data(self, channel: Union[int, None], frozen: bool) -> Any:
+        """
+        Returns the data of the channel in the type the view renders (eg.
+        MinMaxPyramid), its samples if the view renders arrays. The list of the
+        data of all the channels if channel is None
+        """
+        data_type = self._view.channel_data_type()
+        if data_type is None:
+            return super()._channel_render_data(channel, frozen)
+        if frozen:
+            assert self._frozen_data is not None
+            data = self._frozen_data
+        else:
+            data = self._data
+        cache = self.__channel_cache(data_type, frozen)
+        other_cache = self.__channel_cache(data_type, not frozen)
+        if not cache.matches(data, self.__render_key()) and other_cache.matches(
+            data, self.__render_key()
+        ):
+            # Frozen and live data are the same, don't build the data twice
+            cache = other_cache
+        channels = cache.get(
+            data, self.__render_key(), lambda data: self.__render_array(data, frozen)
+        )
+        return channels if channel is None else channels[channel]
 
     # ==============================================================================
     def serialize_types(self) -> List[Tuple[str, str]]:
@@ -181,26 +263,25 @@ class ContainerModel(EntityModel):
                 raise RuntimeError(f"Unsupported extension : {filename.suffix}")
 
     def __save_as_wave(self, filename: Path):
-        # Should it be self.__data to be saved instead ?
-        interleaved_data = self.__compute_render_array(self._raw.data).T
+        # The render array is shared with the views, it must not be modified
+        interleaved_data = self._live_render_data().T
         if np.max(np.abs(interleaved_data)) > 1.0:
             warnings.warn(
                 "Values outside the [-1;1] range were detected, values will be truncated",
             )
             # Truncate values
-            interleaved_data[np.where(interleaved_data < -1.0)] = -1.0
-            interleaved_data[np.where(interleaved_data > 1.0)] = 1.0
+            interleaved_data = np.clip(interleaved_data, -1.0, 1.0)
         pcm_data = np.int16(interleaved_data * (2**15 - 1))
 
         with wave.open(str(filename), "w") as f:
             f.setnchannels(self.channels)
             # 2 bytes per sample.
             f.setsampwidth(2)
-            f.setframerate(self.samplerate)
+            f.setframerate(self._sr if self._sr is not None else self.__default_sr)
             f.writeframes(pcm_data.tobytes())
 
     def __save_as_npy(self, filename: Path):
-        np.save(filename, self.__compute_render_array(self._data))
+        np.save(filename, self._live_render_data())
 
     # ==========================================================================
     def update_data(self, update: RawContainer.InScopeUpdate):
@@ -213,11 +294,31 @@ class ContainerModel(EntityModel):
         new_data = convert_container_data_to_layout(
             raw_container_to_numpy(self._raw), self.__data_layout
         )
+        self.__hand_over_to_frozen(self._data)
         if self.concat:
-            self._data = np.concatenate((self._data, new_data), -1)
+            previous = self._data
+            evicted = self.__concat_buffer.append(
+                new_data, self.__concat_capacity(new_data)
+            )
+            self._data = self.__concat_buffer.data
+            # Only the new samples are scanned
+            self.__special_values.append(self._data, new_data.shape[-1], evicted)
+            # Each channel is only shifted and extended when each row of the data
+            # is a channel
+            if not self.interleaved and previous.shape[0] == self._channels:
+                self.__extend_render_array(previous, new_data.shape[-1])
+                for (_, frozen), cache in self.__channel_caches.items():
+                    if not frozen:
+                        cache.extend(
+                            previous,
+                            self._data,
+                            self.__render_key(),
+                            lambda data: self.__render_array(data, False),
+                            evicted,
+                        )
         else:
             self._data = new_data
-        self.__count_special_values()
+            self.__special_values.reset(self._data)
         self._channels = self._raw.channels()
         self._in_scope = True
         self.data_signal.emit()
@@ -229,6 +330,9 @@ class ContainerModel(EntityModel):
         if new_layout != self.__data_layout:
             self.__data_layout = new_layout
             self._data = convert_container_data_to_layout(self._data, new_layout)
+            self.__special_values.reset(self._data)
+            if self.concat:
+                self.__concat_buffer.reset(self._data)
             if self.frozen:
                 self._frozen_data = convert_container_data_to_layout(
                     self._frozen_data, new_layout
@@ -238,7 +342,116 @@ class ContainerModel(EntityModel):
             self.possible_views_signal.emit()
             self.view_signal.emit(self._view.name())
 
+    def draw_view(
+        self,
+        plots: List[pg.PlotWidget],
+        default_sr: int,
+        channel: Union[int, None],
+        base_name: str,
+        reasons: FrozenSet[str] = frozenset(),
+    ):
+        self.__default_sr = default_sr
+        super().draw_view(plots, default_sr, channel, base_name, reasons)
+
+    def __concat_capacity(self, data: np.ndarray) -> int:
+        """
+        The concat capacity along the last axis of data
+        """
+        samplerate = self._sr if self._sr is not None else self.__default_sr
+        rows = int(np.prod(data.shape[:-1]))
+        return max(1, concat_capacity(samplerate) * self._channels // max(1, rows))
+
     # ==========================================================================
+    def __on_frozen_signal(self, frozen: bool):
+        if not frozen:
+            # Release the data built for the frozen data
+            self.__render_arrays.pop(True, None)
+            for (_, cache_frozen), cache in self.__channel_caches.items():
+                if cache_frozen:
+                    cache.clear()
+
+    def __channel_cache(self, data_type: type, frozen: bool) -> ChannelCache:
+        cache = self.__channel_caches.get((data_type, frozen))
+        if cache is None:
+            cache = ChannelCache(data_type)
+            self.__channel_caches[(data_type, frozen)] = cache
+        return cache
+
+    def __hand_over_to_frozen(self, previous: np.ndarray):
+        """
+        Before the live data changes from previous, give the render array and
+        the channels data built from it to the frozen data if it is previous.
+        They are kept as is for the frozen data, and built again for the live
+        data, instead of being built twice while both were the same
+        """
+        if self._frozen_data is not previous:
+            return
+        key = self.__render_key()
+        live = self.__render_arrays.get(False)
+        if live is not None and live[0] is previous and live[1] == key:
+            # Never modified, the mid/side buffer only appends after it
+            self.__render_arrays[True] = live
+        for (data_type, frozen), cache in list(self.__channel_caches.items()):
+            if not frozen and cache.matches(previous, key):
+                self.__channel_caches[(data_type, True)] = cache
+                self.__channel_caches[(data_type, False)] = ChannelCache(data_type)
+
+    def __render_key(self) -> Tuple[int, bool, bool, RawContainer.Layout]:
+        """
+        The parameters of __compute_render_array, other than the data
+        """
+        return (self._channels, self.interleaved, self.mid_side, self.__data_layout)
+
+    def __render_array(self, data: np.ndarray, frozen: bool) -> np.ndarray:
+        """
+        The render array of the live or frozen data, computed once per data and
+        render key and shared by all the channels and views
+        """
+        key = self.__render_key()
+        # Frozen and live data can be the same
+        for state in (frozen, not frozen):
+            cached = self.__render_arrays.get(state)
+            if cached is not None and cached[0] is data and cached[1] == key:
+                return cached[2]
+
+        render_data = self.__compute_render_array(data)
+        if self.mid_side and self.concat and not frozen:
+            # Following updates only compute the mid/side of the new samples
+            self.__mid_side_buffer.reset(render_data)
+            self.__mid_side_source = data
+            render_data = self.__mid_side_buffer.data
+        self.__render_arrays[frozen] = (data, key, render_data)
+        return render_data
+
+    def __extend_render_array(self, previous: np.ndarray, appended: int):
+        """
+        Update the live render array of previous, when appended samples were
+        concatenated to each channel, and the oldest ones evicted, to give the
+        current data
+        """
+        key = self.__render_key()
+        cached = self.__render_arrays.get(False)
+        if cached is None or cached[0] is not previous or cached[1] != key:
+            return
+        if not self.mid_side:
+            # Without mid/side, the render array is a view of the data
+            self.__render_arrays[False] = (
+                self._data,
+                key,
+                self.__compute_render_array(self._data),
+            )
+            return
+
+        if self.__mid_side_source is not previous:
+            # Computed before concatenating, it is computed again on next use
+            return
+
+        appended = min(appended, self._data.shape[-1])
+        new_samples = self.__compute_render_array(self._data[..., -appended:])
+        self.__mid_side_buffer.append(new_samples, self._data.shape[-1])
+        self.__mid_side_source = self._data
+        self.__render_arrays[False] = (self._data, key, self.__mid_side_buffer.data)
+
     def __compute_render_array(self, data: np.ndarray) -> np.ndarray:
         """
         Produces the array needed for rendering
@@ -268,8 +481,12 @@ class ContainerModel(EntityModel):
         else:
             # Requires a rewrite in memory
             mid_side_data = np.array(render_data)
-            mid_side_data[0] = (render_data[0][:] + render_data[1][:]) / 2.0
-            mid_side_data[1] = (render_data[0][:] - render_data[1][:]) / 2.0
+            np.add(render_data[0], render_data[1], out=mid_side_data[0])
+            np.subtract(render_data[0], render_data[1], out=mid_side_data[1])
+            # Unsafe, integer data is truncated as when assigning
+            np.true_divide(
+                mid_side_data[:2], 2.0, out=mid_side_data[:2], casting="unsafe"
+            )
             return mid_side_data
 
     def channel_name(self, channel):
@@ -281,15 +498,6 @@ class ContainerModel(EntityModel):
 
     # ==============================================================================
 
-    def __count_special_values(self):
-        """
-        Checks the container data for special values : NaN, +inf, -inf
-
-        Will update self.__nan and self.__inf
-        """
-        self.__nan = int(np.sum(np.isnan(self._data)))
-        self.__inf = int(np.sum(np.isinf(self._data)))
-
     def validate_and_update_channel(self, value: int) -> bool:
         if isinstance(value, str):
             try:
@@ -18,6 +18,7 @@ class ContainerSidePanelInfo(EntitySidePanelInfo):
     - channels
     - samples
     - amount of inf/NaN
+    - first and last samples holding inf/NaN, if any
     """
 
     def __init__(self, parent, container: ContainerModel):
@@ -41,10 +42,15 @@ class ContainerSidePanelInfo(EntitySidePanelInfo):
             self.__nan_inf_html(self.__container.nan, self.__container.inf)
         )
 
+        # Create special values position label
+        self.__span_label = QLabel()
+        self.__update_span_label()
+
         # Adjust layout
         layout.addWidget(self.__channels_label)
         layout.addWidget(self.__sample_label)
         layout.addWidget(self.__values_label)
+        layout.addWidget(self.__span_label)
         layout.addStretch(1)
 
         # connect signals
@@ -66,3 +72,16 @@ class ContainerSidePanelInfo(EntitySidePanelInfo):
         self.__values_label.setText(
             self.__nan_inf_html(self.__container.nan, self.__container.inf)
         )
+        self.__update_span_label()
+
+    def __update_span_label(self):
+        span = self.__container.special_values_span
+        if span is None:
+            self.__span_label.hide()
+            return
+        first, last = span
+        if first == last:
+            self.__span_label.setText(f"at sample {first}")
+        else:
+            self.__span_label.setText(f"from sample {first} to {last}")
+        self.__span_label.show()
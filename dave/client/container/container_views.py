@@ -1,22 +1,129 @@
-from typing import Any, List, Tuple, Union
+from typing import Any, Dict, List, Set, Tuple, Union
 import numpy as np
 from warnings import catch_warnings, warn
 import pyqtgraph as pg
 from scipy import signal
+from PySide6.QtCore import QRectF
 from PySide6.QtGui import QTransform
 
 
 from dave.common.raw_container import RawContainer
 from dave.common.logger import Logger
 
-from ..entity.entity_view import EntityView, hex_to_rgb_tuple
+from ..entity.entity_view import EntityView, PlotItems, hex_to_rgb_tuple
 
 from .colors import NAN_COLOR, INF_COLOR
+from .min_max_pyramid import MinMaxPyramid
+from .stft import PsdChannel, Spectrogram, StftChannel, StftParameters
+from .special_values import RunsItem, find_runs
+
+# Sample indices shared by the views, grown as needed
+_SAMPLE_INDICES = np.empty(0)
+
+
+def _sample_indices(count: int) -> np.ndarray:
+    """
+    The indices of count samples, as a read only view of an array shared by all
+    the channels and redraws
+    """
+    global _SAMPLE_INDICES
+    if _SAMPLE_INDICES.shape[0] < count:
+        _SAMPLE_INDICES = np.arange(
+            max(count, 2 * _SAMPLE_INDICES.shape[0]), dtype=float
+        )
+        _SAMPLE_INDICES.setflags(write=False)
+    return _SAMPLE_INDICES[:count]
 
 
 # ===========================================================================
 class ContainerView(EntityView):
-    pass
+    @staticmethod
+    def channel_data_type() -> Union[type, None]:
+        """
+        The type of the data the view is given for each channel, built from its
+        samples and kept up to date by the model (eg. MinMaxPyramid). None if
+        the view is given the samples
+        """
+        return None
+
+    def _render_special_values(
+        self,
+        plot_widget: pg.PlotWidget,
+        data: np.ndarray,
+        period: float,
+        nan_color: str,
+        inf_color: str,
+    ):
+        """
+        Mark the runs of NaN and Inf values of data, with a single item for each
+        """
+        for key, mask, color in (
+            ("nan", np.isnan(data), nan_color),
+            ("inf", np.isinf(data), inf_color),
+        ):
+            if np.any(mask):
+                runs = self._item(plot_widget, key, lambda: RunsItem(color))
+                runs.set_runs(*find_runs(mask), period)
+
+
+class _EnvelopeCurve(pg.PlotDataItem):
+    """
+    A curve drawing the envelope of a MinMaxPyramid, at the level of detail
+    matching its visible x range and the width of the plot. Pans and zooms only
+    redraw about one point per pixel.
+    """
+
+    # Width of the plot when it's not known yet
+    __DEFAULT_WIDTH = 2048
+    # Samples are drawn as is up to this density, so zoomed in curves don't look
+    # like steps
+    __SAMPLES_PER_PIXEL = 4
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name=name, connect="finite")
+        self.__pyramid: Union[MinMaxPyramid, None] = None
+        self.__period = 1.0
+        self.__drawn: Union[Tuple[int, int, int], None] = None
+
+    def set_pyramid(self, pyramid: MinMaxPyramid, samplerate: float, pen: Any):
+        self.__pyramid = pyramid
+        self.__period = 1.0 / samplerate
+        self.__drawn = None
+        self.setPen(pen)
+        self.__redraw()
+
+    def viewRangeChanged(self, vb=None, ranges=None, changed=None):
+        super().viewRangeChanged(vb, ranges, changed)
+        if changed is None or changed[0]:
+            self.__redraw()
+
+    def __redraw(self):
+        if self.__pyramid is None:
+            return
+
+        start, stop = 0, self.__pyramid.size
+        width = _EnvelopeCurve.__DEFAULT_WIDTH
+        view_box = self.getViewBox()
+        if view_box is not None:
+            if view_box.width() > 0:
+                width = int(view_box.width())
+            # While auto ranging, the whole curve is visible
+            if not view_box.autoRangeEnabled()[0]:
+                x_min, x_max = view_box.viewRange()[0]
+                if self.opts["logMode"][0]:
+                    x_min, x_max = 10.0**x_min, 10.0**x_max
+                start = max(0, int(np.floor(x_min / self.__period)) - 1)
+                stop = min(stop, int(np.ceil(x_max / self.__period)) + 2)
+
+        # Setting the data changes the view range, don't loop on it
+        if (start, stop, width) == self.__drawn:
+            return
+        self.__drawn = (start, stop, width)
+
+        x, y = self.__pyramid.envelope(
+            start, stop, _EnvelopeCurve.__SAMPLES_PER_PIXEL * width
+        )
+        self.setData(x * self.__period, y)
 
 
 # ===========================================================================
@@ -28,13 +135,17 @@ class WaveformView(ContainerView):
     def name() -> str:
         return "Waveform"
 
+    @staticmethod
+    def channel_data_type() -> Union[type, None]:
+        return MinMaxPyramid
+
     def update_setting(self, setting_name: str, setting_value: Any):
         pass
 
     def _render_view(
         self,
         plot_widget: pg.PlotWidget,
-        data: np.ndarray,
+        data: MinMaxPyramid,
         samplerate: int,
         color: Union[None, str] = None,
     ):
@@ -43,51 +154,27 @@ class WaveformView(ContainerView):
         else:
             color: Tuple[int, int, int] = hex_to_rgb_tuple(color)
 
-        assert len(data.shape) == 1
-
         fg_color = self.palette_colors(plot_widget)[2]
 
-        full_time_vector: np.ndarray = np.arange(data.shape[0]) / samplerate
-        nans = np.isnan(data)
-        infs = np.isinf(data)
-        finite_mask = ~nans & ~infs
+        low, high = data.bounds()
 
         # Plot finite data
-        if np.any(finite_mask):
-            plot_widget.plotItem.plot(
-                full_time_vector[finite_mask].astype(np.float64),
-                data[finite_mask].astype(np.float64),
-                pen=pg.mkPen(color, width=2),
-                name="Waveform",
+        if not np.isnan(low):
+            curve = self._item(
+                plot_widget, "curve", lambda: _EnvelopeCurve(name="Waveform")
             )
+            curve.set_pyramid(data, samplerate, pg.mkPen(color, width=2))
 
-            max_y = np.float64(np.max(np.abs(data[finite_mask])) * 1.2)
+            max_y = np.float64(max(abs(low), abs(high)) * 1.2)
 
             # Center Y axis on zero
             if max_y != 0:
                 plot_widget.plotItem.setRange(yRange=[-max_y, max_y])
 
-            # Add vertical lines for NaN values
-            if np.any(nans):
-                nans_time_vector = full_time_vector[nans]
-                for t in nans_time_vector:
-                    line = pg.InfiniteLine(
-                        pos=t,
-                        angle=90,
-                        pen=pg.mkPen(NAN_COLOR, style=pg.QtCore.Qt.PenStyle.DotLine),
-                    )
-                    plot_widget.plotItem.addItem(line)
-
-            # Add vertical lines for Inf values
-            if np.any(infs):
-                infs_time_vector = full_time_vector[infs]
-                for t in infs_time_vector:
-                    line = pg.InfiniteLine(
-                        pos=t,
-                        angle=90,
-                        pen=pg.mkPen(INF_COLOR, style=pg.QtCore.Qt.PenStyle.DotLine),
-                    )
-                    plot_widget.plotItem.addItem(line)
+            # Mark the runs of NaN and Inf values
+            self._render_special_values(
+                plot_widget, data.samples, 1.0 / samplerate, NAN_COLOR, INF_COLOR
+            )
 
         plot_widget.plotItem.showGrid(x=True, y=True)
         plot_widget.plotItem.setLabel("bottom", "Time", "s", pen=fg_color)
@@ -107,6 +194,10 @@ class CurveView(ContainerView):
     def name() -> str:
         return "Curve"
 
+    @staticmethod
+    def channel_data_type() -> Union[type, None]:
+        return MinMaxPyramid
+
     def update_setting(self, setting_name: str, setting_value: Any):
         if setting_name == self.__y_scale.name:
             self.__y_scale.value = setting_value
@@ -115,10 +206,18 @@ class CurveView(ContainerView):
         else:
             raise RuntimeError(f"{setting_name} is not a valid CurveView setting")
 
+    def restyle_view(self, plot_widget: pg.PlotWidget, settings: Set[str]) -> bool:
+        if not settings <= {self.__x_scale.name, self.__y_scale.name}:
+            return False
+        plot_widget.plotItem.setLogMode(
+            x=(self.__x_scale.value == "log"), y=(self.__y_scale.value == "log")
+        )
+        return True
+
     def _render_view(
         self,
         plot_widget: pg.PlotWidget,
-        data: np.ndarray,
+        data: MinMaxPyramid,
         samplerate: int,
         color: Union[None, str] = None,
     ):
@@ -129,41 +228,17 @@ class CurveView(ContainerView):
 
         fg_color = self.palette_colors(plot_widget)[2]
 
-        full_time_vector = np.arange(data.shape[0]) / samplerate
-        nans = np.isnan(data)
-        infs = np.isinf(data)
-        finite_mask = ~nans & ~infs
-
         # Plot finite data
-        if np.any(finite_mask):
-            plot_widget.plotItem.plot(
-                full_time_vector[finite_mask],
-                data[finite_mask],
-                pen=pg.mkPen(color=color, width=2),
-                name="Curve",
+        if not np.isnan(data.bounds()[0]):
+            curve = self._item(
+                plot_widget, "curve", lambda: _EnvelopeCurve(name="Curve")
             )
+            curve.set_pyramid(data, samplerate, pg.mkPen(color=color, width=2))
 
-            # Add vertical lines for NaN values
-            if np.any(nans):
-                nans_time_vector = full_time_vector[nans]
-                for t in nans_time_vector:
-                    line = pg.InfiniteLine(
-                        pos=t,
-                        angle=90,
-                        pen=pg.mkPen("r", style=pg.QtCore.Qt.PenStyle.DotLine),
-                    )
-                    plot_widget.plotItem.addItem(line)
-
-            # Add vertical lines for Inf values
-            if np.any(infs):
-                infs_time_vector = full_time_vector[infs]
-                for t in infs_time_vector:
-                    line = pg.InfiniteLine(
-                        pos=t,
-                        angle=90,
-                        pen=pg.mkPen("g", style=pg.QtCore.Qt.PenStyle.DotLine),
-                    )
-                    plot_widget.plotItem.addItem(line)
+            # Mark the runs of NaN and Inf values
+            self._render_special_values(
+                plot_widget, data.samples, 1.0 / samplerate, "r", "g"
+            )
 
         # Set log/linear scaling
         plot_widget.plotItem.setLogMode(
@@ -179,6 +254,132 @@ class CurveView(ContainerView):
 
 
 # ===========================================================================
+class _SpectrogramImage(pg.GraphicsObject):
+    """
+    A spectrogram drawn as images of TILE_FRAMES frames. The tiles are kept
+    between draws, only the ones whose frames changed are uploaded again.
+    """
+
+    TILE_FRAMES = 256
+
+    def __init__(self) -> None:
+        super().__init__()
+        # Tiles are keyed by their index in a ring, so they keep their key while
+        # the oldest frames are evicted
+        self.__tiles: Dict[int, pg.ImageItem] = dict()
+        # The generation and range of frames drawn by each tile
+        self.__frames: Dict[int, Tuple[int, int, int]] = dict()
+        self.__bounds: Union[QRectF, None] = None
+
+    def set_spectrogram(self, spectrogram: Spectrogram) -> List[pg.ImageItem]:
+        """
+        Draw spectrogram, returns the tiles drawing it
+        """
+        tile_frames = _SpectrogramImage.TILE_FRAMES
+        first_frame = spectrogram.first_frame
+        last_frame = first_frame + spectrogram.frames
+        first_tile = first_frame // tile_frames
+        last_tile = -(-last_frame // tile_frames)
+        ring = 1
+        while ring <= last_tile - first_tile:
+            ring *= 2
+
+        parameters = spectrogram.parameters
+        if spectrogram.frames == 1:
+            time_scale = parameters.nfft / parameters.samplerate
+        else:
+            time_scale = parameters.step / parameters.samplerate
+        frequency_scale = parameters.samplerate / parameters.nfft
+
+        tiles = []
+        for index in range(first_tile, last_tile):
+            key = index % ring
+            tile = self.__tiles.get(key)
+            if tile is None:
+                tile = pg.ImageItem(parent=self)
+                self.__tiles[key] = tile
+            low = max(first_frame, index * tile_frames)
+            high = min(last_frame, (index + 1) * tile_frames)
+            state = (spectrogram.generation, low, high)
+            if self.__frames.get(key) != state:
+                self.__frames[key] = state
+                power_db = spectrogram.power_db[
+                    :, low - first_frame : high - first_frame
+                ]
+                tile.setImage(power_db.T, levels=spectrogram.levels)
+                # Map the array indices to time/frequency values
+                transform = QTransform()
+                transform.translate(spectrogram.frame_time(low), 0)
+                transform.scale(time_scale, frequency_scale)
+                tile.setTransform(transform)
+            tile.show()
+            tiles.append(tile)
+
+        for tile in set(self.__tiles.values()).difference(tiles):
+            tile.hide()
+
+        self.prepareGeometryChange()
+        self.__bounds = QRectF(
+            spectrogram.frame_time(first_frame),
+            0.0,
+            (last_frame - first_frame) * time_scale,
+            (parameters.nfft // 2 + 1) * frequency_scale,
+        )
+        self.informViewBoundsChanged()
+        return tiles
+
+    def dataBounds(self, axis: int, frac: float = 1.0, orthoRange=None):
+        if self.__bounds is None:
+            return None
+        if axis == 0:
+            return (self.__bounds.left(), self.__bounds.right())
+        return (self.__bounds.top(), self.__bounds.bottom())
+
+    def boundingRect(self) -> QRectF:
+        return self.__bounds if self.__bounds is not None else QRectF()
+
+    def paint(self, *_):
+        # Drawn by the tiles
+        pass
+
+
+class _ImagesColorBar(pg.ColorBarItem):
+    """
+    The colorbar of images, eg. the spectrogram tiles. Binding images applies
+    the colormap to all of them, which redraws them: it is only done when they
+    change
+    """
+
+    def __init__(
+        self,
+        plot_widget: pg.PlotWidget,
+        cmap: pg.ColorMap,
+        levels: Tuple[float, float],
+        label: str = "Power (dB)",
+    ) -> None:
+        super().__init__(
+            interactive=True,
+            values=levels,
+            colorMap=cmap,
+            label=label,
+            width=15,
+        )
+        self.__plot_item = plot_widget.plotItem
+        self.__tiles: List[pg.ImageItem] = []
+        self.__inserted = False
+
+    def bind(self, tiles: List[pg.ImageItem], cmap: pg.ColorMap):
+        if cmap is not self.colorMap():
+            self.setColorMap(cmap)
+        if tiles != self.__tiles:
+            self.__tiles = list(tiles)
+            # Inserted once in the plot layout
+            self.setImageItem(
+                tiles, insert_in=None if self.__inserted else self.__plot_item
+            )
+            self.__inserted = True
+
+
 class SpectrogramView(ContainerView):
     __WINDOW_CORRECTION_FACTOR = {
         "hann": 1.63,
@@ -216,78 +417,243 @@ class SpectrogramView(ContainerView):
         else:
             raise RuntimeError(f"{setting_name} is not a valid Spectrogram setting")
 
+    def restyle_view(self, plot_widget: pg.PlotWidget, settings: Set[str]) -> bool:
+        if settings != {self.__color_map.name}:
+            return False
+        # Applied to the tiles by the colorbar, the frames are not computed again
+        cmap = pg.colormap.get(self.__color_map.value)
+        for colorbar in PlotItems.of(plot_widget).find("colorbar"):
+            colorbar.setColorMap(cmap)
+        return True
+
     def get_settings(self) -> List[EntityView.Setting]:
         return (self.__nfft, self.__overlap, self.__window, self.__color_map)
 
+    @staticmethod
+    def channel_data_type() -> Union[type, None]:
+        return StftChannel
+
     def _render_view(
-        self, plot_widget: pg.PlotWidget, data: np.ndarray, samplerate: int, _=None
+        self, plot_widget: pg.PlotWidget, data: StftChannel, samplerate: int, _=None
     ):
-
-        overlap = int(self.__overlap.value * self.__nfft.value)
         window_name = self.__window.value
+        parameters = StftParameters(
+            self.__nfft.value,
+            int(self.__overlap.value * self.__nfft.value),
+            window_name,
+            samplerate,
+            self.__WINDOW_CORRECTION_FACTOR[window_name],
+        )
+
+        fg_color = self.palette_colors(plot_widget)[2]
+        cmap = pg.colormap.get(self.__color_map.value)
+        image = self._item(plot_widget, "image", _SpectrogramImage)
+        # Add colorbar, inserted once in the plot layout
+        colorbar = self._item(
+            plot_widget,
+            "colorbar",
+            lambda: _ImagesColorBar(plot_widget, cmap, (0.0, 1.0)),
+            add=False,
+        )
+        plot_widget.plotItem.setLabel("bottom", "Time", "s", pen=fg_color)
+        plot_widget.plotItem.setLabel("left", "Frequency", "Hz", pen=fg_color)
+
+        def paint(spectrogram: Union[Spectrogram, None]):
+            if spectrogram is None:
+                return
+            if spectrogram.frames == 0 or not np.isfinite(spectrogram.levels[0]):
+                Logger().warning("Not enough finite samples for a Spectrogram")
+                return
+            colorbar.bind(image.set_spectrogram(spectrogram), cmap)
+            colorbar.setLevels(spectrogram.levels)
+
+        # Only the frames covering new samples are computed
+        self._compute(
+            plot_widget, lambda: SpectrogramView.__compute(data, parameters), paint
+        )
 
+    @staticmethod
+    def __compute(
+        data: StftChannel, parameters: StftParameters
+    ) -> Union[Spectrogram, None]:
         try:
-            with catch_warnings(record=True) as w:
-                # Compute spectrogram
-                f, t, Sxx = signal.spectrogram(
-                    data,
-                    fs=samplerate,
-                    nperseg=self.__nfft.value,
-                    noverlap=overlap,
-                    window=window_name,
-                    return_onesided=True,
-                    scaling="density",
-                )
-
-            if w:
-                Logger().warning("Warning in Spectrogram computation")
-
-            fg_color = self.palette_colors(plot_widget)[2]
-
-            # Apply window correction factor for accurate power measurements
-            correction_factor = self.__WINDOW_CORRECTION_FACTOR[window_name]
-            Sxx_corrected = Sxx * correction_factor
-
-            # Convert to dB, handle zeros/negatives
-            Sxx_db = 10 * np.log10(np.maximum(Sxx_corrected, 1e-12))
-
-            # Create and configure ImageItem
-            img = pg.ImageItem()
-            img.setImage(Sxx_db.T, levels=[np.min(Sxx_db), np.max(Sxx_db)])
-
-            # Create transform to map array indices to real time/frequency values
-            tr = QTransform()
-            tr.translate(0, 0)  # Start at first time/freq values
-            tr.scale(
-                (
-                    (self.__nfft.value / samplerate)
-                    if len(t) == 1
-                    else (t[-1] - t[0]) / (len(t) - 1)
-                ),  # Time scaling
-                (f[-1] - f[0]) / (len(f) - 1),  # Frequency scaling
+            return data.compute(parameters)
+        except Exception as e:
+            Logger().warning(f"Error in Spectrogram rendering: {e}")
+            return None
+
+
+# ===========================================================================
+class _ChannelsHeatmap(pg.ImageItem):
+    """
+    The peak level of all the channels as a single image, channels by decimated
+    time, matching the visible x range and the width of the plot.
+
+    The columns are read from the min/max pyramids of the channels, so a redraw
+    costs about one value per pixel and per channel, whatever the number of
+    samples.
+    """
+
+    # Width of the plot when it's not known yet
+    __DEFAULT_WIDTH = 2048
+    # Range of the levels in dB, below the loudest peak
+    DB_RANGE = 96.0
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.__pyramids: List[MinMaxPyramid] = []
+        self.__period = 1.0
+        self.__db = True
+        self.__drawn: Union[Tuple[int, int, int], None] = None
+
+    def set_pyramids(
+        self, pyramids: List[MinMaxPyramid], samplerate: float, db: bool
+    ) -> Union[Tuple[float, float], None]:
+        """
+        Draw the channels of pyramids, returns the levels of their peaks, None
+        if they have no finite sample
+        """
+        self.__pyramids = pyramids
+        self.__period = 1.0 / samplerate
+        self.__db = db
+        self.__drawn = None
+
+        peaks = [np.nanmax(np.abs(pyramid.bounds())) for pyramid in pyramids]
+        if len(peaks) == 0 or np.all(np.isnan(peaks)):
+            return None
+        peak = float(np.nanmax(peaks))
+        self.__redraw()
+        if not db:
+            return (0.0, peak if peak > 0.0 else 1.0)
+        peak_db = 20.0 * np.log10(max(peak, 1e-12))
+        return (peak_db - _ChannelsHeatmap.DB_RANGE, peak_db)
+
+    def viewRangeChanged(self):
+        super().viewRangeChanged()
+        self.__redraw()
+
+    def __redraw(self):
+        if len(self.__pyramids) == 0:
+            return
+
+        start, stop = 0, self.__pyramids[0].size
+        width = _ChannelsHeatmap.__DEFAULT_WIDTH
+        view_box = self.getViewBox()
+        if view_box is not None:
+            if view_box.width() > 0:
+                width = int(view_box.width())
+            # While auto ranging, the whole capture is visible
+            if not view_box.autoRangeEnabled()[0]:
+                x_min, x_max = view_box.viewRange()[0]
+                start = max(0, int(np.floor(x_min / self.__period)) - 1)
+                stop = min(stop, int(np.ceil(x_max / self.__period)) + 2)
+
+        # Setting the image changes the view range, don't loop on it
+        if stop <= start or (start, stop, width) == self.__drawn:
+            return
+        self.__drawn = (start, stop, width)
+
+        image = None
+        for channel, pyramid in enumerate(self.__pyramids):
+            block, first, lows, highs = pyramid.blocks(start, stop, width)
+            if image is None:
+                dtype = np.result_type(lows.dtype, np.float32)
+                image = np.empty((lows.shape[0], len(self.__pyramids)), dtype)
+            np.fmax(np.abs(lows), np.abs(highs), out=image[:, channel])
+        if self.__db:
+            np.maximum(image, 1e-12, out=image)
+            np.log10(image, out=image)
+            image *= 20.0
+
+        # The levels are set by the colorbar
+        self.setImage(image, autoLevels=False)
+        self.setRect(
+            QRectF(
+                first * self.__period,
+                0.0,
+                image.shape[0] * block * self.__period,
+                image.shape[1],
             )
-            img.setTransform(tr)
-
-            # Add colormap
-            cmap = pg.colormap.get(self.__color_map.value)
-            img.setColorMap(cmap)
-
-            # Add colorbar
-            colorbar = pg.ColorBarItem(
-                interactive=True,
-                values=(np.min(Sxx_db), np.max(Sxx_db)),
-                colorMap=cmap,
-                label="Power (dB)",
-                width=15,
+        )
+
+
+class ChannelsHeatmapView(ContainerView):
+    def __init__(self) -> None:
+        self.__scale = EntityView.StringSetting("scale", ("dB", "linear"))
+        self.__color_map = EntityView.StringSetting("colormap", ("magma", "viridis"))
+
+    @staticmethod
+    def name() -> str:
+        return "Channels heatmap"
+
+    @staticmethod
+    def is_superposable() -> bool:
+        return False
+
+    @staticmethod
+    def draws_all_channels() -> bool:
+        return True
+
+    @staticmethod
+    def channel_data_type() -> Union[type, None]:
+        return MinMaxPyramid
+
+    def update_setting(self, setting_name: str, setting_value: Any):
+        if setting_name == self.__scale.name:
+            self.__scale.value = setting_value
+        elif setting_name == self.__color_map.name:
+            self.__color_map.value = setting_value
+        else:
+            raise RuntimeError(
+                f"{setting_name} is not a valid Channels heatmap setting"
             )
-            colorbar.setImageItem(img, insert_in=plot_widget.plotItem)
 
-            plot_widget.plotItem.addItem(img)
-            plot_widget.plotItem.setLabel("bottom", "Time", "s", pen=fg_color)
-            plot_widget.plotItem.setLabel("left", "Frequency", "Hz", pen=fg_color)
+    def restyle_view(self, plot_widget: pg.PlotWidget, settings: Set[str]) -> bool:
+        if settings != {self.__color_map.name}:
+            return False
+        cmap = pg.colormap.get(self.__color_map.value)
+        for colorbar in PlotItems.of(plot_widget).find("colorbar"):
+            colorbar.setColorMap(cmap)
+        return True
 
-        except Exception as e:
-            Logger().warning(f"Error in Spectrogram rendering: {e}")
+    def get_settings(self) -> List[EntityView.Setting]:
+        return (self.__scale, self.__color_map)
+
+    def _render_view(
+        self,
+        plot_widget: pg.PlotWidget,
+        data: List[MinMaxPyramid],
+        samplerate: int,
+        _=None,
+    ):
+        fg_color = self.palette_colors(plot_widget)[2]
+        cmap = pg.colormap.get(self.__color_map.value)
+        db = self.__scale.value == "dB"
+        label = "Peak (dB)" if db else "Peak"
+
+        image = self._item(plot_widget, "image", _ChannelsHeatmap)
+        colorbar = self._item(
+            plot_widget,
+            "colorbar",
+            lambda: _ImagesColorBar(plot_widget, cmap, (0.0, 1.0), label),
+            add=False,
+        )
+        levels = image.set_pyramids(data, samplerate, db)
+        if levels is None:
+            Logger().warning("No finite samples for a Channels heatmap")
+        else:
+            colorbar.bind([image], cmap)
+            colorbar.axis.setLabel(label)
+            colorbar.setLevels(levels)
+
+        # Channel 0 on top, at most about 16 labelled channels
+        plot_widget.plotItem.invertY(True)
+        step = max(1, -(-len(data) // 16))
+        plot_widget.plotItem.getAxis("left").setTicks(
+            [[(channel + 0.5, str(channel)) for channel in range(0, len(data), step)]]
+        )
+        plot_widget.plotItem.setLabel("bottom", "Time", "s", pen=fg_color)
+        plot_widget.plotItem.setLabel("left", "Channel", pen=fg_color)
 
 
 # ===========================================================================
@@ -316,10 +682,14 @@ class PSDView(ContainerView):
     def get_settings(self) -> List[EntityView.Setting]:
         return (self.__nfft, self.__overlap, self.__window)
 
+    @staticmethod
+    def channel_data_type() -> Union[type, None]:
+        return PsdChannel
+
     def _render_view(
         self,
         plot_widget: pg.PlotWidget,
-        data: np.ndarray,
+        data: PsdChannel,
         samplerate: int,
         color: Union[None, str] = None,
     ):
@@ -330,44 +700,54 @@ class PSDView(ContainerView):
 
         fg_color = self.palette_colors(plot_widget)[2]
 
-        if np.any(np.isnan(data)) or np.any(np.isinf(data)):
+        if not data.finite:
             # PyQtGraph doesn't have direct text plotting, so we'll use a TextItem
-            text = pg.TextItem(
-                "Non finite values, cannot compute PSD", anchor=(0.5, 0.5)
+            text = self._item(
+                plot_widget,
+                "non_finite",
+                lambda: pg.TextItem(
+                    "Non finite values, cannot compute PSD", anchor=(0.5, 0.5)
+                ),
             )
-            plot_widget.plotItem.addItem(text)
             text.setPos(0.5, 0.5)  # Center position
             return
 
-        overlap = int(self.__overlap.value * self.__nfft.value)
-        window_name = self.__window.value if self.__window.value != "none" else None
+        nfft = self.__nfft.value
+        overlap = int(self.__overlap.value * nfft)
+        if data.samples.shape[0] < nfft:
+            # Like welch, but warnings can't be caught from the compute workers
+            Logger().warning("Warning in PSD computation")
+            nfft = data.samples.shape[0]
+            overlap = min(overlap, nfft - 1)
+        parameters = StftParameters(nfft, overlap, self.__window.value, samplerate)
+
+        curve = self._item(plot_widget, "curve", lambda: pg.PlotDataItem(name="PSD"))
+        pen = pg.mkPen(color, width=2)
+        plot_widget.plotItem.setLogMode(x=True, y=False)  # Log frequency axis
+        plot_widget.plotItem.showGrid(x=True, y=True)
+        plot_widget.plotItem.setLabel("bottom", "Frequency", "Hz", pen=fg_color)
+        plot_widget.plotItem.setLabel("left", "PSD", "dB/Hz", pen=fg_color)
 
-        try:
-            with catch_warnings(record=True) as w:
-                f, Pxx = signal.welch(
-                    data,
-                    fs=samplerate,
-                    nperseg=self.__nfft.value,
-                    noverlap=overlap,
-                    window=window_name,
-                )
-
-            if w:
-                Logger().warning("Warning in PSD computation")
-
-            # Convert to dB
-            Pxx_db = 10 * np.log10(Pxx + 1e-12)
-
-            plot_widget.plotItem.plot(
-                f, Pxx_db, pen=pg.mkPen(color, width=2), name="PSD"
-            )
-            plot_widget.plotItem.setLogMode(x=True, y=False)  # Log frequency axis
-            plot_widget.plotItem.showGrid(x=True, y=True)
-            plot_widget.plotItem.setLabel("bottom", "Frequency", "Hz", pen=fg_color)
-            plot_widget.plotItem.setLabel("left", "PSD", "dB/Hz", pen=fg_color)
+        def paint(psd: Union[Tuple[np.ndarray, np.ndarray], None]):
+            if psd is not None:
+                curve.setData(*psd, pen=pen)
 
+        self._compute(
+            plot_widget,
+            lambda: PSDView.__compute(data, parameters),
+            paint,
+        )
+
+    @staticmethod
+    def __compute(
+        data: PsdChannel, parameters: StftParameters
+    ) -> Union[Tuple[np.ndarray, np.ndarray], None]:
+        try:
+            # Only computed again when the data or the parameters change
+            return data.compute(parameters)
         except Exception as e:
             Logger().warning(f"Error in PSD rendering: {e}")
+            return None
 
 
 # ===========================================================================
@@ -399,43 +779,22 @@ class MagnitudeView(ContainerView):
 
         fg_color = self.palette_colors(plot_widget)[2]
 
+        # Single precision samples stay single precision
         data = np.abs(data)
 
-        full_x_vector = np.arange(data.shape[0])
-        nans = np.isnan(data)
-        infs = np.isinf(data)
-        finite_mask = ~nans & ~infs
-
-        # Plot finite data
-        if np.any(finite_mask):
-            plot_widget.plotItem.plot(
-                full_x_vector[finite_mask],
-                data[finite_mask],
-                pen=pg.mkPen(color, width=2),
-                name="Magnitude",
+        # Plot finite data, non finite samples are skipped by the curve itself
+        if np.isfinite(data).any():
+            curve = self._item(
+                plot_widget,
+                "curve",
+                lambda: pg.PlotDataItem(name="Magnitude", connect="finite"),
+            )
+            curve.setData(
+                _sample_indices(data.shape[0]), data, pen=pg.mkPen(color, width=2)
             )
 
-            # Add vertical lines for NaN values
-            if np.any(nans):
-                nans_x_vector = full_x_vector[nans]
-                for x in nans_x_vector:
-                    line = pg.InfiniteLine(
-                        pos=x,
-                        angle=90,
-                        pen=pg.mkPen("r", style=pg.QtCore.Qt.PenStyle.DotLine),
-                    )
-                    plot_widget.plotItem.addItem(line)
-
-            # Add vertical lines for Inf values
-            if np.any(infs):
-                infs_x_vector = full_x_vector[infs]
-                for x in infs_x_vector:
-                    line = pg.InfiniteLine(
-                        pos=x,
-                        angle=90,
-                        pen=pg.mkPen("g", style=pg.QtCore.Qt.PenStyle.DotLine),
-                    )
-                    plot_widget.plotItem.addItem(line)
+            # Mark the runs of NaN and Inf values
+            self._render_special_values(plot_widget, data, 1.0, "r", "g")
 
         plot_widget.plotItem.showGrid(x=True, y=True)
         plot_widget.plotItem.setLabel("bottom", "Sample", pen=fg_color)
@@ -471,43 +830,22 @@ class PhaseView(ContainerView):
 
         fg_color = self.palette_colors(plot_widget)[2]
 
+        # Single precision samples stay single precision
         data = np.angle(data)
 
-        x_vector = np.arange(data.shape[0])
-        nans = np.isnan(data)
-        infs = np.isinf(data)
-        finite_mask = ~nans & ~infs
-
-        # Plot finite data
-        if np.any(finite_mask):
-            plot_widget.plotItem.plot(
-                x_vector[finite_mask],
-                data[finite_mask],
-                pen=pg.mkPen(color, width=2),
-                name="Phase",
+        # Plot finite data, non finite samples are skipped by the curve itself
+        if np.isfinite(data).any():
+            curve = self._item(
+                plot_widget,
+                "curve",
+                lambda: pg.PlotDataItem(name="Phase", connect="finite"),
+            )
+            curve.setData(
+                _sample_indices(data.shape[0]), data, pen=pg.mkPen(color, width=2)
             )
 
-            # Add vertical lines for NaN values
-            if np.any(nans):
-                nans_x_vector = x_vector[nans]
-                for x in nans_x_vector:
-                    line = pg.InfiniteLine(
-                        pos=x,
-                        angle=90,
-                        pen=pg.mkPen("r", style=pg.QtCore.Qt.PenStyle.DotLine),
-                    )
-                    plot_widget.plotItem.addItem(line)
-
-            # Add vertical lines for Inf values
-            if np.any(infs):
-                infs_x_vector = x_vector[infs]
-                for x in infs_x_vector:
-                    line = pg.InfiniteLine(
-                        pos=x,
-                        angle=90,
-                        pen=pg.mkPen("g", style=pg.QtCore.Qt.PenStyle.DotLine),
-                    )
-                    plot_widget.plotItem.addItem(line)
+            # Mark the runs of NaN and Inf values
+            self._render_special_values(plot_widget, data, 1.0, "r", "g")
 
         plot_widget.plotItem.showGrid(x=True, y=True)
         plot_widget.plotItem.setLabel("bottom", "Sample", pen=fg_color)
@@ -523,6 +861,7 @@ def get_view_from_name(name: str):
         CurveView.name(): CurveView,
         SpectrogramView.name(): SpectrogramView,
         PSDView.name(): PSDView,
+        ChannelsHeatmapView.name(): ChannelsHeatmapView,
         MagnitudeView.name(): MagnitudeView,
         PhaseView.name(): PhaseView,
     }
@@ -531,6 +870,6 @@ def get_view_from_name(name: str):
 
 def get_views_for_data_layout(model: RawContainer.Layout) -> List:
     if model in (RawContainer.Layout.REAL_1D, RawContainer.Layout.REAL_2D):
-        return [WaveformView, CurveView, SpectrogramView, PSDView]
+        return [WaveformView, CurveView, SpectrogramView, PSDView, ChannelsHeatmapView]
     else:
         return [MagnitudeView, PhaseView]
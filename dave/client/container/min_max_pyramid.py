@@ -0,0 +1,260 @@
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+
+
+class MinMaxPyramid:
+    """
+    A min/max decimation pyramid of a single channel.
+
+    Level k holds the min and max of consecutive blocks of FACTOR**k samples.
+    Non finite samples are ignored, blocks with no finite sample are NaN.
+
+    Blocks are aligned on the whole capture, not on the samples kept: appending
+    samples only recomputes the last block of each level, evicting samples only
+    drops the blocks they filled and recomputes the first block of each level.
+    A concatenated capture is never reduced twice.
+    """
+
+    FACTOR = 8
+
+    def __init__(self, samples: np.ndarray) -> None:
+        assert len(samples.shape) == 1
+        self.__samples = samples
+        # Absolute index of samples[0]
+        self.__offset = 0
+        # Per level, the storage of the min and max of the blocks, the range of
+        # the storage in use, and the absolute index of its first block
+        self.__mins: List[np.ndarray] = []
+        self.__maxs: List[np.ndarray] = []
+        self.__begins: List[int] = []
+        self.__ends: List[int] = []
+        self.__firsts: List[int] = []
+        self.__reduce(0, False)
+
+    @property
+    def samples(self) -> np.ndarray:
+        return self.__samples
+
+    @property
+    def size(self) -> int:
+        return self.__samples.shape[0]
+
+    @property
+    def levels(self) -> int:
+        return len(self.__firsts)
+
+    def extend(self, samples: np.ndarray, evicted: int = 0) -> bool:
+        """
+        Update the pyramid with samples, that must be the current samples without
+        the evicted oldest ones, followed by new samples. Returns False if the
+        type of the samples changed
+        """
+        assert len(samples.shape) == 1 and samples.shape[0] >= self.size - evicted
+        if samples.dtype != self.__samples.dtype:
+            return False
+        appended = self.__offset + self.size
+        self.__samples = samples
+        self.__offset += evicted
+        self.__reduce(max(appended, self.__offset), evicted > 0)
+        return True
+
+    def bounds(self) -> Tuple[float, float]:
+        """
+        The min and max of the finite samples, NaN if there are none
+        """
+        if self.levels == 0:
+            lows, highs = self.__finite(self.__samples), self.__finite(self.__samples)
+        else:
+            lows, highs = self.mins(self.levels), self.maxs(self.levels)
+        if lows.size == 0 or np.all(np.isnan(lows)):
+            return (np.nan, np.nan)
+        return (float(np.nanmin(lows)), float(np.nanmax(highs)))
+
+    def mins(self, level: int) -> np.ndarray:
+        return self.__mins[level - 1][self.__begins[level - 1] : self.__ends[level - 1]]
+
+    def maxs(self, level: int) -> np.ndarray:
+        return self.__maxs[level - 1][self.__begins[level - 1] : self.__ends[level - 1]]
+
+    def blocks(
+        self, start: int, stop: int, max_blocks: int
+    ) -> Tuple[int, int, np.ndarray, np.ndarray]:
+        """
+        The min and max of the blocks of the finest level with at most
+        max_blocks blocks covering samples[start:stop], start and stop being
+        valid and ordered.
+
+        Returns
+        -------
+        Tuple[int, int, np.ndarray, np.ndarray]
+            The size of the blocks and the index of the first sample of the
+            first one, in samples, and the min and max of the blocks, the first
+            one being the block containing start. The first block of the
+            pyramid starts before the first sample once samples were evicted.
+            Values are in the type of the samples (eg. float32 stays float32),
+            blocks without finite samples are NaN
+        """
+        level = 0
+        block = 1
+        while level < self.levels and (stop - start) > max_blocks * block:
+            level += 1
+            block *= MinMaxPyramid.FACTOR
+
+        if level == 0:
+            values = self.__finite(self.__samples[start:stop])
+            return (1, start, values, values)
+
+        first = (start + self.__offset) // block
+        last = -(-(stop + self.__offset) // block)
+        base = self.__firsts[level - 1]
+        return (
+            block,
+            first * block - self.__offset,
+            self.mins(level)[first - base : last - base],
+            self.maxs(level)[first - base : last - base],
+        )
+
+    def envelope(
+        self, start: int, stop: int, max_points: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The envelope of samples[start:stop] with about max_points points.
+
+        Picks the finest level with at most max_points blocks in the range, and
+        returns the min and max of each block. Both are placed at the center of
+        the block so the drawn envelope is exact at any zoom level.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The x positions, in samples, and the values in the type of the
+            samples (eg. float32 stays float32). Non finite samples are NaN
+        """
+        start = max(0, start)
+        stop = min(self.size, stop)
+        if stop <= start:
+            return (np.empty(0), np.empty(0))
+
+        block, position, lows, highs = self.blocks(start, stop, max_points)
+        if block == 1:
+            return (np.arange(start, stop, dtype=np.float64), lows)
+
+        y = np.empty(2 * lows.shape[0], dtype=lows.dtype)
+        y[0::2] = lows
+        y[1::2] = highs
+        x = np.repeat(position + (np.arange(lows.shape[0]) + 0.5) * block, 2)
+        # The first block might have evicted samples, don't draw before the data
+        np.maximum(x, 0.0, out=x)
+        return (x, y)
+
+    # ==========================================================================
+    @staticmethod
+    def __finite(samples: np.ndarray) -> np.ndarray:
+        if np.all(np.isfinite(samples)):
+            return samples
+        return np.where(np.isfinite(samples), samples, np.nan)
+
+    def __reduce(self, start: int, head: bool):
+        """
+        (Re)compute the blocks of every level holding samples from absolute index
+        start onward, and the first block of every level if head
+        """
+        factor = MinMaxPyramid.FACTOR
+        # The absolute range of the values of the level below
+        first, end = self.__offset, self.__offset + self.size
+        level = 0
+        while end - first > factor:
+            block_first, block_end = first // factor, -(-end // factor)
+            kept_end = self.__keep(level, block_first)
+            tail = max(block_first, min(start // factor, kept_end))
+            if head and block_first < tail:
+                # Its oldest values were evicted
+                self.__compute(level, block_first, block_first + 1, first, end)
+            self.__compute(level, tail, block_end, first, end)
+            first, end, start = block_first, block_end, tail
+            level += 1
+
+        for values in (
+            self.__mins,
+            self.__maxs,
+            self.__begins,
+            self.__ends,
+            self.__firsts,
+        ):
+            del values[level:]
+
+    def __keep(self, level: int, first: int) -> int:
+        """
+        Drop the blocks of level before the absolute block first, returns the
+        absolute index of the end of the blocks kept
+        """
+        if level == self.levels:
+            dtype = self.__samples.dtype
+            self.__mins.append(np.empty(0, dtype=dtype))
+            self.__maxs.append(np.empty(0, dtype=dtype))
+            self.__begins.append(0)
+            self.__ends.append(0)
+            self.__firsts.append(first)
+            return first
+
+        dropped = first - self.__firsts[level]
+        kept = self.__ends[level] - self.__begins[level] - dropped
+        self.__firsts[level] = first
+        if kept <= 0:
+            self.__begins[level] = self.__ends[level] = 0
+            return first
+        self.__begins[level] += dropped
+        return first + kept
+
+    def __compute(self, level: int, begin: int, end: int, first: int, stop: int):
+        """
+        Compute the absolute blocks [begin, end) of level, from the values of
+        the level below, that cover the absolute range [first, stop)
+        """
+        if end <= begin:
+            return
+        factor = MinMaxPyramid.FACTOR
+        source_begin = max(begin * factor, first)
+        source_end = min(end * factor, stop)
+        if level == 0:
+            lows = highs = self.__finite(
+                self.__samples[
+                    source_begin - self.__offset : source_end - self.__offset
+                ]
+            )
+        else:
+            base = self.__firsts[level - 1]
+            lows = self.mins(level)[source_begin - base : source_end - base]
+            highs = self.maxs(level)[source_begin - base : source_end - base]
+
+        # The first block might only be partially covered
+        edges = np.maximum(np.arange(begin, end) * factor, first) - source_begin
+        self.__store(
+            level, begin, np.fmin.reduceat(lows, edges), np.fmax.reduceat(highs, edges)
+        )
+
+    def __store(self, level: int, block: int, lows: np.ndarray, highs: np.ndarray):
+        """
+        Store the values of the blocks of level from the absolute block block
+        """
+        begin = self.__begins[level]
+        index = begin + block - self.__firsts[level]
+        needed = index + lows.shape[0]
+        if self.__mins[level].shape[0] < needed:
+            # Move the blocks to the front of a bigger storage, grown
+            # geometrically so updates stay amortized O(new samples)
+            capacity = 2 * (needed - begin)
+            for storage in (self.__mins, self.__maxs):
+                grown = np.empty(capacity, dtype=storage[level].dtype)
+                grown[: index - begin] = storage[level][begin:index]
+                storage[level] = grown
+            index -= begin
+            needed -= begin
+            self.__ends[level] -= begin
+            self.__begins[level] = 0
+
+        self.__mins[level][index:needed] = lows
+        self.__maxs[level][index:needed] = highs
+        self.__ends[level] = max(self.__ends[level], needed)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Tuple, Union
+
+import numpy as np
+import pyqtgraph as pg
+from PySide6.QtCore import QRectF, Qt
+
+
+def find_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the runs of consecutive True values of a boolean mask
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The start (inclusive) and stop (exclusive) indices of each run
+    """
+    edges = np.diff(mask.astype(np.int8), prepend=0, append=0)
+    return (np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))
+
+
+@dataclass
+class _Chunk:
+    """
+    The special values of columns [start, end) of the data, in absolute indices
+    """
+
+    start: int
+    end: int
+    # Per row
+    nan: np.ndarray
+    inf: np.ndarray
+    # First and last columns holding a special value, None if there are none
+    first: Union[int, None]
+    last: Union[int, None]
+
+
+class SpecialValueCounts:
+    """
+    Running counts of the NaN and Inf values of data, per row, and the first and
+    last columns where they are.
+
+    Data is given in chunks appended along its last axis, the oldest columns
+    being evicted: only the new columns are scanned, and the counts of the
+    evicted chunks subtracted. A chunk partially evicted is scanned again.
+    """
+
+    def __init__(self) -> None:
+        self.__chunks: Deque[_Chunk] = deque()
+        self.__rows_shape: Tuple[int, ...] = ()
+        self.__nan = np.zeros(0, dtype=np.int64)
+        self.__inf = np.zeros(0, dtype=np.int64)
+        # Absolute index of the first column of the data
+        self.__offset = 0
+
+    @property
+    def nan(self) -> int:
+        return int(np.sum(self.__nan))
+
+    @property
+    def inf(self) -> int:
+        return int(np.sum(self.__inf))
+
+    @property
+    def nan_per_row(self) -> np.ndarray:
+        return self.__nan
+
+    @property
+    def inf_per_row(self) -> np.ndarray:
+        return self.__inf
+
+    def span(self) -> Union[Tuple[int, int], None]:
+        """
+        The first and last columns of the data holding a special value, None if
+        there are none
+        """
+        if self.nan + self.inf == 0:
+            return None
+        first = next(c.first for c in self.__chunks if c.first is not None)
+        last = next(c.last for c in reversed(self.__chunks) if c.last is not None)
+        return (first - self.__offset, last - self.__offset)
+
+    def reset(self, data: np.ndarray):
+        """
+        Count the special values of data
+        """
+        self.__chunks.clear()
+        self.__rows_shape = data.shape[:-1]
+        self.__nan = np.zeros(int(np.prod(self.__rows_shape)), dtype=np.int64)
+        self.__inf = np.zeros_like(self.__nan)
+        self.__offset = 0
+        self.__push(data, 0, data.shape[-1])
+
+    def append(self, data: np.ndarray, appended: int, evicted: int):
+        """
+        Update the counts when the evicted oldest columns were dropped, and
+        appended columns added at the end, to give data
+        """
+        if data.shape[:-1] != self.__rows_shape:
+            self.reset(data)
+            return
+
+        self.__offset += evicted
+        while len(self.__chunks) > 0 and self.__chunks[0].start < self.__offset:
+            chunk = self.__chunks.popleft()
+            self.__nan -= chunk.nan
+            self.__inf -= chunk.inf
+            if chunk.end > self.__offset:
+                # Partially evicted, count its remaining columns again
+                self.__push(data, 0, chunk.end - self.__offset, left=True)
+                break
+
+        appended = min(appended, data.shape[-1])
+        self.__push(data, data.shape[-1] - appended, data.shape[-1])
+
+    def __push(self, data: np.ndarray, start: int, end: int, left: bool = False):
+        if end <= start:
+            return
+        columns = data[..., start:end].reshape(-1, end - start)
+        nans = np.isnan(columns)
+        infs = np.isinf(columns)
+        chunk = _Chunk(
+            self.__offset + start,
+            self.__offset + end,
+            np.count_nonzero(nans, axis=1),
+            np.count_nonzero(infs, axis=1),
+            None,
+            None,
+        )
+        if np.any(chunk.nan) or np.any(chunk.inf):
+            bad_columns = np.flatnonzero(np.any(nans | infs, axis=0))
+            chunk.first = self.__offset + start + int(bad_columns[0])
+            chunk.last = self.__offset + start + int(bad_columns[-1])
+        self.__nan += chunk.nan
+        self.__inf += chunk.inf
+        if left:
+            self.__chunks.appendleft(chunk)
+        else:
+            self.__chunks.append(chunk)
+
+
+class RunsItem(pg.GraphicsObject):
+    """
+    A single graphics item marking runs of samples (eg. NaNs) with vertical
+    bands spanning the whole view.
+
+    Only the runs in the visible range are painted, and when there are more
+    than pixels they are merged per pixel column, so the draw cost is bounded
+    by the width of the plot whatever the number of runs.
+    """
+
+    __ALPHA = 110
+
+    def __init__(self, color: str) -> None:
+        super().__init__()
+        brush_color = pg.mkColor(color)
+        brush_color.setAlpha(RunsItem.__ALPHA)
+        self.__brush = pg.mkBrush(brush_color)
+        self.__starts = np.empty(0)
+        self.__stops = np.empty(0)
+        self.__x_starts = self.__starts
+        self.__x_stops = self.__stops
+        self.__log_x = False
+        # Behind the curves
+        self.setZValue(-10)
+
+    def set_runs(self, starts: np.ndarray, stops: np.ndarray, period: float = 1.0):
+        """
+        Set the runs to draw, as sample indices, period being the x distance
+        between two samples
+        """
+        self.prepareGeometryChange()
+        self.__starts = starts * period
+        self.__stops = stops * period
+        self.__update_x()
+        self.update()
+
+    def setLogMode(self, x_mode: bool, _: bool):
+        self.prepareGeometryChange()
+        self.__log_x = x_mode
+        self.__update_x()
+        self.update()
+
+    def dataBounds(self, axis: int, frac: float = 1.0, orthoRange=None):
+        # Don't take part in auto ranging
+        return None
+
+    def viewRangeChanged(self, *_):
+        self.prepareGeometryChange()
+        self.update()
+
+    def boundingRect(self) -> QRectF:
+        view = self.viewRect()
+        if view is None or self.__x_starts.size == 0:
+            return QRectF()
+        left, right = self.__x_starts[0], self.__x_stops[-1]
+        return QRectF(left, view.top(), right - left, view.height())
+
+    def paint(self, painter, *_):
+        view = self.viewRect()
+        pixel = self.pixelWidth()
+        if view is None or pixel <= 0.0 or self.__x_starts.size == 0:
+            return
+
+        # Visible runs only
+        first = np.searchsorted(self.__x_stops, view.left(), "right")
+        last = np.searchsorted(self.__x_starts, view.right(), "left")
+        starts = self.__x_starts[first:last]
+        stops = self.__x_stops[first:last]
+
+        columns = int(np.ceil(view.width() / pixel)) + 1
+        if starts.size > columns:
+            # Merge the runs covering the same pixel columns
+            begin = np.clip(np.floor((starts - view.left()) / pixel), 0, columns)
+            end = np.clip(np.ceil((stops - view.left()) / pixel), 0, columns)
+            begin = begin.astype(np.intp)
+            end = np.maximum(end.astype(np.intp), begin + 1)
+            coverage = np.cumsum(
+                np.bincount(begin, minlength=columns + 2)
+                - np.bincount(end, minlength=columns + 2)
+            )
+            column_starts, column_stops = find_runs(coverage > 0)
+            starts = view.left() + column_starts * pixel
+            stops = view.left() + column_stops * pixel
+        else:
+            # Single samples are at least one pixel wide
+            stops = np.maximum(stops, starts + pixel)
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.__brush)
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            painter.drawRect(QRectF(start, view.top(), stop - start, view.height()))
+
+    def __update_x(self):
+        if self.__log_x:
+            tiny = np.finfo(np.float64).tiny
+            self.__x_starts = np.log10(np.maximum(self.__starts, tiny))
+            self.__x_stops = np.log10(np.maximum(self.__stops, tiny))
+        else:
+            self.__x_starts = self.__starts
+            self.__x_stops = self.__stops
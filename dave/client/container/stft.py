@@ -0,0 +1,292 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import count
+import os
+from threading import Lock
+from typing import Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import fft, signal
+
+from dave.client.entity.compute_scheduler import COMPUTE_WORKERS
+
+from .concat_buffer import ConcatBuffer
+
+# Generations are unique across channels, so a spectrogram is identified by its
+# generation and its range of frames
+_GENERATIONS = count()
+
+# Threads of each transform, the cores are shared between the compute workers
+FFT_WORKERS = max(1, (os.cpu_count() or 1) // max(1, COMPUTE_WORKERS))
+
+
+@lru_cache(maxsize=32)
+def get_window(name: str, length: int, dtype: type = np.float64) -> np.ndarray:
+    """
+    A window of the spectral views, shared between the channels and the redraws.
+    The returned array is read only
+    """
+    window = signal.get_window(name, length).astype(dtype)
+    window.setflags(write=False)
+    return window
+
+
+@dataclass(frozen=True)
+class StftParameters:
+    nfft: int
+    noverlap: int
+    window: str
+    samplerate: int
+    # Multiplies the power, to compensate the window energy loss
+    correction: float = 1.0
+
+    @property
+    def step(self) -> int:
+        return self.nfft - self.noverlap
+
+
+@dataclass(frozen=True)
+class Spectrogram:
+    """
+    The power spectral density, in dB, of the frames of a channel.
+
+    Frames are indexed from the start of the whole capture, frame k covers
+    samples [k * step, k * step + nfft). Samples before offset were evicted.
+    """
+
+    # (frequencies, frames)
+    power_db: np.ndarray
+    first_frame: int
+    offset: int
+    parameters: StftParameters
+    # Changes whenever already computed frames change
+    generation: int
+    levels: Tuple[float, float]
+
+    @property
+    def frames(self) -> int:
+        return self.power_db.shape[1]
+
+    def frame_time(self, frame: int) -> float:
+        """
+        The start time of a frame, relative to the first sample kept
+        """
+        step = self.parameters.step
+        return (frame * step - self.offset) / self.parameters.samplerate
+
+
+class StftChannel:
+    """
+    Incremental short-time Fourier transform of a single channel.
+
+    Matches scipy.signal.spectrogram (constant detrend, density scaling, one
+    sided). Frames are computed once: appending samples only computes the frames
+    they complete, evicting samples only drops the frames they started. All
+    frames are recomputed when the parameters change.
+
+    Thread safe, frames are computed by the compute workers while samples are
+    appended on the UI thread
+    """
+
+    def __init__(self, samples: np.ndarray) -> None:
+        assert len(samples.shape) == 1
+        self.__lock = Lock()
+        self.__samples = samples
+        # Absolute index of samples[0]
+        self.__offset = 0
+        self.__parameters: Union[StftParameters, None] = None
+        self.__power_db = ConcatBuffer()
+        # The min and max of each frame, (2, frames)
+        self.__frame_levels = ConcatBuffer()
+        self.__first_frame = 0
+        self.__generation = next(_GENERATIONS)
+
+    @property
+    def samples(self) -> np.ndarray:
+        return self.__samples
+
+    @property
+    def size(self) -> int:
+        return self.__samples.shape[0]
+
+    def extend(self, samples: np.ndarray, evicted: int = 0) -> bool:
+        """
+        Update with samples, that must be the current samples without the
+        evicted oldest ones, followed by new samples
+        """
+        assert len(samples.shape) == 1
+        with self.__lock:
+            self.__samples = samples
+            if evicted == 0:
+                return True
+
+            self.__offset += evicted
+            if self.__parameters is not None:
+                step = self.__parameters.step
+                first_kept = -(-self.__offset // step)
+                # Might be more than the frames computed, if all of them are dropped
+                dropped = max(0, first_kept - self.__first_frame)
+                if dropped > 0:
+                    self.__power_db.drop(dropped)
+                    self.__frame_levels.drop(dropped)
+                    self.__first_frame += dropped
+        return True
+
+    def compute(self, parameters: StftParameters) -> Spectrogram:
+        """
+        Compute the frames that were not computed yet
+        """
+        with self.__lock:
+            # Like scipy, short channels are a single frame of the whole channel
+            if self.size < parameters.nfft and self.size > 0:
+                nfft = self.size
+                parameters = StftParameters(
+                    nfft,
+                    min(parameters.noverlap, nfft - 1),
+                    parameters.window,
+                    parameters.samplerate,
+                    parameters.correction,
+                )
+
+            if parameters != self.__parameters:
+                self.__parameters = parameters
+                self.__power_db.reset()
+                self.__frame_levels.reset()
+                self.__first_frame = -(-self.__offset // parameters.step)
+                self.__generation = next(_GENERATIONS)
+
+            samples = self.__samples
+            generation = self.__generation
+            next_frame = self.__first_frame + self.__frames()
+            start = next_frame * parameters.step - self.__offset
+
+        # Transform without holding the lock, samples can be appended meanwhile
+        power_db = None
+        if samples.shape[0] - start >= parameters.nfft:
+            frames = sliding_window_view(samples[start:], parameters.nfft)
+            power_db = self.__transform(frames[:: parameters.step], parameters)
+
+        with self.__lock:
+            # Dropped if the frames were computed by someone else meanwhile
+            if (
+                power_db is not None
+                and generation == self.__generation
+                and next_frame == self.__first_frame + self.__frames()
+            ):
+                self.__power_db.append(power_db)
+                # fmin/fmax ignore NaN frames without warning
+                frame_levels = np.stack(
+                    (
+                        np.fmin.reduce(power_db, axis=0),
+                        np.fmax.reduce(power_db, axis=0),
+                    )
+                )
+                self.__frame_levels.append(frame_levels)
+
+            power_db = self.__power_db.data
+            if power_db is None:
+                power_db = np.empty((self.__parameters.nfft // 2 + 1, 0))
+            return Spectrogram(
+                power_db,
+                self.__first_frame,
+                self.__offset,
+                self.__parameters,
+                self.__generation,
+                self.__levels(),
+            )
+
+    # ==========================================================================
+    def __frames(self) -> int:
+        return self.__power_db.length
+
+    @staticmethod
+    def __transform(frames: np.ndarray, parameters: StftParameters) -> np.ndarray:
+        """
+        The one sided power spectral density of frames (frames, nfft) in dB, as
+        (frequencies, frames)
+        """
+        window = get_window(parameters.window, parameters.nfft)
+        scale = 1.0 / (parameters.samplerate * float(np.sum(window**2)))
+        # Like scipy, single precision samples are transformed in single precision
+        dtype = np.result_type(frames.dtype, np.float32)
+        window = get_window(parameters.window, parameters.nfft, dtype)
+
+        segments = frames - np.mean(frames, axis=-1, keepdims=True)
+        spectrum = fft.rfft(segments * window, axis=-1, workers=FFT_WORKERS)
+        power = (spectrum.real**2 + spectrum.imag**2) * scale
+        # One sided: double everything but DC and Nyquist
+        if parameters.nfft % 2 == 0:
+            power[:, 1:-1] *= 2.0
+        else:
+            power[:, 1:] *= 2.0
+        power *= parameters.correction
+        return (10.0 * np.log10(np.maximum(power, 1e-12))).T
+
+    def __levels(self) -> Tuple[float, float]:
+        """
+        The min and max power of the frames kept, NaN if there are none
+        """
+        frame_levels = self.__frame_levels.data
+        if frame_levels is None or np.all(np.isnan(frame_levels)):
+            return (np.nan, np.nan)
+        return (float(np.nanmin(frame_levels[0])), float(np.nanmax(frame_levels[1])))
+
+
+class PsdChannel:
+    """
+    The power spectral density of a single channel, averaged over its frames
+    (Welch's method).
+
+    It is computed once for given parameters, and kept until they change. New
+    samples are not appended, the cache rebuilds the channel
+    """
+
+    def __init__(self, samples: np.ndarray) -> None:
+        assert len(samples.shape) == 1
+        self.__lock = Lock()
+        self.__samples = samples
+        self.__parameters: Union[StftParameters, None] = None
+        self.__psd: Union[Tuple[np.ndarray, np.ndarray], None] = None
+        self.__finite: Union[bool, None] = None
+
+    @property
+    def samples(self) -> np.ndarray:
+        return self.__samples
+
+    @property
+    def finite(self) -> bool:
+        """
+        True if all the samples are finite, the PSD can't be computed otherwise
+        """
+        if self.__finite is None:
+            self.__finite = bool(np.all(np.isfinite(self.__samples)))
+        return self.__finite
+
+    def extend(self, samples: np.ndarray, evicted: int = 0) -> bool:
+        return False
+
+    def compute(self, parameters: StftParameters) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The frequencies and power spectral density in dB
+        """
+        with self.__lock:
+            if parameters == self.__parameters:
+                return self.__psd
+
+        window = get_window(parameters.window, parameters.nfft)
+        with fft.set_workers(FFT_WORKERS):
+            f, Pxx = signal.welch(
+                self.__samples,
+                fs=parameters.samplerate,
+                window=window,
+                nperseg=parameters.nfft,
+                noverlap=parameters.noverlap,
+            )
+        psd = (f, 10 * np.log10(Pxx * parameters.correction + 1e-12))
+
+        with self.__lock:
+            self.__parameters = parameters
+            self.__psd = psd
+        return psd
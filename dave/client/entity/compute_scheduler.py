@@ -0,0 +1,122 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+import os
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar, Union
+from weakref import WeakKeyDictionary
+
+from PySide6.QtCore import QObject, Signal
+from shiboken6 import isValid
+
+from dave.common.logger import Logger
+from dave.common.singleton import SingletonMeta
+
+# Number of threads computing the views, 0 computes them on the UI thread
+COMPUTE_WORKERS = int(
+    os.environ.get("DAVE_COMPUTE_WORKERS", str(min(8, os.cpu_count() or 1)))
+)
+
+ResultType = TypeVar("ResultType")
+
+# owner, key, generation, result
+_Delivery = Tuple[Any, Hashable, int, Any]
+
+
+class _ResultPoster(QObject):
+    """
+    Brings the results of the workers back to the UI thread
+    """
+
+    result_signal = Signal(object)
+
+
+class ComputeScheduler(metaclass=SingletonMeta):
+    """
+    Runs the numeric stage of the views (spectrogram, PSD, frequency
+    responses...) on a pool of threads, so the UI stays responsive.
+
+    A job is identified by its owner (eg. the plot widget it's drawn in) and a
+    key. Submitting a job supersedes the previous one of the same owner and key:
+    it is cancelled if not started yet, its result is discarded otherwise. The
+    result of the last job is given to its done callback on the UI thread, which
+    should only paint it.
+
+    numpy and scipy release the GIL while computing, so jobs of different
+    channels run in parallel.
+
+    Must be first used from the UI thread
+    """
+
+    def __init__(self, workers: int = COMPUTE_WORKERS) -> None:
+        self.__lock = Lock()
+        self.__executor = (
+            ThreadPoolExecutor(workers, thread_name_prefix="dave-compute")
+            if workers > 0
+            else None
+        )
+        self.__poster = _ResultPoster()
+        self.__poster.result_signal.connect(self.__deliver)
+        # The last job of each owner and key : its generation, future and callback
+        self.__jobs: WeakKeyDictionary[
+            Any, Dict[Hashable, Tuple[int, Union[Future, None], Callable]]
+        ] = WeakKeyDictionary()
+        self.__generation = 0
+
+    def submit(
+        self,
+        owner: Any,
+        key: Hashable,
+        compute: Callable[[], ResultType],
+        done: Callable[[ResultType], None],
+    ):
+        """
+        Run compute on a worker, then done with its result on the UI thread,
+        unless a newer job was submitted for the same owner and key meanwhile.
+
+        compute must not touch Qt objects, done must not compute
+        """
+        if self.__executor is None:
+            done(compute())
+            return
+
+        with self.__lock:
+            self.__generation += 1
+            generation = self.__generation
+            jobs = self.__jobs.setdefault(owner, dict())
+            previous = jobs.get(key)
+            if previous is not None and previous[1] is not None:
+                previous[1].cancel()
+            jobs[key] = (generation, None, done)
+
+        future = self.__executor.submit(self.__run, owner, key, generation, compute)
+        with self.__lock:
+            if jobs.get(key, (None,))[0] == generation:
+                jobs[key] = (generation, future, done)
+
+    def __run(self, owner: Any, key: Hashable, generation: int, compute: Callable):
+        if not self.__is_current(owner, key, generation):
+            return
+        try:
+            result = compute()
+        except Exception as e:
+            Logger().warning(f"Error in view computation: {e}")
+            return
+        self.__poster.result_signal.emit((owner, key, generation, result))
+
+    def __is_current(self, owner: Any, key: Hashable, generation: int) -> bool:
+        with self.__lock:
+            job = self.__jobs.get(owner, dict()).get(key)
+            return job is not None and job[0] == generation
+
+    def __deliver(self, delivery: _Delivery):
+        owner, key, generation, result = delivery
+        with self.__lock:
+            job = self.__jobs.get(owner, dict()).get(key)
+            if job is None or job[0] != generation:
+                # Superseded while computing
+                return
+            del self.__jobs[owner][key]
+        # The owner might have been deleted meanwhile
+        if isinstance(owner, QObject) and not isValid(owner):
+            return
+        job[2](result)
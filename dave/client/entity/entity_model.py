@@ -1,7 +1,7 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, List, Set, Tuple, Union
+from typing import Any, FrozenSet, List, Set, Tuple, Union
 
 import numpy as np
 import pyqtgraph as pg
@@ -11,7 +11,7 @@ from PySide6.QtWidgets import QFrame
 
 from dave.common.raw_entity import RawEntity
 
-from .entity_view import EntityView
+from .entity_view import EntityView, PlotItems
 from .entity_side_panel_info import EntitySidePanelInfo
 
 
@@ -20,7 +20,7 @@ class EntityModel(QObject):
     data_signal = Signal()
     possible_views_signal = Signal()
     view_signal = Signal(str)
-    view_settings_signal = Signal()
+    view_settings_signal = Signal(str)
     frozen_signal = Signal(bool)
     concat_signal = Signal(bool)
     channels_signal = Signal(int)
@@ -30,6 +30,9 @@ class EntityModel(QObject):
     # Signal when the model has been updated and the view should be updated
     update_signal = Signal(str)
 
+    # Prefix of the update source of a view setting, followed by its name
+    SETTING_REASON = "setting:"
+
     def __init__(self, raw: RawEntity):
         super().__init__()
         self._raw = raw
@@ -43,7 +46,9 @@ class EntityModel(QObject):
         # Connect all settings signal to the update signal
         self.data_signal.connect(lambda: self._emit_update("data"))
         self.view_signal.connect(lambda: self._emit_update("view"))
-        self.view_settings_signal.connect(lambda: self._emit_update("view_settings"))
+        self.view_settings_signal.connect(
+            lambda name: self._emit_update(EntityModel.SETTING_REASON + name)
+        )
         self.frozen_signal.connect(lambda: self._emit_update("frozen"))
         self.concat_signal.connect(lambda: self._emit_update("concat"))
         self.channels_signal.connect(lambda: self._emit_update("channel"))
@@ -125,6 +130,10 @@ class EntityModel(QObject):
     def is_view_superposable(self) -> bool:
         return self._view.is_superposable()
 
+    @property
+    def draws_all_channels(self) -> bool:
+        return self._view.draws_all_channels()
+
     @property
     def are_dimensions_fixed(self) -> bool:
         """
@@ -168,7 +177,7 @@ class EntityModel(QObject):
         if value > 0:
             if value != self.samplerate:
                 self._sr = value
-                self.samplerate_signal(self.samplerate)
+                self.samplerate_signal.emit(self.samplerate)
             return True
         return False
 
@@ -181,7 +190,7 @@ class EntityModel(QObject):
 
     def update_view_settings(self, setting_name: str, setting_value: Any):
         self._view.update_setting(setting_name, setting_value)
-        self.view_settings_signal.emit()
+        self.view_settings_signal.emit(setting_name)
 
     # ==========================================================================
     def _live_render_data(self) -> np.ndarray:
@@ -194,6 +203,14 @@ class EntityModel(QObject):
         assert self._frozen_data is not None
         return self._frozen_data
 
+    def _channel_render_data(self, channel: Union[int, None], frozen: bool) -> Any:
+        """
+        Returns the data of a channel as given to the view, of all the channels
+        if channel is None
+        """
+        data = self._frozen_render_data() if frozen else self._live_render_data()
+        return data if channel is None else data[channel]
+
     # ==========================================================================
     @abstractmethod
     def serialize_types(self) -> List[Tuple[str, str]]:
@@ -231,7 +248,12 @@ class EntityModel(QObject):
     # ==========================================================================
     # @abstractmethod
     def draw_view(
-        self, plots: List[pg.PlotWidget], default_sr: int, channel: int, base_name: str
+        self,
+        plots: List[pg.PlotWidget],
+        default_sr: int,
+        channel: Union[int, None],
+        base_name: str,
+        reasons: FrozenSet[str] = frozenset(),
     ):
         """
         Draw the view of the audio entity.
@@ -247,27 +269,39 @@ class EntityModel(QObject):
             with a non-superposable view type
         default_sr : int
             The default samplerate to use RawEntityif not set in this specific model
-        channel : int
-            The channel to draw
-        kwargs: additional parameters for the concrete class's method
+        channel : Union[int, None]
+            The channel to draw, None for all of them if the view draws all the
+            channels
+        reasons : FrozenSet[str]
+            The update sources since plots were last drawn, empty if they were
+            not. When they are only cosmetic view settings, the view restyles
+            its items instead of drawing them again
         """
-        # pass
+        if reasons and self.__restyle_view(plots, reasons):
+            return
+
         samplerate = self._sr if self._sr is not None else default_sr
 
+        # Items that are not drawn again are hidden, eg. the frozen data once
+        # unfrozen
+        for plot in plots:
+            PlotItems.of(plot).begin()
+
         if self.frozen and not self.is_view_superposable:
             # Render frozen and live data on different subplots
             assert len(plots) == 2
             self._view.render_view(
                 plots[0],
-                self._live_render_data()[channel],
+                self._channel_render_data(channel, False),
                 samplerate,
                 base_name + " (Live)",
             )
             self._view.render_view(
                 plots[1],
-                self._frozen_render_data()[channel],
+                self._channel_render_data(channel, True),
                 samplerate,
                 base_name + " (Frozen)",
+                layer="frozen",
             )
         else:
             # Render live data
@@ -276,14 +310,31 @@ class EntityModel(QObject):
                 # Render frozen data on same subplot
                 self._view.render_view(
                     plots[0],
-                    self._frozen_render_data()[channel],
+                    self._channel_render_data(channel, True),
                     samplerate,
                     base_name,
                     color="#ff7f0e",
+                    layer="frozen",
                 )
             self._view.render_view(
-                plots[0], self._live_render_data()[channel], samplerate, base_name
+                plots[0],
+                self._channel_render_data(channel, False),
+                samplerate,
+                base_name,
             )
 
+        for plot in plots:
+            PlotItems.of(plot).end()
+
+    def __restyle_view(self, plots: List[pg.PlotWidget], reasons: FrozenSet[str]):
+        settings = {
+            reason[len(EntityModel.SETTING_REASON) :]
+            for reason in reasons
+            if reason.startswith(EntityModel.SETTING_REASON)
+        }
+        if len(settings) != len(reasons):
+            return False
+        return all(self._view.restyle_view(plot, settings) for plot in plots)
+
     def channel_name(_, channel: int) -> str:
         return f"channel {channel}"
@@ -1,12 +1,18 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, List, Tuple, Union
+from typing import Any, Callable, Dict, Hashable, List, Set, Tuple, TypeVar, Union
+from weakref import WeakKeyDictionary
 
 from PySide6.QtWidgets import QWidget
 from PySide6.QtGui import QPalette, QColor
 
 import pyqtgraph as pg
 
+from .compute_scheduler import ComputeScheduler
+
+ItemType = TypeVar("ItemType")
+ResultType = TypeVar("ResultType")
+
 
 def hex_to_rgb_tuple(hex_color: str) -> Tuple[int, int, int]:
     """Convert matplotlib hex color to RGB tuple (0-255)"""
@@ -18,6 +24,68 @@ def hex_to_rgb_tuple(hex_color: str) -> Tuple[int, int, int]:
     )
 
 
+class PlotItems:
+    """
+    The graphics items drawn in a plot widget, reused from one redraw to the next.
+
+    Items are identified by a key and by the layer being drawn ("live" or
+    "frozen"). Items that were not requested since the last call to begin are
+    hidden by end, and shown again when requested.
+    """
+
+    __REGISTRY: WeakKeyDictionary[pg.PlotWidget, PlotItems] = WeakKeyDictionary()
+
+    def __init__(self, plot_item: pg.PlotItem) -> None:
+        self.__plot_item = plot_item
+        self.__items: Dict[Tuple[str, Hashable], Any] = dict()
+        self.__used: Set[Tuple[str, Hashable]] = set()
+        self.layer = "live"
+
+    @staticmethod
+    def of(plot_widget: pg.PlotWidget) -> PlotItems:
+        items = PlotItems.__REGISTRY.get(plot_widget)
+        if items is None:
+            items = PlotItems(plot_widget.plotItem)
+            PlotItems.__REGISTRY[plot_widget] = items
+        return items
+
+    def begin(self):
+        self.__used.clear()
+        self.layer = "live"
+
+    def get(
+        self, key: Hashable, factory: Callable[[], ItemType], add: bool = True
+    ) -> ItemType:
+        """
+        Get the item of the current layer for this key, created by factory and
+        added to the plot on first use. Items that are not drawn in the view box
+        (color bars, legends) must be created with add=False and inserted by the
+        factory
+        """
+        full_key = (self.layer, key)
+        item = self.__items.get(full_key)
+        if item is None:
+            item = factory()
+            if add:
+                self.__plot_item.addItem(item)
+            self.__items[full_key] = item
+        elif not item.isVisible():
+            item.show()
+        self.__used.add(full_key)
+        return item
+
+    def find(self, key: Hashable) -> List[Any]:
+        """
+        The items of every layer for this key
+        """
+        return [item for (_, item_key), item in self.__items.items() if item_key == key]
+
+    def end(self):
+        for key, item in self.__items.items():
+            if key not in self.__used and item.isVisible():
+                item.hide()
+
+
 class EntityView(ABC):
     DEFAULT_COLOR = hex_to_rgb_tuple("#1f76b4")
 
@@ -30,6 +98,14 @@ class EntityView(ABC):
     def is_superposable() -> bool:
         return True
 
+    @staticmethod
+    def draws_all_channels() -> bool:
+        """
+        True if the view draws all the channels in a single plot, it is then
+        given the data of every channel instead of one plot per channel
+        """
+        return False
+
     @abstractmethod
     def _render_view(
         self,
@@ -47,8 +123,10 @@ class EntityView(ABC):
         samplerate: int,
         name: str,
         color: Union[None, str] = None,
+        layer: str = "live",
     ):
-        # Plot the graph
+        # Plot the graph, in the items of this layer
+        PlotItems.of(plot_widget).layer = layer
         self._render_view(plot_widget, data, samplerate, color)
 
         # Get default colors
@@ -65,6 +143,41 @@ class EntityView(ABC):
         # Setup graph name
         plot_widget.plotItem.setLabel("right", name, pen=fg_color)
 
+    def restyle_view(self, plot_widget: pg.PlotWidget, settings: Set[str]) -> bool:
+        """
+        Apply the changes of view settings that don't need the data (scales,
+        colors...) to the items already drawn in plot_widget.
+
+        Returns False if the view must be rendered again instead
+        """
+        return False
+
+    @staticmethod
+    def _item(
+        plot_widget: pg.PlotWidget,
+        key: Hashable,
+        factory: Callable[[], ItemType],
+        add: bool = True,
+    ) -> ItemType:
+        """
+        Get a graphics item of the plot, reused across redraws. See PlotItems.get
+        """
+        return PlotItems.of(plot_widget).get(key, factory, add)
+
+    @staticmethod
+    def _compute(
+        plot_widget: pg.PlotWidget,
+        compute: Callable[[], ResultType],
+        paint: Callable[[ResultType], None],
+    ):
+        """
+        Run compute off the UI thread, then paint with its result, unless the
+        plot was drawn again meanwhile. The items painted must be requested with
+        _item before. See ComputeScheduler
+        """
+        layer = PlotItems.of(plot_widget).layer
+        ComputeScheduler().submit(plot_widget, layer, compute, paint)
+
     @abstractmethod
     def get_settings(self) -> List[EntityView.Setting]:
         pass
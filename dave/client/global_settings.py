@@ -11,11 +11,15 @@ class GlobalSettings(QObject):
 
     samplerate_signal = Signal(int)
 
+    DEFAULT_SAMPLERATE = 44100
+
     # samplerate: int = 44100  # default samplerate
     # appearance: str = darkdetect.theme()
     # update_needed = False
 
-    def __init__(self, samplerate: int = 44100, appearance: str = darkdetect.theme()):
+    def __init__(
+        self, samplerate: int = DEFAULT_SAMPLERATE, appearance: str = darkdetect.theme()
+    ):
         super().__init__()
         self.__samplerate = samplerate
         self.__appearance = appearance
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, List, Set, Tuple, Union
 import numpy as np
 from scipy import signal
 from warnings import catch_warnings, warn
@@ -7,6 +7,15 @@ import pyqtgraph as pg
 from ..entity.entity_view import EntityView, hex_to_rgb_tuple
 
 
+def freqz_sos(
+    sos: np.ndarray, resolution: int, whole: bool, samplerate: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The frequencies and complex frequency response of a filter
+    """
+    return signal.freqz_sos(sos, resolution, whole, fs=samplerate)
+
+
 # ===========================================================================
 class IirView(EntityView):
     pass
@@ -39,6 +48,14 @@ class MagnitudeResponseView(IirView):
                     f"{setting_name} is not a valid MagnitudeResponseView setting"
                 )
 
+    def restyle_view(self, plot_widget: pg.PlotWidget, settings: Set[str]) -> bool:
+        if not settings <= {self.__x_scale.name, self.__y_scale.name}:
+            return False
+        plot_widget.plotItem.setLogMode(
+            x=(self.__x_scale.value == "log"), y=(self.__y_scale.value == "log")
+        )
+        return True
+
     def _render_view(
         self,
         plot_widget: pg.PlotWidget,
@@ -53,11 +70,15 @@ class MagnitudeResponseView(IirView):
 
         fg_color = self.palette_colors(plot_widget)[2]
 
+        curve = self._item(plot_widget, "curve", pg.PlotDataItem)
+        pen = pg.mkPen(color, width=2)
         whole = self.__limit.value == "samplerate"
-        w, h = signal.freqz_sos(data, self.__resolution.value, whole, fs=samplerate)
-        magnitude = np.abs(h)
-
-        plot_widget.plotItem.plot(w, magnitude, pen=pg.mkPen(color, width=2))
+        resolution = self.__resolution.value
+        self._compute(
+            plot_widget,
+            lambda: freqz_sos(data, resolution, whole, samplerate),
+            lambda response: curve.setData(response[0], np.abs(response[1]), pen=pen),
+        )
         plot_widget.plotItem.setLogMode(
             x=(self.__x_scale.value == "log"), y=(self.__y_scale.value == "log")
         )
@@ -93,6 +114,12 @@ class PhaseResponseView(IirView):
                     f"{setting_name} is not a valid PhaseResponseView setting"
                 )
 
+    def restyle_view(self, plot_widget: pg.PlotWidget, settings: Set[str]) -> bool:
+        if settings != {self.__x_scale.name}:
+            return False
+        plot_widget.plotItem.setLogMode(x=(self.__x_scale.value == "log"), y=False)
+        return True
+
     def _render_view(
         self,
         plot_widget: pg.PlotWidget,
@@ -107,10 +134,15 @@ class PhaseResponseView(IirView):
 
         fg_color = self.palette_colors(plot_widget)[2]
 
+        curve = self._item(plot_widget, "curve", pg.PlotDataItem)
+        pen = pg.mkPen(color, width=2)
         whole = self.__limit.value == "samplerate"
-        w, h = signal.freqz_sos(data, self.__resolution.value, whole, fs=samplerate)
-
-        plot_widget.plotItem.plot(w, np.angle(h), pen=pg.mkPen(color, width=2))
+        resolution = self.__resolution.value
+        self._compute(
+            plot_widget,
+            lambda: freqz_sos(data, resolution, whole, samplerate),
+            lambda response: curve.setData(response[0], np.angle(response[1]), pen=pen),
+        )
         plot_widget.plotItem.setRange(yRange=[-np.pi, np.pi])
         plot_widget.plotItem.setLogMode(x=(self.__x_scale.value == "log"), y=False)
         plot_widget.plotItem.setLabel("left", "Phase", "radians", pen=fg_color)
@@ -159,28 +191,17 @@ class PolesZerosView(IirView):
 
         fg_color = self.palette_colors(plot_widget)[2]
 
-        # Add unit circle
-        circle = pg.CircleROI(
-            [0, 0],
-            size=[2, 2],
-            movable=False,
-            rotatable=False,
-            resizable=False,
-            pen=pg.mkPen("white", width=1),
-        )
-        circle.removeHandle(0)
-        circle.setPos([-1, -1])  # Center at origin
-        plot_widget.plotItem.addItem(circle)
-
-        # Add zero axes (vertical and horizontal lines through origin)
-        vline = pg.InfiniteLine(
-            pos=0, angle=90, pen=pg.mkPen(color=(180, 180, 180), width=1)
-        )
-        hline = pg.InfiniteLine(
-            pos=0, angle=0, pen=pg.mkPen(color=(180, 180, 180), width=1)
-        )
-        plot_widget.plotItem.addItem(vline)
-        plot_widget.plotItem.addItem(hline)
+        # Add unit circle and zero axes (vertical and horizontal lines through
+        # origin), they don't depend on the data
+        self._item(plot_widget, "unit_circle", PolesZerosView.__unit_circle)
+        for angle in (90, 0):
+            self._item(
+                plot_widget,
+                ("axis", angle),
+                lambda: pg.InfiniteLine(
+                    pos=0, angle=angle, pen=pg.mkPen(color=(180, 180, 180), width=1)
+                ),
+            )
 
         z, p, _ = signal.sos2zpk(data)
 
@@ -189,41 +210,43 @@ class PolesZerosView(IirView):
 
         # Plot poles as X markers
         if len(p_to_plot) > 0:
-            poles_scatter = pg.ScatterPlotItem(
+            poles_scatter = self._item(plot_widget, "poles", pg.ScatterPlotItem)
+            poles_scatter.setData(
                 pos=np.column_stack([p_to_plot.real, p_to_plot.imag]),
                 symbol="x",
                 size=12,
                 pen=pg.mkPen(color),
                 brush=pg.mkBrush(color),
             )
-            plot_widget.plotItem.addItem(poles_scatter)
 
         # Plot zeros as O markers
         if len(z_to_plot) > 0:
-            zeros_scatter = pg.ScatterPlotItem(
+            zeros_scatter = self._item(plot_widget, "zeros", pg.ScatterPlotItem)
+            zeros_scatter.setData(
                 pos=np.column_stack([z_to_plot.real, z_to_plot.imag]),
                 symbol="o",
                 size=12,
                 pen=pg.mkPen(color, width=3),
                 brush=None,  # Hollow circles
             )
-            plot_widget.plotItem.addItem(zeros_scatter)
 
         # Add duplicate markers as text
-        for coords, count in z_duplicates.items():
-            text_item = pg.TextItem(f"^{count}", anchor=(0, 0), color=color)
-            text_item.setPos(coords.real, coords.imag)
-            plot_widget.plotItem.addItem(text_item)
-
-        for coords, count in p_duplicates.items():
-            text_item = pg.TextItem(f"^{count}", anchor=(0, 0), color=color)
+        duplicates = list(z_duplicates.items()) + list(p_duplicates.items())
+        for i, (coords, count) in enumerate(duplicates):
+            text_item = self._item(
+                plot_widget, ("duplicate", i), lambda: pg.TextItem(anchor=(0, 0))
+            )
+            text_item.setText(f"^{count}", color=color)
             text_item.setPos(coords.real, coords.imag)
-            plot_widget.plotItem.addItem(text_item)
 
         # Create legend
-        legend = pg.LegendItem(offset=(10, 10), pen="white")
-        legend.setParentItem(plot_widget.plotItem)
-        legend.anchor((1, 0), (0.90, 0.05))  # Top right corner
+        legend = self._item(
+            plot_widget,
+            "legend",
+            lambda: PolesZerosView.__legend(plot_widget),
+            add=False,
+        )
+        legend.clear()
 
         # Add legend entries
         legend.addItem(
@@ -242,6 +265,27 @@ class PolesZerosView(IirView):
         plot_widget.plotItem.setLabel("bottom", "Real Part", pen=fg_color)
         plot_widget.plotItem.setLabel("left", "Imaginary Part", pen=fg_color)
 
+    @staticmethod
+    def __unit_circle() -> pg.CircleROI:
+        circle = pg.CircleROI(
+            [0, 0],
+            size=[2, 2],
+            movable=False,
+            rotatable=False,
+            resizable=False,
+            pen=pg.mkPen("white", width=1),
+        )
+        circle.removeHandle(0)
+        circle.setPos([-1, -1])  # Center at origin
+        return circle
+
+    @staticmethod
+    def __legend(plot_widget: pg.PlotWidget) -> pg.LegendItem:
+        legend = pg.LegendItem(offset=(10, 10), pen="white")
+        legend.setParentItem(plot_widget.plotItem)
+        legend.anchor((1, 0), (0.90, 0.05))  # Top right corner
+        return legend
+
     def __find_duplicates(
         self, complex_points: np.ndarray[np.complex128]
     ) -> Tuple[np.ndarray[np.complex128], Dict[np.complex128, int]]:
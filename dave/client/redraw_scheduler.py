@@ -0,0 +1,54 @@
+from __future__ import annotations
+import time
+from typing import Dict, FrozenSet, Protocol, Set
+
+from PySide6.QtCore import QTimer
+from shiboken6 import isValid
+
+from dave.common.singleton import SingletonMeta
+
+
+class Redrawable(Protocol):
+    def redraw(self, reasons: FrozenSet[str]):
+        pass
+
+
+class RedrawScheduler(metaclass=SingletonMeta):
+    """
+    Coalesces the redraw requests of the plots.
+
+    Requests only mark their target dirty, with the reason of the request (eg.
+    "data", "view", "setting:colormap"). Dirty targets are redrawn at most once
+    per display frame, with all the reasons they were requested for, so a stop
+    updating several settings of an entity, or a global setting updating all of
+    them, only redraws each one once.
+
+    Must be used from the UI thread
+    """
+
+    # Minimum time between two redraws, about 60 frames per second
+    FRAME_MS = 16
+
+    def __init__(self) -> None:
+        self.__timer = QTimer()
+        self.__timer.setSingleShot(True)
+        self.__timer.timeout.connect(self.__on_frame)
+        self.__dirty: Dict[Redrawable, Set[str]] = dict()
+        self.__last_frame = 0.0
+
+    def request(self, target: Redrawable, reason: str):
+        """
+        Redraw target on the next frame
+        """
+        self.__dirty.setdefault(target, set()).add(reason)
+        if not self.__timer.isActive():
+            elapsed_ms = (time.monotonic() - self.__last_frame) * 1000.0
+            self.__timer.start(max(0, int(RedrawScheduler.FRAME_MS - elapsed_ms)))
+
+    def __on_frame(self):
+        self.__last_frame = time.monotonic()
+        dirty, self.__dirty = self.__dirty, dict()
+        for target, reasons in dirty.items():
+            # The widget might have been deleted meanwhile
+            if isValid(target):
+                target.redraw(frozenset(reasons))
@@ -13,7 +13,7 @@ from PySide6.QtWidgets import (
     QScrollBar,
     QSizePolicy,
 )
-from PySide6.QtCore import Qt, QObject, QEvent
+from PySide6.QtCore import Qt, QObject, QEvent, QTimer
 from PySide6.QtGui import QFont
 from typing import Dict, List, Tuple, Union
 
@@ -29,6 +29,7 @@ from dave.client.global_settings import GlobalSettings
 
 from .entity.entity_view import EntityView
 from .in_scope_dict import InScopeSet
+from .viewport_scroll_area import ViewportScrollArea
 
 
 # ==============================   SettingsTab  =================================
@@ -36,8 +37,15 @@ class SettingsTab:
     """
     The settings tab contains a frame for the general settings, then a frame of
     settings for each entity
+
+    The widgets of an entity frame are only built once the frame is visible in
+    the scroll area, or PREFETCH_ROWS rows around it. Frames of the entities
+    going out of scope are hidden and reused if they come back in scope, they
+    are only deleted with their entity
     """
 
+    PREFETCH_ROWS = 2
+
     def __init__(
         self,
         parent: QWidget,
@@ -49,6 +57,8 @@ class SettingsTab:
         self.__entity_models = entity_models
         self.__global_settings = global_settings
         self.__entity_settings: Dict[int, EntitySettings] = dict()
+        # Frames of the entities out of scope, kept until they are deleted
+        self.__out_of_scope_settings: Dict[int, EntitySettings] = dict()
         self.__empty_label = None
 
         # Create font
@@ -79,7 +89,8 @@ class SettingsTab:
         main_layout.addWidget(self.__separator)
 
         # Create scrollable area
-        self.__scroll_area = QScrollArea()
+        self.__scroll_area = ViewportScrollArea()
+        self.__scroll_area.viewport_signal.connect(self.__materialize_visible)
         self.__scroll_area.setWidgetResizable(True)
         self.__scroll_area.setHorizontalScrollBarPolicy(
             Qt.ScrollBarPolicy.ScrollBarAsNeeded
@@ -148,20 +159,27 @@ class SettingsTab:
             new_model = self.__entity_models[id]
             assert new_model.in_scope
 
-            # Create entity settings widget
-            entity_settings = EntitySettings(
-                self.__scroll_content,
-                new_model,
-                self.__global_settings,
-            )
+            # Reuse the entity settings widget if it was in scope before
+            entity_settings = self.__out_of_scope_settings.pop(id, None)
+            if entity_settings is None:
+                entity_settings = EntitySettings(
+                    self.__scroll_content,
+                    new_model,
+                    self.__global_settings,
+                )
+                new_model.deletion_signal.connect(self.__on_deletion_signal)
             self.__entity_settings[id] = entity_settings
 
             # Add to layout
             self.__scroll_layout.addWidget(entity_settings)
+            entity_settings.show()
 
         # Use stretching to anchor everything at the top
         self.__scroll_layout.addStretch(1)
 
+        # Frames are only placed by the next layout pass
+        QTimer.singleShot(0, self.__materialize_visible)
+
     def __remove_models(self, ids: List[int]):
         assert len(ids) > 0
         assert self.__empty_label is None
@@ -176,14 +194,13 @@ class SettingsTab:
             # Get the EntitySettings
             settings = self.__entity_settings[id]
 
-            # Remove from layout
+            # Remove from layout, the widget is kept until its entity is deleted
             self.__scroll_layout.removeWidget(settings)
+            settings.hide()
 
-            # Delete the widget
-            settings.deleteLater()
-
-            # Remove from our tracking dict
+            # Move to the out of scope frames
             del self.__entity_settings[id]
+            self.__out_of_scope_settings[id] = settings
 
         # Handle empty state label
         if len(self.__entity_settings) == 0:
@@ -197,6 +214,31 @@ class SettingsTab:
             # Add stretching back
             self.__scroll_layout.addStretch(1)
 
+        QTimer.singleShot(0, self.__materialize_visible)
+
+    def __on_deletion_signal(self, id: int):
+        # The entity was removed from the scope first
+        settings = self.__out_of_scope_settings.pop(id, None)
+        if settings is not None:
+            settings.deleteLater()
+
+    def __materialize_visible(self):
+        """
+        Build the widgets of the entity frames visible in the scroll area
+        """
+        if not self.__scroll_area.isVisible() or len(self.__entity_settings) == 0:
+            return
+        frames = list(self.__entity_settings.values())
+        visible_range = self.__scroll_area.visible_range(
+            SettingsTab.PREFETCH_ROWS * frames[0].height()
+        )
+        for settings in frames:
+            if (
+                settings.geometry().bottom() >= visible_range.start
+                and settings.geometry().top() < visible_range.stop
+            ):
+                settings.materialize()
+
 
 # ============================  EntitySettings  =================================
 class EntitySettings(QFrame):
@@ -208,6 +250,8 @@ class EntitySettings(QFrame):
     - View type selector
     - View type settings
     - general settings (samplerate, delete button...)
+
+    It is an empty frame of the same height until it is materialized
     """
 
     def __init__(
@@ -231,6 +275,13 @@ class EntitySettings(QFrame):
         self.setFixedHeight(70)
         self.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
 
+        self.__materialized = False
+
+    def materialize(self):
+        """Build the widgets, once"""
+        if self.__materialized:
+            return
+        self.__materialized = True
         self._setup_layout()
 
     def _setup_layout(self):
@@ -0,0 +1,37 @@
+from PySide6.QtWidgets import QScrollArea
+from PySide6.QtCore import Signal
+
+
+class ViewportScrollArea(QScrollArea):
+    """
+    A scroll area signaling whenever the visible part of its content may have
+    changed
+    """
+
+    viewport_signal = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.verticalScrollBar().rangeChanged.connect(
+            lambda *_: self.viewport_signal.emit()
+        )
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        super().scrollContentsBy(dx, dy)
+        self.viewport_signal.emit()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.viewport_signal.emit()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.viewport_signal.emit()
+
+    def visible_range(self, margin: int = 0) -> range:
+        """
+        The vertical range of the content visible in the viewport, extended by
+        margin pixels on both sides
+        """
+        top = self.verticalScrollBar().value()
+        return range(top - margin, top + self.viewport().height() + margin + 1)
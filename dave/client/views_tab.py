@@ -2,18 +2,19 @@ from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
     QHBoxLayout,
-    QScrollArea,
     QFrame,
     QLabel,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
-from typing import Dict, List, Union
+from typing import Dict, FrozenSet, List, Set, Tuple, Union
 import pyqtgraph as pg
 
 from dave.client.entity.entity_model import EntityModel
 from dave.client.global_settings import GlobalSettings
 
+from dave.client.redraw_scheduler import RedrawScheduler
+from dave.client.viewport_scroll_area import ViewportScrollArea
 from dave.client.side_panel import SidePanel
 from dave.client.in_scope_dict import InScopeSet
 from dave.common.logger import Logger
@@ -24,7 +25,12 @@ class EntityPlots(QFrame):
     An vertical box contains all the plots of an entity.
 
     At least one per channel, or two per channel (live + frozen) if the view is
-    frozen and the view type is not superposable
+    frozen and the view type is not superposable. Views drawing all the channels
+    (eg. the channels heatmap) count as a single channel.
+
+    The plots are only built and drawn while the frame is active (visible in the
+    views tab), it is an empty placeholder of the same height until then. The
+    redraws requested while inactive are postponed until it is activated.
     """
 
     MINIMUM_PLOT_HEIGHT = 220
@@ -35,14 +41,22 @@ class EntityPlots(QFrame):
         super().__init__(parent)
         self.__model = model
         self.__plots: List[pg.PlotWidget] = []
+        self.__plots_layout: Union[Tuple[int, str, bool], None] = None
         self.__global_settings = global_settings
+        self.__active = False
+        # Reasons of the redraws requested while inactive
+        self.__pending_reasons: Set[str] = {"visible"}
 
         # Setup the widgets and layout
         self.__setup_layout()
-        self.__update_widgets()
+        self.__update_height()
 
-        # Connect to model signals
+        # Connect to model signals, and to the global samplerate used by
+        # entities without their own
         self.__model.update_signal.connect(self.__on_model_signal)
+        self.__global_settings.samplerate_signal.connect(
+            self.__on_global_samplerate_signal
+        )
 
     def __setup_layout(self):
         # Create the frame
@@ -60,62 +74,103 @@ class EntityPlots(QFrame):
     #         return self.__model.channels
 
     def __on_model_signal(self, source: str):
+        # Redrawn once on the next frame, whatever the number of signals
+        RedrawScheduler().request(self, source)
+
+    def __on_global_samplerate_signal(self, _: int):
+        if self.__model.samplerate is None:
+            RedrawScheduler().request(self, "global_samplerate")
+
+    def set_active(self, active: bool):
+        """
+        Activate the frame when it is visible, or about to be
+        """
+        if active == self.__active:
+            return
+        self.__active = active
+        if active:
+            for reason in self.__pending_reasons:
+                RedrawScheduler().request(self, reason)
+            self.__pending_reasons.clear()
+
+    def redraw(self, reasons: FrozenSet[str]):
+        if not self.__active:
+            self.__pending_reasons.update(reasons)
+            # Keep the height of the placeholder right, the rows below depend on it
+            self.__update_height()
+            return
         Logger().debug(
-            f"View redraw requested from {source} for model {self.__model.id}"
+            f"View redraw requested from {', '.join(sorted(reasons))} for model"
+            f" {self.__model.id}"
+        )
+        self.__update_widgets(reasons)
+
+    def __layout_key(self) -> Tuple[int, str, bool]:
+        """
+        The plot widgets only need to be rebuilt when this changes
+        """
+        return (
+            self.__plotted_channels(),
+            self.__model.selected_view,
+            self.__model.frozen and not self.__model.is_view_superposable,
         )
-        self.__update_widgets()
-
-    def __update_widgets(self):
-        # Delete the previous plots
-        for old_plot in self.__plots:
-            self.__layout.removeWidget(old_plot)
-            old_plot.deleteLater()
-        self.__plots = []
-
-        if self.__model.frozen and not self.__model.is_view_superposable:
-            # Create 2 plots per channel: live + frozen (non-superposable)
-            for channel in range(self.__model.channels):
-                title = self.__model.channel_name(channel)
-
-                # live plot
-                live_plot = pg.PlotWidget(self)
-                live_plot.setMinimumHeight(self.MINIMUM_PLOT_HEIGHT)
-
-                self.__plots.append(live_plot)
-                self.__layout.addWidget(live_plot)
-
-                # frozen plot
-                frozen_plot = pg.PlotWidget(self)
-                frozen_plot.setMinimumHeight(self.MINIMUM_PLOT_HEIGHT)
-                self.__plots.append(frozen_plot)
-                self.__layout.addWidget(frozen_plot)
-
-                self.__model.draw_view(
-                    [live_plot, frozen_plot],
-                    self.__global_settings.samplerate,
-                    channel=channel,
-                    base_name=title,
-                )
-        else:
-            # Create 1 plot per channel: live + frozen
-            for channel in range(self.__model.channels):
-                title = self.__model.channel_name(channel)
-
-                # live plot
-                live_plot = pg.PlotWidget(self)
-                live_plot.setMinimumHeight(self.MINIMUM_PLOT_HEIGHT)
-                self.__plots.append(live_plot)
-                self.__layout.addWidget(live_plot)
-                self.__model.draw_view(
-                    [
-                        live_plot,
-                    ],
-                    self.__global_settings.samplerate,
-                    channel=channel,
-                    base_name=title,
-                )
-
-        self.setMinimumHeight(self.MINIMUM_PLOT_HEIGHT * len(self.__plots))
+
+    def __plotted_channels(self) -> int:
+        """
+        The number of channels with their own plots
+        """
+        if self.__model.draws_all_channels:
+            return min(1, self.__model.channels)
+        return self.__model.channels
+
+    def __plots_count(self, layout_key: Tuple[int, str, bool]) -> int:
+        # 2 plots per channel (live + frozen) if frozen and non-superposable,
+        # 1 plot per channel otherwise
+        return layout_key[0] * (2 if layout_key[2] else 1)
+
+    def __update_height(self):
+        plots = self.__plots_count(self.__layout_key())
+        self.setMinimumHeight(self.MINIMUM_PLOT_HEIGHT * plots)
+
+    def __create_plot(self) -> pg.PlotWidget:
+        plot = pg.PlotWidget(self)
+        plot.setMinimumHeight(self.MINIMUM_PLOT_HEIGHT)
+        self.__plots.append(plot)
+        self.__layout.addWidget(plot)
+        return plot
+
+    def __update_widgets(self, reasons: FrozenSet[str] = frozenset()):
+        layout_key = self.__layout_key()
+        if layout_key != self.__plots_layout:
+            # New plots are always fully drawn
+            reasons = frozenset()
+            # Delete the previous plots
+            for old_plot in self.__plots:
+                self.__layout.removeWidget(old_plot)
+                old_plot.deleteLater()
+            self.__plots = []
+            self.__plots_layout = layout_key
+
+            for _ in range(self.__plots_count(layout_key)):
+                self.__create_plot()
+            self.__update_height()
+
+        # Redraw in the existing plots, their items are updated in place
+        plotted_channels = layout_key[0]
+        plots_per_channel = len(self.__plots) // max(1, plotted_channels)
+        for index in range(plotted_channels):
+            first = index * plots_per_channel
+            if self.__model.draws_all_channels:
+                channel, base_name = None, f"{self.__model.channels} channels"
+            else:
+                channel, base_name = index, self.__model.channel_name(index)
+            self.__model.draw_view(
+                self.__plots[first : first + plots_per_channel],
+                self.__global_settings.samplerate,
+                channel=channel,
+                base_name=base_name,
+                reasons=reasons,
+            )
 
 
 class EntityRow(QFrame):
@@ -151,6 +206,9 @@ class EntityRow(QFrame):
         self.__layout.addWidget(self.__plot_frame, 1)  # stretch factor 1
         self.__layout.addWidget(self.__side_panel, 0)  # fixed size
 
+    def set_active(self, active: bool):
+        self.__plot_frame.set_active(active)
+
 
 class AudioViewsTab:
     """
@@ -159,8 +217,13 @@ class AudioViewsTab:
     Structure:
     - One EntityRow per entity
     - Each ViewRow contains all channels for that entity
+
+    Only the rows visible in the scroll area, and PREFETCH_ROWS rows around
+    them, are active : the others are placeholders and are not drawn
     """
 
+    PREFETCH_ROWS = 1
+
     def __init__(
         self,
         parent: QWidget,
@@ -188,7 +251,8 @@ class AudioViewsTab:
         self.__parent.setLayout(main_layout)
 
         # Create scrollable area for view rows
-        self.__scroll_area = QScrollArea()
+        self.__scroll_area = ViewportScrollArea()
+        self.__scroll_area.viewport_signal.connect(self.__update_active_rows)
         self.__scroll_area.setWidgetResizable(True)
         self.__scroll_area.setHorizontalScrollBarPolicy(
             Qt.ScrollBarPolicy.ScrollBarAlwaysOff
@@ -204,22 +268,18 @@ class AudioViewsTab:
         self.__scroll_content.setLayout(self.__scroll_layout)
 
         # Make transparent
-        self.__scroll_area.setStyleSheet(
-            """
+        self.__scroll_area.setStyleSheet("""
             QScrollArea {
                 background-color: transparent;
                 border: none;
             }
-            """
-        )
+            """)
 
-        self.__scroll_content.setStyleSheet(
-            """
+        self.__scroll_content.setStyleSheet("""
             QWidget#views_scroll_content {
                 background-color: transparent;
             }
-            """
-        )
+            """)
         self.__scroll_content.setObjectName("views_scroll_content")
 
         # Set scroll content
@@ -256,6 +316,9 @@ class AudioViewsTab:
             # Add to layout
             self.__scroll_layout.addWidget(entity_row)
 
+        # Rows are only placed by the next layout pass
+        QTimer.singleShot(0, self.__update_active_rows)
+
     def __remove_models(self, ids: List[int]):
         assert len(ids) > 0
         assert self.__empty_label is None
@@ -273,3 +336,25 @@ class AudioViewsTab:
 
             # Remove from our tracking dict
             del self.__entity_rows[id]
+
+        QTimer.singleShot(0, self.__update_active_rows)
+
+    def __update_active_rows(self):
+        if not self.__scroll_area.isVisible():
+            # Eg. the settings tab is shown, keep the rows as they are
+            return
+        visible_range = self.__scroll_area.visible_range()
+        rows = list(self.__entity_rows.values())
+        visible = [
+            index
+            for index, row in enumerate(rows)
+            if row.geometry().bottom() >= visible_range.start
+            and row.geometry().top() < visible_range.stop
+        ]
+        if len(visible) > 0:
+            first = max(0, visible[0] - AudioViewsTab.PREFETCH_ROWS)
+            last = visible[-1] + AudioViewsTab.PREFETCH_ROWS
+        else:
+            first, last = 0, -1
+        for index, row in enumerate(rows):
+            row.set_active(first <= index <= last)
@@ -2,8 +2,6 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 import re
 from typing import Any, Callable, List, Optional, Sequence, Tuple, Type, Union
-import struct
-import cmath
 
 # from dave.common.data_layout import RawContainer.Layout
 from dave.common.sample_type import SampleType
@@ -11,6 +9,8 @@ from dave.common.raw_container import RawContainer
 
 from .debuggers.value import AbstractValue, DebuggerMemoryError
 from .entity import Entity
+from .sparkline import compute_sparklines
+from .summary import SummaryStatistics, compute_statistics
 
 
 class Container(Entity):
@@ -27,126 +27,65 @@ class Container(Entity):
         super().__init__(dbg_value, name, data_type)
         self.__interleaved = interleaved
 
-    def compute_summary(self) -> str:
+    @property
+    def interleaved(self) -> bool:
+        return self.__interleaved
+
+    def compute_statistics(self, data: Optional[bytearray] = None) -> SummaryStatistics:
+        """
+        Compute the statistics of the samples of the container
+
+        Parameters
+        ----------
+        data : Optional[bytearray], optional
+            The content of the container, if it was already read. Otherwise it
+            is read from the debugger
+
+        Raises
+        ------
+        DebuggerMemoryError
+            If the content of the container could not be read
+        """
+        if data is None:
+            data = self.read_from_debugger()
+        return compute_statistics(data, self.sample_type)
+
+    def compute_summary(
+        self, data: Optional[bytearray] = None, approximate: bool = False
+    ) -> str:
+        """
+        Compute the one-line summary of the container, approximate should be set
+        if data is only a decimated subset of the content
+        """
         shape = self.shape()
         channels, samples = shape if not self.__interleaved else shape[::-1]
 
         try:
-            samples_bytes = self.read_from_debugger()
+            statistics = self.compute_statistics(data)
         except DebuggerMemoryError:
             return "Failed to read internals, might be deallocated or unitialized\n"
-        byte_size = self.sample_type.byte_size()
-        fmt = self.sample_type.struct_fmt()
 
+        summary = f"{channels} channels {samples} samples"
         if self.sample_type.is_complex():
-            return f"{channels} channels {samples} samples (complex data)"
-        else:
-            min_amp = struct.unpack(fmt, samples_bytes[:byte_size])[0]
-            max_amp = min_amp
-            for i in range(1, channels * samples):
-                sample_bytes = samples_bytes[i * byte_size : (i + 1) * byte_size]
-                sample = struct.unpack(fmt, sample_bytes)[0]
-                min_amp = min(min_amp, sample)
-                max_amp = max(max_amp, sample)
-            return f"{channels} channels {samples} samples, min {min_amp:.4E}, max {max_amp:.4E}"
-
-    def compute_sparklines(self) -> List[str]:
+            summary += " (complex data)"
+        description = statistics.describe()
+        if description:
+            summary += f", {description}"
+        if approximate:
+            summary += " (approximate)"
+        return summary
+
+    def compute_sparklines(self, data: Optional[bytearray] = None) -> List[str]:
         assert not self.sample_type.is_complex()
         shape = self.shape()
-        channels, block_size = shape if not self.__interleaved else shape[::-1]
-        try:
-            samples_bytes = self.read_from_debugger()
-        except DebuggerMemoryError:
-            return []
-        byte_size = self.sample_type.byte_size()
-        fmt = self.sample_type.struct_fmt()
-
-        sparklines = []
-
-        for channel in range(channels):
-            if self.__interleaved:
-                channel_samples = [
-                    struct.unpack(
-                        fmt,
-                        samples_bytes[
-                            (channels * i + channel)
-                            * byte_size : (channels * i + channel + 1)
-                            * byte_size
-                        ],
-                    )[0]
-                    for i in range(block_size)
-                ]
-            else:
-                channel_samples = [
-                    struct.unpack(
-                        fmt,
-                        samples_bytes[
-                            (block_size * channel + i)
-                            * byte_size : (block_size * channel + i + 1)
-                            * byte_size
-                        ],
-                    )[0]
-                    for i in range(block_size)
-                ]
-
-            waveform = "_⎽⎼—⎻⎺‾"
-            maxValue = max(
-                (
-                    abs(sample)
-                    if not (cmath.isnan(sample) or cmath.isinf(sample))
-                    else 0.0
-                )
-                for sample in channel_samples
-            )
-            if maxValue > 0.0:
-                scale = maxValue
-            else:
-                scale = 1.0
-            num_zeros = 0
-            output = "["
-
-            for i in range(len(channel_samples)):
-                sample = channel_samples[i]
-                if sample == 0.0:
-                    if num_zeros == 0:
-                        output += "0"
-                    num_zeros += 1
-                    continue
-                else:
-                    num_zeros = 0
-
-                if num_zeros > 1:
-                    output += "(" + str(num_zeros) + ")"
-                    num_zeros = 0
-                # for some reason sys.float_info.epsilon is nowhere near
-                # the rounding error introduced by lldb when importing float values to python
-                if cmath.isinf(sample):
-                    output += "I"
-                elif (abs(sample) - 0.00000015) > 1.0:  # out of bounds?
-                    output += "E"
-                elif cmath.isnan(sample):
-                    output += "N"
-                elif (
-                    (i > 0)
-                    and not cmath.isnan(channel_samples[i - 1])
-                    and ((sample < 0) is not (channel_samples[i - 1] < 0))
-                ):
-                    output += "x"  # zero crossing
-                else:
-                    # normalize so we can see detail
-                    sample /= scale
-                    # make it a positive number that varies from 0 to 6
-                    index = int((sample + 1) / 2.0 * 6.99)
-                    character = waveform[index]
-                    if output[-1] != character:
-                        output += character
-
-            if num_zeros > 1:
-                output += "(" + str(num_zeros) + ")"
-
-            output += "]"
-            sparklines.append(output)
-        return sparklines
+        channels = shape[0] if not self.__interleaved else shape[1]
+        if data is None:
+            try:
+                data = self.read_from_debugger()
+            except DebuggerMemoryError:
+                return []
+
+        return compute_sparklines(data, self.sample_type, channels, self.__interleaved)
 
     def as_raw(self) -> RawContainer:
         return RawContainer(
@@ -6,6 +6,8 @@ st.SERVER_TYPE = st.ServerType.GDB
 from ...languages import *
 from .commands import GdbCommand, exit_handler, stop_handler
 from .formatters import dave_printer
+from .value import GdbValue
+from ...formatter_cache import FormatterCache
 
 
 import gdb  # type: ignore
@@ -15,6 +17,10 @@ import os
 GdbCommand()
 gdb.events.exited.connect(exit_handler)
 gdb.events.stop.connect(stop_handler)
+gdb.events.new_objfile.connect(GdbValue.clear_type_cache)
+gdb.events.clear_objfiles.connect(GdbValue.clear_type_cache)
+gdb.events.memory_changed.connect(FormatterCache().new_stop)
+FormatterCache().track_memory()
 gdb.pretty_printers.append(dave_printer)
 
 Logger().info("[dave] Successfully loaded")
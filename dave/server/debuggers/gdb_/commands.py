@@ -18,6 +18,7 @@ from dave.server.debuggers.command_parsers import (
     HelpCommandParser,
 )
 from dave.server.entity_factory import EntityFactory, EntityBuildError
+from dave.server.formatter_cache import FormatterCache
 from dave.common.logger import Logger
 
 from .value import GdbValue
@@ -42,6 +43,7 @@ def exit_handler(event):
 
 
 def stop_handler(event: gdb.StopEvent):
+    FormatterCache().new_stop()
     if DaveProcess().is_alive():
         DaveProcess().dbgr_update_callback()
 
@@ -277,11 +279,11 @@ The following subcommands are supported:
         var_name = parsed.VARIABLE
         try:
             var = gdb.parse_and_eval(var_name)
-            if var.is_optimized_out:
+            frame = gdb.selected_frame()
+            gdb_value = GdbValue(var, "", GdbValue.language_from_frame(frame))
+            if gdb_value.is_optimized_out():
                 Logger().error(f"Variable '{var_name}' is optimized out.")
             else:
-                frame = gdb.selected_frame()
-                gdb_value = GdbValue(var, "", GdbValue.language_from_frame(frame))
                 gdb.write(f"Type: {gdb_value.typename()}\n")
                 gdb.write(f"Lang: {gdb_value.language().name}\n")
         except (gdb.error, RuntimeError) as e:
@@ -1,17 +1,17 @@
 from typing import Union
 from dave.common.logger import Logger
 import gdb  # type: ignore
-from ...container import Container
 from ...entity_factory import EntityFactory, EntityBuildError
+from ...formatter_cache import FormattedContainer, FormatterCache
 from .value import GdbValue
 
 
 class ContainerPrettyPrinter:
     __PREFIX = None
 
-    def __init__(self, val: gdb.Value, container: Container):
+    def __init__(self, val: gdb.Value, formatted: FormattedContainer):
         self.__val = val
-        self.__container = container
+        self.__formatted = formatted
 
         if ContainerPrettyPrinter.__PREFIX is None:
             ContainerPrettyPrinter.__PREFIX = (
@@ -21,12 +21,12 @@ class ContainerPrettyPrinter:
             )
 
     def children(self):
-        if not self.__container.sample_type.is_complex():
-            # Add synthetic children
-            sparklines = self.__container.compute_sparklines()
-            for channel, sparkline in enumerate(sparklines):
+        if not self.__formatted.is_complex:
+            # Add synthetic children, computed as gdb requests them
+            for channel in range(self.__formatted.channels):
                 yield f"dSparkline[{channel}]", gdb.Value(
-                    ContainerPrettyPrinter.__PREFIX + sparkline
+                    ContainerPrettyPrinter.__PREFIX
+                    + self.__formatted.sparkline(channel)
                 )
 
         # Iterate over real children
@@ -34,7 +34,7 @@ class ContainerPrettyPrinter:
             yield field.name, self.__val[field.name]
 
     def to_string(self) -> str:
-        return self.__container.compute_summary()
+        return self.__formatted.summary
 
     @staticmethod
     def prefix() -> Union[None, str]:
@@ -45,7 +45,8 @@ class SparklinePrinter:
     PREFIX = "===DAVE==="
 
     def __init__(self, val: gdb.Value):
-        if val.type.code != gdb.TYPE_CODE_ARRAY or val.type.target().name != "char":
+        type_info = GdbValue.type_info(val.type)
+        if type_info.code != gdb.TYPE_CODE_ARRAY or type_info.target != "char":
             raise TypeError
 
         try:
@@ -85,9 +86,12 @@ def dave_printer(valobj: gdb.Value):
 
     gdb_value = GdbValue(valobj, "", GdbValue.language_from_frame(gdb.selected_frame()))
     try:
-        container = EntityFactory().build(gdb_value, gdb_value.typename(), "")
-        if container.formatter_compatible():
-            return ContainerPrettyPrinter(valobj, container)
+        formatted = FormatterCache().get(
+            gdb_value,
+            lambda: EntityFactory().build(gdb_value, gdb_value.typename(), ""),
+        )
+        if formatted is not None:
+            return ContainerPrettyPrinter(valobj, formatted)
         return None
     except (EntityBuildError, TypeError):
         return None
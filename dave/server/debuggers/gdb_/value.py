@@ -1,17 +1,95 @@
 from __future__ import annotations
-from typing import List, Union
-from ..value import AbstractValue, DebuggerMemoryError
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Union
+from ..value import AbstractValue, DebuggerMemoryError, ReadBudget
 from ...language_type import LanguageType
 import gdb  # type: ignore
 
 
+@dataclass(frozen=True)
+class GdbTypeInfo:
+    """
+    Type metadata resolved once per gdb.Type and shared by all the values of
+    this type
+    """
+
+    typename: str
+    sizeof: int
+    code: int
+    target: Union[str, None]
+
+
 class GdbValue(AbstractValue):
+    __TARGET_CODES = (
+        gdb.TYPE_CODE_PTR,
+        gdb.TYPE_CODE_ARRAY,
+        gdb.TYPE_CODE_REF,
+        gdb.TYPE_CODE_RVALUE_REF,
+    )
+    __TYPE_INFOS: Dict[Tuple[Any, ...], GdbTypeInfo] = {}
+
     def __init__(
         self, gdb_value: gdb.Value, varname: str, language: LanguageType
     ) -> None:
         self.__value = gdb_value
         self.__varname = varname
         self.__language = language
+        # Resolved on first use, see __info
+        self.__type_info = None  # type: Union[GdbTypeInfo, None]
+        self.__optimized_out = None  # type: Union[bool, None]
+
+    @staticmethod
+    def type_info(gdb_type: gdb.Type) -> GdbTypeInfo:
+        """
+        Resolve the metadata of a gdb.Type, results are cached until the
+        debugger loads or unloads an objfile
+        """
+        key = GdbValue.__type_key(gdb_type)
+        info = GdbValue.__TYPE_INFOS.get(key)
+        if info is None:
+            basic_type = gdb.types.get_basic_type(gdb_type).strip_typedefs()
+            code = basic_type.code
+            target = None
+            if code in GdbValue.__TARGET_CODES:
+                target = str(gdb.types.get_basic_type(basic_type.target()))
+            info = GdbTypeInfo(str(basic_type), basic_type.sizeof, code, target)
+            GdbValue.__TYPE_INFOS[key] = info
+
+        return info
+
+    @staticmethod
+    def __type_key(gdb_type: gdb.Type) -> Tuple[Any, ...]:
+        """
+        A hashable key identifying a gdb.Type, as far as its metadata is concerned.
+
+        gdb.Type is not hashable and a new one is created on each access. Named
+        types are identified by their name, code, size, objfile and
+        cv-qualification (the name of a const type is the name of the type).
+        Function local types can share their name within an objfile, typedefs
+        are also identified by the key of the type they alias. Pointers,
+        references and arrays are identified by their code and size, and the key
+        of their target, other unnamed types (anonymous structs, functions...)
+        by their code, size and printed name
+        """
+        code = gdb_type.code
+        name = gdb_type.name
+        if name is not None:
+            is_const = gdb_type == gdb_type.const()
+            is_volatile = gdb_type == gdb_type.volatile()
+            key = (name, code, gdb_type.sizeof, gdb_type.objfile, is_const, is_volatile)
+            if code == gdb.TYPE_CODE_TYPEDEF:
+                return key + (GdbValue.__type_key(gdb_type.strip_typedefs()),)
+            return key
+        if code in GdbValue.__TARGET_CODES:
+            return (code, gdb_type.sizeof, GdbValue.__type_key(gdb_type.target()))
+        return (str(gdb_type), code, gdb_type.sizeof)
+
+    @staticmethod
+    def clear_type_cache(*_):
+        """
+        Drop all cached type metadata. Connected to the objfile events
+        """
+        GdbValue.__TYPE_INFOS.clear()
 
     @staticmethod
     def language_from_frame(frame: gdb.Frame) -> LanguageType:
@@ -25,17 +103,27 @@ class GdbValue(AbstractValue):
             case _:
                 return LanguageType.UNSUPPORTED
 
+    def __info(self) -> GdbTypeInfo:
+        if self.__type_info is None:
+            self.__type_info = GdbValue.type_info(self.__value.type)
+        return self.__type_info
+
     def language(self):
         return self.__language
 
     def typename(self) -> str:
-        return str(gdb.types.get_basic_type(self.__value.type).strip_typedefs())
+        return self.__info().typename
 
     def varname(self) -> str:
         return self.__varname
 
     def byte_size(self) -> int:
-        return self.__value.type.sizeof
+        return self.__info().sizeof
+
+    def is_optimized_out(self) -> bool:
+        if self.__optimized_out is None:
+            self.__optimized_out = self.__value.is_optimized_out
+        return self.__optimized_out
 
     def attr(self, name: str) -> GdbValue:
         try:
@@ -71,7 +159,7 @@ class GdbValue(AbstractValue):
             raise DebuggerMemoryError(e.args)
 
     def __float__(self) -> float:
-        assert self.__value.type.code == gdb.TYPE_CODE_FLT
+        assert self.__info().code == gdb.TYPE_CODE_FLT
         try:
             return float(self.__value)
         except (TypeError, gdb.MemoryError) as e:
@@ -105,6 +193,13 @@ class GdbValue(AbstractValue):
             raise DebuggerMemoryError(
                 f"Failed to read {bytesize} bytes from 0x{addr:X}"
             )
+        budget = ReadBudget.active()
+        if budget is not None:
+            return budget.read(addr, bytesize, GdbValue.__read_range)
+        return GdbValue.__read_range(addr, bytesize)
+
+    @staticmethod
+    def __read_range(addr: int, bytesize: int) -> bytearray:
         inferior = gdb.selected_inferior()
         try:
             return bytearray(inferior.read_memory(addr, bytesize))
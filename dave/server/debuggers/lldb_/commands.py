@@ -4,6 +4,7 @@ import shlex
 
 from ...process import DaveProcess
 from ...entity_factory import EntityFactory, EntityBuildError
+from ...formatter_cache import FormatterCache
 from dave.server.debuggers.command_parsers import (
     HelpNeeded,
     ParsingError,
@@ -33,6 +34,7 @@ class StopHook:
         pass
 
     def handle_stop(self, exe_ctx: lldb.SBExecutionContext, stream: lldb.SBStream):
+        FormatterCache().new_stop()
         stop_reason = exe_ctx.GetProcess().GetSelectedThread().GetStopReason()
 
         # Check if the stop reason is a breakpoint or step-over
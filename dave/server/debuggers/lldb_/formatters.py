@@ -1,7 +1,8 @@
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Union
 from dave.common.singleton import SingletonMeta
 from ...container import Container
 from ...entity_factory import EntityFactory
+from ...formatter_cache import FormattedContainer, FormatterCache
 from .value import LldbValue
 import lldb
 import re
@@ -9,69 +10,126 @@ import re
 
 def summary_provider(valobj: lldb.SBValue, _) -> str:
     lldb_value = LldbValue(valobj, "")
-    container = EntityFactory().build(lldb_value, lldb_value.typename(), "")
     try:
-        return container.compute_summary()
+        formatted = FormatterCache().get(
+            lldb_value,
+            lambda: EntityFactory().build(lldb_value, lldb_value.typename(), ""),
+        )
+        return formatted.summary if formatted is not None else ""
     except RuntimeError:
         # Fails randomly on Xcode
         return "Failed to fetch dave summary (random xcode bug sory)"
 
 
 class SyntheticChildrenProvider:
+    """
+    Adds a sparkline child for each channel of the container.
+
+    Everything is computed lazily : collapsed variables only cost the typename
+    match done by lldb, and a sparkline is only computed when its child is
+    requested
+    """
+
+    __SPARKLINE_NAME = re.compile(r"^dSparkline\[(\d+)\]$")
+
     def __init__(self, valobj: lldb.SBValue, _):
-        self.__sparklines: List[str] = list()
-        self.__num_channels = 0
         self.__valobj = valobj
-        lldb_value = LldbValue(valobj, valobj.path)
-        # For some weird reason, Xcode will ask for the synthetic children twice
-        # Once with the object itself
-        # Then with a pointer to the object
-        try:
-            self.__container = EntityFactory().build(
-                lldb_value, lldb_value.typename(), valobj.name
-            )
-        except TypeError:
-            deref = valobj.Dereference()
-            lldb_value = LldbValue(deref, deref.path)
-            self.__container = EntityFactory().build(
-                lldb_value, lldb_value.typename(), valobj.name
-            )
+        self.__lldb_value = None  # type: Union[LldbValue, None]
+        self.__container = None  # type: Union[Container, None]
+        self.__num_channels = None  # type: Union[int, None]
+        self.__formatted = None  # type: Union[FormattedContainer, None]
+        self.__sparklines: Dict[int, lldb.SBValue] = dict()
+
+    def __build(self) -> Container:
+        if self.__container is None:
+            valobj = self.__valobj
+            lldb_value = LldbValue(valobj, valobj.path)
+            # For some weird reason, Xcode will ask for the synthetic children twice
+            # Once with the object itself
+            # Then with a pointer to the object
+            try:
+                self.__container = EntityFactory().build(
+                    lldb_value, lldb_value.typename(), valobj.name
+                )
+            except TypeError:
+                deref = valobj.Dereference()
+                lldb_value = LldbValue(deref, deref.path)
+                self.__container = EntityFactory().build(
+                    lldb_value, lldb_value.typename(), valobj.name
+                )
+            self.__lldb_value = lldb_value
+        return self.__container
+
+    def __is_complex(self) -> bool:
+        return self.__build().sample_type.is_complex()
+
+    def __channels(self) -> int:
+        # Only needs the shape, the content is read with the first sparkline
+        if self.__num_channels is None:
+            try:
+                container = self.__build()
+                shape = container.shape()
+                self.__num_channels = (
+                    shape[0] if not container.interleaved else shape[1]
+                )
+            except RuntimeError:
+                self.__num_channels = 0
+        return self.__num_channels
 
     def num_children(self) -> int:
-        if self.__container.sample_type.is_complex():
+        if self.__is_complex():
             return self.__valobj.num_children
-        return self.__num_channels + self.__valobj.num_children
+        return self.__channels() + self.__valobj.num_children
 
     def get_child_index(self, name: str) -> int:
-        if self.__container.sample_type.is_complex():
+        if self.__is_complex():
             return self.__valobj.GetIndexOfChildWithName(name)
-        if str.startswith(name, "dSparkline"):
-            return int(name.lstrip("[").rstrip("]"))
-        else:
-            return self.__valobj.GetIndexOfChildWithName(name) + self.__num_channels
+        if not name.startswith("dSparkline"):
+            return self.__valobj.GetIndexOfChildWithName(name) + self.__channels()
+        matched = SyntheticChildrenProvider.__SPARKLINE_NAME.match(name)
+        if matched is None or int(matched.group(1)) >= self.__channels():
+            return -1
+        return int(matched.group(1))
 
     def get_child_at_index(self, index: int) -> lldb.SBValue:
-        if self.__container.sample_type.is_complex():
+        if self.__is_complex():
             return self.__valobj.GetChildAtIndex(index)
-        if index < self.__num_channels:
+        if index < self.__channels():
             return self.__sparkline_value(index)
         else:
-            return self.__valobj.GetChildAtIndex(index - self.__num_channels)
+            return self.__valobj.GetChildAtIndex(index - self.__channels())
 
     def update(self):
-        if not self.__container.sample_type.is_complex():
-            try:
-                self.__sparklines = self.__container.compute_sparklines()
-                self.__num_channels = len(self.__sparklines)
-            except RuntimeError:
-                self.__sparklines = []
-                self.__num_channels = 0
+        # The container is kept, but its shape and content might have changed
+        self.__num_channels = None
+        self.__formatted = None
+        self.__sparklines.clear()
 
     def has_children(self) -> bool:
         return True
 
     def __sparkline_value(self, channel: int) -> lldb.SBValue:
-        string = self.__sparklines[channel]
+        value = self.__sparklines.get(channel)
+        if value is None:
+            value = self.__create_sparkline_value(channel)
+            self.__sparklines[channel] = value
+        return value
+
+    def __create_sparkline_value(self, channel: int) -> lldb.SBValue:
+        # Reused across updates as long as the content did not change
+        if self.__formatted is None:
+            try:
+                container = self.__build()
+                self.__formatted = FormatterCache().get(
+                    self.__lldb_value, lambda: container
+                )
+            except RuntimeError:
+                self.__formatted = None
+        if self.__formatted is None or channel >= self.__formatted.channels:
+            string = "[]"
+        else:
+            string = self.__formatted.sparkline(channel)
+
         # Shamelessly stolen from Sudara's
         # https://github.com/sudara/melatonin_audio_sparklines/blob/main/sparklines.py#L181
 
@@ -1,8 +1,8 @@
 from __future__ import annotations
-from typing import List, Union
+from typing import Dict, FrozenSet, List, Tuple, Union
 
 from dave.common.logger import Logger
-from ..value import AbstractValue, DebuggerMemoryError
+from ..value import AbstractValue, DebuggerMemoryError, ReadBudget
 from ...language_type import LanguageType
 import lldb
 import os
@@ -16,11 +16,46 @@ def xcode_detected() -> bool:
     )
 
 
+def _language_set(*names: str) -> FrozenSet[int]:
+    # Older lldb versions don't define all the language enums
+    return frozenset(getattr(lldb, name) for name in names if hasattr(lldb, name))
+
+
 class LldbValue(AbstractValue):
     __debugger = None  # type: Union[None, lldb.SBDebugger]
     __debugger_tid = -1
-
-    def __init__(self, lldb_value: lldb.SBValue, varname: str):
+    __C_LANGUAGES = _language_set(
+        "eLanguageTypeC",
+        "eLanguageTypeC11",
+        "eLanguageTypeC17",
+        "eLanguageTypeC89",
+        "eLanguageTypeC99",
+    )
+    __CPP_LANGUAGES = _language_set(
+        "eLanguageTypeC_plus_plus",
+        "eLanguageTypeC_plus_plus_03",
+        "eLanguageTypeC_plus_plus_11",
+        "eLanguageTypeC_plus_plus_14",
+        "eLanguageTypeC_plus_plus_17",
+        "eLanguageTypeC_plus_plus_20",
+        "eLanguageTypeC_plus_plus_23",
+    )
+    __RUST_LANGUAGES = _language_set("eLanguageTypeRust")
+    # Language of the compile units, by module and compile unit path
+    __LANGUAGES = {}  # type: Dict[Tuple[str, str], LanguageType]
+
+    def __init__(
+        self,
+        lldb_value: lldb.SBValue,
+        varname: str,
+        language: Union[LanguageType, None] = None,
+        non_synthetic: bool = False,
+    ):
+        """
+        Child values should provide the language of their parent, and whether
+        they were accessed from a non-synthetic value, to avoid querying lldb
+        again
+        """
         # Init static if needed
         if LldbValue.__debugger is None:
             LldbValue.__init_debugger_objects()
@@ -32,12 +67,13 @@ class LldbValue(AbstractValue):
             raise RuntimeError("Invalid lldb SBValue")
         self.__value: lldb.SBValue = lldb_value
         self.__varname = varname
+        # Children of a non-synthetic value are non-synthetic too
+        self.__non_synthetic = lldb_value if non_synthetic else None
 
         # Retrieve language
-        frame: lldb.SBFrame = self.__value.GetFrame()
-        cu: lldb.SBCompileUnit = frame.GetCompileUnit()
-        lang = cu.GetLanguage()
-        self.__language = LldbValue.__language_from_frame(lldb_value.GetFrame())
+        if language is None:
+            language = LldbValue.__language_from_frame(lldb_value.GetFrame())
+        self.__language = language
 
     @staticmethod
     def __init_debugger_objects():
@@ -57,67 +93,26 @@ class LldbValue(AbstractValue):
     @staticmethod
     def __language_from_frame(frame: lldb.SBFrame) -> LanguageType:
         cu: lldb.SBCompileUnit = frame.GetCompileUnit()
-        lang = cu.GetLanguage()
-
-        if lang in LldbValue.__c_lang_list():
-            return LanguageType.C
-        elif lang in LldbValue.__cpp_lang_list():
-            return LanguageType.CPP
-        elif lang == lldb.eLanguageTypeRust:
-            return LanguageType.RUST
-        else:
-            return LanguageType.UNSUPPORTED
-            
-    @staticmethod
-    def __c_lang_list() -> List[int]:
-        ret = [lldb.eLanguageTypeC, ]
-        try:
-            ret.append(lldb.eLanguageTypeC11)
-        except AttributeError:
-            pass
-        try:            
-            ret.append(lldb.eLanguageTypeC17)
-        except AttributeError:
-            pass
-        try:
-            ret.append(lldb.eLanguageTypeC89)
-        except AttributeError:
-            pass
-        try:
-            ret.append(lldb.eLanguageTypeC99)
-        except AttributeError:
-            pass
-        return ret
-    
-    @staticmethod
-    def __cpp_lang_list() -> List[int]:
-        ret = [lldb.eLanguageTypeC_plus_plus, ]
-        try:
-            ret.append(lldb.eLanguageTypeC_plus_plus_03)
-        except AttributeError:
-            pass
-        try:
-            ret.append(lldb.eLanguageTypeC_plus_plus_11)
-        except AttributeError:
-            pass
-        try:
-            ret.append(lldb.eLanguageTypeC_plus_plus_14)
-        except AttributeError:
-            pass
-        try:
-            ret.append(lldb.eLanguageTypeC_plus_plus_17)
-        except AttributeError:
-            pass
-        try:
-            ret.append(lldb.eLanguageTypeC_plus_plus_20)
-        except AttributeError:
-            pass
-        try:
-            ret.append(lldb.eLanguageTypeC_plus_plus_23)
-        except AttributeError:
-            pass
-        return ret
-
+        key = (frame.GetModule().GetFileSpec().fullpath, cu.GetFileSpec().fullpath)
+
+        language = LldbValue.__LANGUAGES.get(key)
+        if language is None:
+            lang = cu.GetLanguage()
+            if lang in LldbValue.__C_LANGUAGES:
+                language = LanguageType.C
+            elif lang in LldbValue.__CPP_LANGUAGES:
+                language = LanguageType.CPP
+            elif lang in LldbValue.__RUST_LANGUAGES:
+                language = LanguageType.RUST
+            else:
+                language = LanguageType.UNSUPPORTED
+            LldbValue.__LANGUAGES[key] = language
+        return language
+
+    def __non_synthetic_value(self) -> lldb.SBValue:
+        if self.__non_synthetic is None:
+            self.__non_synthetic = self.__value.GetNonSyntheticValue()
+        return self.__non_synthetic
 
     def typename(self) -> str:
         return self.__value.type.GetCanonicalType().name
@@ -131,8 +126,10 @@ class LldbValue(AbstractValue):
     def attr(self, name: str) -> LldbValue:
         try:
             return LldbValue(
-                self.__value.GetNonSyntheticValue().GetChildMemberWithName(name),
+                self.__non_synthetic_value().GetChildMemberWithName(name),
                 f"{self.__varname}.{name}",
+                self.__language,
+                non_synthetic=True,
             )
         except RuntimeError as e:
             raise RuntimeError(
@@ -167,10 +164,13 @@ class LldbValue(AbstractValue):
                     f"{self.__value.name}[{key}]", address, pointee_type
                 ),
                 f"{self.__varname}[{key}]",
+                self.__language,
             )
         else:
             return LldbValue(
-                self.__value.GetChildAtIndex(key), f"{self.__varname}[{key}]"
+                self.__value.GetChildAtIndex(key),
+                f"{self.__varname}[{key}]",
+                self.__language,
             )
 
     def __int__(self) -> int:
@@ -206,6 +206,13 @@ class LldbValue(AbstractValue):
             raise DebuggerMemoryError(
                 f"Failed to read {bytesize} bytes from 0x{addr:X}"
             )
+        budget = ReadBudget.active()
+        if budget is not None:
+            return budget.read(addr, bytesize, LldbValue.__read_range)
+        return LldbValue.__read_range(addr, bytesize)
+
+    @staticmethod
+    def __read_range(addr: int, bytesize: int) -> bytearray:
         # assert LldbValue.__debugger is not None
         process = (
             LldbValue.debugger().GetSelectedTarget().GetProcess()
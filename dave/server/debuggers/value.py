@@ -1,7 +1,9 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, List, Union
+import threading
+import time
+from typing import Any, Callable, List, Union
 
 from ..language_type import LanguageType
 
@@ -22,6 +24,169 @@ class DebuggerMemoryError(Exception):
     pass
 
 
+class ReadBudget:
+    """
+    Caps the number of bytes read from the debugged process.
+
+    While active, the debugger values decimate their memory reads : instead of the
+    whole requested range they read evenly spaced regions of region_size bytes,
+    so that the total read fits in the budget. Reads are decimated channel by
+    channel, every channel being read at the same offsets so they keep the same
+    length. Once the timeout is reached, the remaining channels only read the
+    regions the current one did, and equalize shortens the channels already read
+    to match.
+
+    ```
+    with ReadBudget(256 * 1024, container.byte_size, frame_size, channels) as budget:
+        data = budget.equalize(container.read_from_debugger())
+    approximate = budget.decimated
+    ```
+    """
+
+    __active = threading.local()
+
+    def __init__(
+        self,
+        budget: int,
+        total_size: int,
+        frame_size: int,
+        channels: int = 1,
+        timeout: float = 0.2,
+        region_size: int = 4096,
+    ) -> None:
+        """
+        Parameters
+        ----------
+        budget : int
+            The maximum number of bytes to read
+        total_size : int
+            The number of bytes that would be read without budget
+        frame_size : int
+            Regions are aligned on this size, so they never split a sample (or a
+            frame of interleaved samples)
+        channels : int, optional
+            The number of planar channels in total_size, regions never cross the
+            boundary of a channel. Must be 1 for interleaved data, by default 1
+        timeout : float, optional
+            Maximum duration of the reads in seconds, by default 0.2
+        region_size : int, optional
+            The size of the regions to read, by default 4096
+        """
+        self.__frame_size = max(1, frame_size)
+        self.__channel_size = total_size // max(1, channels)
+        self.__channel_size -= self.__channel_size % self.__frame_size
+        self.__region_frames = max(1, region_size // self.__frame_size)
+        self.__timeout = timeout
+        self.__deadline = 0.0
+        self.__timed_out = False
+        self.__decimated = False
+        # Number of regions read for each channel, in reading order
+        self.__channel_regions: List[int] = []
+
+        channel_frames = self.__channel_size // self.__frame_size
+        ratio = budget / total_size if total_size > 0 else 1.0
+        self.__num_regions = max(1, int(channel_frames * ratio) // self.__region_frames)
+        if ratio >= 1.0 or self.__num_regions * self.__region_frames >= channel_frames:
+            # Reading everything fits in the budget
+            self.__num_regions = 0
+        self.__stride = channel_frames / max(1, self.__num_regions)
+
+    def __enter__(self) -> ReadBudget:
+        self.__deadline = time.monotonic() + self.__timeout
+        ReadBudget.__active.budget = self
+        return self
+
+    def __exit__(self, *_):
+        ReadBudget.__active.budget = None
+
+    @property
+    def decimated(self) -> bool:
+        """
+        True if the reads did not return the whole requested ranges
+        """
+        return self.__decimated
+
+    @staticmethod
+    def active() -> Union[ReadBudget, None]:
+        return getattr(ReadBudget.__active, "budget", None)
+
+    def read(
+        self, addr: int, bytesize: int, readmemory: Callable[[int, int], bytearray]
+    ) -> bytearray:
+        """
+        Read a decimated subset of a memory range, using the given read function.
+
+        The range is expected to hold one or more whole channels, other ranges are
+        read entirely
+        """
+        channel_size = self.__channel_size
+        if (
+            self.__num_regions == 0
+            or channel_size == 0
+            or bytesize == 0
+            or bytesize % channel_size != 0
+        ):
+            return readmemory(addr, bytesize)
+
+        self.__decimated = True
+        data = bytearray()
+        for channel_addr in range(addr, addr + bytesize, channel_size):
+            data += self.__read_channel(channel_addr, readmemory)
+        return data
+
+    def equalize(self, data: bytearray) -> bytearray:
+        """
+        Shorten the channels read before the timeout, so that every channel of
+        data covers the same regions. data must be the concatenation of the
+        channels read while the budget was active
+        """
+        regions = self.__channel_regions
+        region_bytes = self.__region_frames * self.__frame_size
+        if len(regions) <= 1 or min(regions) == max(regions):
+            return data
+        if sum(regions) * region_bytes != len(data):
+            # Not a plain concatenation of the channels, can't be split back
+            return data
+
+        kept = min(regions) * region_bytes
+        view = memoryview(data)
+        equalized = bytearray()
+        offset = 0
+        for num_regions in regions:
+            equalized += view[offset : offset + kept]
+            offset += num_regions * region_bytes
+        self.__channel_regions = [min(regions)] * len(regions)
+        return equalized
+
+    def __read_channel(
+        self, addr: int, readmemory: Callable[[int, int], bytearray]
+    ) -> bytearray:
+        frame_size = self.__frame_size
+        region_frames = self.__region_frames
+        channel_frames = self.__channel_size // frame_size
+        num_regions = self.__num_regions
+        stride = self.__stride
+
+        data = bytearray()
+        region = 0
+        while region < num_regions:
+            if (
+                region != 0
+                and not self.__timed_out
+                and time.monotonic() > self.__deadline
+            ):
+                # The next channels read the same regions as this one
+                self.__timed_out = True
+                self.__num_regions = region
+                break
+            # Clamp so the last region never goes past the end of the channel
+            offset = min(int(region * stride), channel_frames - region_frames)
+            data += readmemory(addr + offset * frame_size, region_frames * frame_size)
+            region += 1
+        self.__channel_regions.append(region)
+        return data
+
+
 class AbstractValue(ABC):
     @abstractmethod
     def language(self) -> LanguageType:
@@ -1,6 +1,8 @@
 from collections import defaultdict
+import importlib
 import re
-from typing import Any, DefaultDict, List, Dict, Set, Union
+import time
+from typing import Any, Callable, DefaultDict, List, Dict, Set, Tuple, Union
 
 from dave.common.logger import Logger
 
@@ -9,22 +11,106 @@ from .entity import Entity, EntityBuildError
 from .debuggers.value import AbstractValue
 from .language_type import LanguageType
 
+# (language, nested, typename), language is None when matching across all languages
+MatchKey = Tuple[Union[LanguageType, None], bool, str]
+# Ordered (class, matcher) candidates and a first-pass filter on their regexes
+DispatchEntry = Tuple[
+    List[Tuple[type[Entity], Union[re.Pattern, Callable[[str], bool]]]],
+    Callable[[str], bool],
+]
+
 
 class EntityFactory(metaclass=SingletonMeta):
     def __init__(self) -> None:
-        self.__simple_entity_classes: DefaultDict[LanguageType, Set[type[Entity]]] = (
-            defaultdict(set)
+        # Lists instead of sets : registration order is the matching priority
+        self.__simple_entity_classes: DefaultDict[LanguageType, List[type[Entity]]] = (
+            defaultdict(list)
+        )
+        self.__nested_entity_classes: DefaultDict[LanguageType, List[type[Entity]]] = (
+            defaultdict(list)
+        )
+        # Dispatch index, reset every time a class is registered
+        self.__dispatch: Dict[Tuple[Union[LanguageType, None], bool], DispatchEntry] = (
+            dict()
+        )
+        self.__matched: Dict[MatchKey, type[Entity]] = dict()
+        self.__unmatched: Set[MatchKey] = set()
+        # Manifest of the entity modules not imported yet: name -> (langs, hints)
+        self.__lazy_modules: Dict[str, Tuple[List[LanguageType], Tuple[str, ...]]] = (
+            dict()
         )
-        self.__nested_entity_classes: DefaultDict[LanguageType, Set[type[Entity]]] = (
-            defaultdict(set)
+
+    def register_module(
+        self, module: str, lang: LanguageType, hints: Tuple[str, ...] = ()
+    ):
+        """
+        Register a module of entity classes to be imported on demand.
+
+        The module is not imported right away. Without hints, it is imported the
+        first time a value of the given language is built. With hints, it is
+        imported the first time a typename containing one of the hints is seen
+        (eg: "juce::"), so library support is only loaded when actually used.
+
+        Parameters
+        ----------
+        module : str
+            The absolute name of the module, as given to importlib.import_module
+        lang : LanguageType
+            The language of the module entities. If the language is set to
+            LanguageType.C it will be loaded for both C and C++ languages
+        hints : Tuple[str, ...], optional
+            Typename substrings that should trigger the import, by default ()
+        """
+        assert lang != LanguageType.UNSUPPORTED
+        langs = (
+            [LanguageType.C, LanguageType.CPP]
+            if lang == LanguageType.C
+            else [
+                lang,
+            ]
         )
+        self.__lazy_modules[module] = (langs, hints)
+
+    def __load_modules(
+        self,
+        lang: Union[LanguageType, None] = None,
+        typename: Union[str, None] = None,
+        everything: bool = False,
+    ):
+        """
+        Import the pending modules required by the given language or typename
+        """
+        if not self.__lazy_modules:
+            return
+
+        to_load = [
+            module
+            for module, (langs, hints) in self.__lazy_modules.items()
+            if everything
+            or (not hints and lang in langs)
+            or (typename is not None and any(hint in typename for hint in hints))
+        ]
+        for module in to_load:
+            # Remove it first, the module might use the factory while loading
+            del self.__lazy_modules[module]
+            start = time.perf_counter()
+            importlib.import_module(module)
+            Logger().debug(
+                f"Loaded {module} in {(time.perf_counter() - start) * 1e3:.2f}ms"
+            )
 
     def get_entities_cls_set(self) -> Set[type[Entity]]:
+        """
+        Returns every registered entity class.
+
+        This will import all the modules registered with register_module
+        """
+        self.__load_modules(everything=True)
         full_set: Set[type[Entity]] = set()
-        for simple_lang_set in self.__simple_entity_classes.values():
-            full_set = full_set | simple_lang_set
-        for nested_lang_set in self.__nested_entity_classes.values():
-            full_set = full_set | nested_lang_set
+        for simple_lang_list in self.__simple_entity_classes.values():
+            full_set = full_set | set(simple_lang_list)
+        for nested_lang_list in self.__nested_entity_classes.values():
+            full_set = full_set | set(nested_lang_list)
         return full_set
 
     def register(self, cls: type[Entity], lang: LanguageType):
@@ -62,31 +148,39 @@ class EntityFactory(metaclass=SingletonMeta):
                     # print(f"REGISTER: {self.__simple_entity_classes[lang]}")
                     if cls in self.__simple_entity_classes[lang]:
                         raise KeyError(lang.name)
-                    self.__simple_entity_classes[lang].add(cls)
+                    self.__simple_entity_classes[lang].append(cls)
             else:
                 for lang in langs:
                     if cls in self.__nested_entity_classes[lang]:
                         raise KeyError(lang.name)
-                    self.__nested_entity_classes[lang].add(cls)
+                    self.__nested_entity_classes[lang].append(cls)
         except KeyError as e:
             raise EntityBuildError(
                 f"Error : {cls} was already registered in the container factory: {e}"
             )
+        finally:
+            self.__reset_dispatch()
 
     def check_valid_simple(self, typename: str) -> Union[type[Entity], None]:
         """
         Returns the matched class if the given typename matches a registered simple entity class
         """
-        for simple_entity_set in self.__simple_entity_classes.values():
-            for simple_entity_cls in simple_entity_set:
-                pattern = simple_entity_cls.typename_matcher()
-                if (
-                    isinstance(pattern, re.Pattern)
-                    and pattern.match(typename) is not None
-                ) or (callable(pattern) and pattern(typename)):
-                    return simple_entity_cls
+        self.__load_modules(typename=typename)
+        return self.__match(None, False, typename)
 
-        return None
+    def check_valid(
+        self, lang: LanguageType, typename: str
+    ) -> Union[type[Entity], None]:
+        """
+        Returns the class build would use for the given typename, simple or nested,
+        without building anything
+        """
+        assert lang != LanguageType.UNSUPPORTED
+        self.__load_modules(lang, typename)
+        simple_entity_cls = self.__match(lang, False, typename)
+        if simple_entity_cls is not None:
+            return simple_entity_cls
+        return self.__match(lang, True, typename)
 
     def build_simple(
         self,
@@ -121,12 +215,10 @@ class EntityFactory(metaclass=SingletonMeta):
             If no registered class matched the typename
         """
         assert dbg_value.language() != LanguageType.UNSUPPORTED
-        for simple_entity_cls in self.__simple_entity_classes[dbg_value.language()]:
-            new_container = self.__build_if_match(
-                simple_entity_cls, dbg_value, typename, varname, dims
-            )
-            if new_container is not None:
-                return new_container
+        self.__load_modules(dbg_value.language(), typename)
+        simple_entity_cls = self.__match(dbg_value.language(), False, typename)
+        if simple_entity_cls is not None:
+            return simple_entity_cls(dbg_value, varname, dims)
 
         raise EntityBuildError(
             f"Error : {typename} did not match any registered simple Entity class"
@@ -166,6 +258,7 @@ class EntityFactory(metaclass=SingletonMeta):
         """
         assert dbg_value.language() != LanguageType.UNSUPPORTED
         Logger().debug(f"Building {varname} from type |{typename}|")
+        self.__load_modules(dbg_value.language(), typename)
 
         # First we check if it is a simple (not nested) class
         try:
@@ -177,28 +270,90 @@ class EntityFactory(metaclass=SingletonMeta):
             raise EntityBuildError(f"Failed to build {typename} with {e}")
 
         # Then we check for nested entity classes
-        for nested_entity in self.__nested_entity_classes[dbg_value.language()]:
-            new_entity = self.__build_if_match(
-                nested_entity, dbg_value, typename, varname, dims
-            )
-            if new_entity is not None:
-                return new_entity
+        nested_entity_cls = self.__match(dbg_value.language(), True, typename)
+        if nested_entity_cls is not None:
+            return nested_entity_cls(dbg_value, varname, dims)
 
         raise EntityBuildError(
             f"Error : {typename} did not match any registered Entity class"
         )
 
-    def __build_if_match(
-        self,
-        entity_cls: type[Entity],
-        dbg_value: Any,
-        typename: str,
-        varname: str,
-        dims: List[int],
-    ):
-        pattern = entity_cls.typename_matcher()
-        if (
-            isinstance(pattern, re.Pattern) and pattern.match(typename) is not None
-        ) or (callable(pattern) and pattern(typename)):
-            return entity_cls(dbg_value, varname, dims)
-        return None
+    # ==========================================================================
+    def __reset_dispatch(self):
+        self.__dispatch.clear()
+        self.__matched.clear()
+        self.__unmatched.clear()
+
+    def __match(
+        self, lang: Union[LanguageType, None], nested: bool, typename: str
+    ) -> Union[type[Entity], None]:
+        """
+        Returns the first registered class matching the typename, or None.
+
+        Results are cached both ways, since the debuggers keep asking for the same
+        typenames, most of which are not audio entities.
+        """
+        key = (lang, nested, typename)
+        matched = self.__matched.get(key)
+        if matched is not None:
+            return matched
+        if key in self.__unmatched:
+            return None
+
+        candidates, prefilter = self.__dispatch_entry(lang, nested)
+        regex_may_match = prefilter(typename)
+        for entity_cls, matcher in candidates:
+            if isinstance(matcher, re.Pattern):
+                if regex_may_match and matcher.match(typename) is not None:
+                    matched = entity_cls
+                    break
+            elif callable(matcher) and matcher(typename):
+                matched = entity_cls
+                break
+
+        if matched is None:
+            self.__unmatched.add(key)
+        else:
+            self.__matched[key] = matched
+        return matched
+
+    def __dispatch_entry(
+        self, lang: Union[LanguageType, None], nested: bool
+    ) -> DispatchEntry:
+        """
+        Builds (or returns the cached) ordered candidates for a language, with a
+        combined alternation of all their regexes used as a first-pass filter
+        """
+        entry = self.__dispatch.get((lang, nested))
+        if entry is not None:
+            return entry
+
+        registry = (
+            self.__nested_entity_classes if nested else self.__simple_entity_classes
+        )
+        if lang is None:
+            classes = [cls for lang_list in registry.values() for cls in lang_list]
+            classes = list(dict.fromkeys(classes))
+        else:
+            classes = registry[lang]
+        candidates = [(cls, cls.typename_matcher()) for cls in classes]
+
+        patterns = [
+            matcher.pattern
+            for _, matcher in candidates
+            if isinstance(matcher, re.Pattern)
+        ]
+        if not patterns:
+            prefilter = lambda _: False
+        else:
+            try:
+                combined = re.compile(
+                    "|".join(f"(?:{pattern})" for pattern in patterns)
+                )
+                prefilter = lambda typename: combined.match(typename) is not None
+            except re.error:
+                prefilter = lambda _: True
+
+        entry = (candidates, prefilter)
+        self.__dispatch[(lang, nested)] = entry
+        return entry
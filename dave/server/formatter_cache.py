@@ -0,0 +1,280 @@
+from __future__ import annotations
+from collections import OrderedDict
+import hashlib
+import os
+from threading import Lock
+from typing import Callable, Dict, List, Tuple, Union
+
+from dave.common.logger import Logger
+from dave.common.sample_type import SampleType
+from dave.common.singleton import SingletonMeta
+
+from .container import Container
+from .entity_factory import EntityFactory
+from .language_type import LanguageType
+from .debuggers.value import AbstractValue, DebuggerMemoryError, ReadBudget
+from .sparkline import compute_sparkline
+
+# Maximum number of bytes retained by the cache, the content of the containers
+# included
+FORMATTER_CACHE_SIZE = int(
+    os.environ.get("DAVE_FORMATTER_CACHE_SIZE", str(64 * 1024 * 1024))
+)
+
+# Maximum number of bytes read to format a container, bigger containers are
+# decimated
+FORMATTER_READ_BUDGET = int(
+    os.environ.get("DAVE_FORMATTER_READ_BUDGET", str(256 * 1024))
+)
+
+# Maximum duration of the reads to format a container, in seconds
+FORMATTER_READ_TIMEOUT = 0.2
+
+# typename, address, byte size, shape, interleaved, fingerprint of the content (and
+# stop epoch if the content was decimated)
+EntryKey = Tuple[str, int, int, Tuple[int, int], bool, bytes]
+
+
+class FormattedContainer:
+    """
+    The output of the debugger formatters for a container : its summary, and the
+    sparkline of each channel computed on first access
+    """
+
+    # Rough size of the bookkeeping of an entry
+    __OVERHEAD = 256
+
+    def __init__(
+        self,
+        summary: str,
+        sample_type: SampleType,
+        channels: int,
+        interleaved: bool,
+        data: bytearray,
+    ) -> None:
+        self.__summary = summary
+        self.__sample_type = sample_type
+        self.__channels = channels
+        self.__interleaved = interleaved
+        self.__data = data
+        self.__sparklines: Dict[int, str] = dict()
+
+    @staticmethod
+    def from_container(
+        container: Container, data: Union[bytearray, None], approximate: bool = False
+    ) -> FormattedContainer:
+        """
+        Build the formatter output of a container, data is None if its content
+        could not be read, approximate is set if it was decimated
+        """
+        shape = container.shape()
+        channels = shape[0] if not container.interleaved else shape[1]
+        if data is None:
+            return FormattedContainer(
+                "Failed to read internals, might be deallocated or unitialized\n",
+                container.sample_type,
+                0,
+                container.interleaved,
+                bytearray(),
+            )
+        return FormattedContainer(
+            container.compute_summary(data, approximate),
+            container.sample_type,
+            channels,
+            container.interleaved,
+            data,
+        )
+
+    @property
+    def summary(self) -> str:
+        return self.__summary
+
+    @property
+    def is_complex(self) -> bool:
+        return self.__sample_type.is_complex()
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.__data) + len(self.__summary) + FormattedContainer.__OVERHEAD
+
+    @property
+    def channels(self) -> int:
+        return self.__channels
+
+    def sparkline(self, channel: int) -> str:
+        assert not self.is_complex
+        sparkline = self.__sparklines.get(channel)
+        if sparkline is None:
+            sparkline = compute_sparkline(
+                self.__data,
+                self.__sample_type,
+                self.__channels,
+                self.__interleaved,
+                channel,
+            )
+            self.__sparklines[channel] = sparkline
+        return sparkline
+
+    def sparklines(self) -> List[str]:
+        return [self.sparkline(channel) for channel in range(self.__channels)]
+
+
+class FormatterCache(metaclass=SingletonMeta):
+    """
+    A LRU cache of the formatters output, evicted by size.
+
+    IDEs call the formatters over and over for the same variables, on every stop
+    and every refresh of their variables view. A variable is read again on each
+    call, but its summary and sparklines are reused if the fingerprint of its
+    content did not change. When the debugger reports memory writes (see
+    track_memory), a variable is only built and read once per stop, identified
+    by its typename and address.
+    """
+
+    def __init__(self, max_bytes: int = FORMATTER_CACHE_SIZE) -> None:
+        self.__lock = Lock()
+        self.__max_bytes = max_bytes
+        self.__bytes = 0
+        self.__entries: OrderedDict[EntryKey, FormattedContainer] = OrderedDict()
+        self.__stop_entries: Dict[Tuple[str, int], EntryKey] = dict()
+        self.__epoch = 0
+        self.__memory_tracked = False
+
+    @property
+    def epoch(self) -> int:
+        return self.__epoch
+
+    def track_memory(self):
+        """
+        Must be called if new_stop is called whenever the memory is modified
+        within a stop (eg. gdb memory_changed event). Otherwise the memory can be
+        written without notice (eg. lldb "memory write" or "expr"), and values
+        are read again on every call
+        """
+        self.__memory_tracked = True
+
+    def new_stop(self, *_):
+        """
+        Must be called whenever the debugged process stops, or its memory is
+        modified
+        """
+        with self.__lock:
+            self.__epoch += 1
+            self.__stop_entries.clear()
+
+    def get(
+        self, dbg_value: AbstractValue, build: Callable[[], Container]
+    ) -> Union[FormattedContainer, None]:
+        """
+        Get the formatter output of a debugger value
+
+        Parameters
+        ----------
+        dbg_value : AbstractValue
+            The value to format
+        build : Callable[[], Container]
+            Builds the container from the value, only called on cache miss
+
+        Returns
+        -------
+        Union[FormattedContainer, None]
+            None if the container does not support formatters
+        """
+        # Most values are not audio containers, they are filtered out by the
+        # factory match cache before anything else is asked to the debugger
+        if dbg_value.language() == LanguageType.UNSUPPORTED:
+            return None
+        typename = dbg_value.typename()
+        entity_cls = EntityFactory().check_valid(dbg_value.language(), typename)
+        if entity_cls is None or not entity_cls.formatter_compatible():
+            return None
+
+        try:
+            address = dbg_value.address()
+        except (TypeError, DebuggerMemoryError):
+            # Values without address (temporaries) can't be cached
+            address = None
+        if address == 0:
+            # lldb reports 0 for values without address
+            address = None
+
+        stop_key = (typename, address)
+        if address is not None and self.__memory_tracked:
+            with self.__lock:
+                key = self.__stop_entries.get(stop_key)
+                if key in self.__entries:
+                    self.__entries.move_to_end(key)
+                    return self.__entries[key]
+
+        container = build()
+        if not container.formatter_compatible():
+            return None
+        try:
+            data, approximate = FormatterCache.__read(container)
+        except DebuggerMemoryError:
+            return FormattedContainer.from_container(container, None)
+        if address is None:
+            return FormattedContainer.from_container(container, data, approximate)
+
+        if approximate:
+            # The unread parts of the container may have changed, a decimated
+            # entry is only reused within the stop it was read in
+            fingerprint = b"epoch:%d:" % self.__epoch
+        else:
+            fingerprint = b""
+        fingerprint += hashlib.blake2b(data, digest_size=16).digest()
+        key = (
+            typename,
+            address,
+            container.byte_size,
+            container.shape(),
+            container.interleaved,
+            fingerprint,
+        )
+        with self.__lock:
+            self.__stop_entries[stop_key] = key
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+                return entry
+
+        entry = FormattedContainer.from_container(container, data, approximate)
+        self.__insert(key, entry)
+        return entry
+
+    @staticmethod
+    def __read(container: Container) -> Tuple[bytearray, bool]:
+        """
+        Read the content of the container within the formatters read budget.
+        Returns the content, and whether it was decimated
+        """
+        frame_size = container.sample_type.byte_size()
+        channels = container.shape()[0]
+        if container.interleaved:
+            # Frames hold every channel, the buffer is decimated as a whole
+            frame_size *= container.shape()[1]
+            channels = 1
+        with ReadBudget(
+            FORMATTER_READ_BUDGET,
+            container.byte_size,
+            frame_size,
+            channels,
+            FORMATTER_READ_TIMEOUT,
+        ) as budget:
+            data = budget.equalize(container.read_from_debugger())
+        return (data, budget.decimated)
+
+    def __insert(self, key: EntryKey, entry: FormattedContainer):
+        nbytes = entry.nbytes
+        if nbytes > self.__max_bytes:
+            Logger().debug(f"{key[0]} at 0x{key[1]:X} is too big to be cached")
+            return
+
+        with self.__lock:
+            if key in self.__entries:
+                return
+            self.__entries[key] = entry
+            self.__bytes += nbytes
+            while self.__bytes > self.__max_bytes:
+                _, evicted = self.__entries.popitem(last=False)
+                self.__bytes -= evicted.nbytes
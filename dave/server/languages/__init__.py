@@ -1,9 +1,20 @@
 import dave.common.server_type as st
 
-# First import vanilla dave support
+from dave.server.entity_factory import EntityFactory
+from dave.server.language_type import LanguageType
+
+# First register vanilla dave support. Modules are only imported when needed,
+# see EntityFactory.register_module
 if st.SERVER_TYPE in (st.ServerType.GDB, st.ServerType.LLDB):
-    from .c_cpp import *
-    from .rust import *
+    # fmt: off
+    EntityFactory().register_module(f"{__name__}.c_cpp.std_1D", LanguageType.C)
+    EntityFactory().register_module(f"{__name__}.c_cpp.std_2D", LanguageType.C)
+    EntityFactory().register_module(f"{__name__}.c_cpp.juce", LanguageType.CPP, ("juce::",))
+    EntityFactory().register_module(f"{__name__}.c_cpp.choc", LanguageType.CPP, ("choc::",))
+    EntityFactory().register_module(f"{__name__}.c_cpp.hart", LanguageType.CPP, ("hart::",))
+    EntityFactory().register_module(f"{__name__}.rust.std_1D", LanguageType.RUST)
+    EntityFactory().register_module(f"{__name__}.rust.std_2D", LanguageType.RUST)
+    # fmt: on
 elif st.SERVER_TYPE == st.ServerType.PYTHON:
     from .python import *
 else:
@@ -17,7 +17,7 @@ from ...entity_factory import EntityFactory
 from ...debuggers.value import AbstractValue, DebuggerMemoryError
 
 from .std_base import StdVector, StdSpan
-from .template_parser import parse_template
+from .template_parser import parse_type
 
 
 class CArrayAny2D(Container2D):
@@ -333,14 +333,13 @@ class StdVector2D(Container2D):
     def _parse_typename(
         cls, typename: str, **_
     ) -> Tuple[SampleType, Optional[int], Optional[int]]:
-        parsed_types = parse_template(typename)
         if not StdVector2D.name_parser(typename):
             raise TypeError(
                 f"StdVector2D could not parse {typename} as a valid std::vector type"
             )
 
         # Check if contains a nested valid 1D container
-        nested_typename = parsed_types[1]
+        nested_typename = parse_type(typename).args[0].text
         nested = EntityFactory().check_valid_simple(nested_typename)
         if nested is None or not issubclass(nested, Container1D):
             raise TypeError(
@@ -352,9 +351,12 @@ class StdVector2D(Container2D):
 
     @staticmethod
     def name_parser(typename: str) -> bool:
-        types = parse_template(typename)
-        if types[0].strip() in ("std::vector", "std::__1::vector") and len(types) == 3:
-            inner = types[1]
+        try:
+            parsed = parse_type(typename)
+        except ValueError:
+            return False
+        if parsed.base_name == "std::vector" and len(parsed.args) == 2:
+            inner = parsed.args[0].text
             return EntityFactory().check_valid_simple(inner) is not None
         return False
 
@@ -1,12 +1,136 @@
-from typing import List
+from __future__ import annotations
+from dataclasses import dataclass
+from functools import lru_cache
+import re
+from typing import List, Tuple
 
+# "->" is kept as a single token so Rust fn types (Fn(f32) -> f32) don't close a template
+_TOKEN_REGEX = re.compile(r"->|[<>,()\[\]]|[^<>,()\[\]-]+|-")
+_INLINE_NAMESPACE_REGEX = re.compile(r"::__(?:1|cxx11)::")
 
-def find_all(to_parse: str, to_find: str) -> List[int]:
-    found = []
-    last = -1
-    while (last := to_parse.find(to_find, last + 1)) != -1:
-        found.append(last)
-    return found
+
+@dataclass(frozen=True)
+class TemplateType:
+    """
+    A parsed C++/Rust typename, as returned by parse_type
+
+    ```
+    std::__1::vector<float, std::__1::allocator<float> >
+    ├── name: std::__1::vector
+    ├── args[0]: float
+    └── args[1]: std::__1::allocator<float>
+                 ├── name: std::__1::allocator
+                 └── args[0]: float
+    ```
+    """
+
+    text: str
+    name: str
+    args: Tuple[TemplateType, ...]
+    suffix: str
+
+    @property
+    def is_template(self) -> bool:
+        return self.text != self.name
+
+    @property
+    def base_name(self) -> str:
+        """
+        The name without the stdlib inline namespaces (std::__1::vector -> std::vector)
+        """
+        return _INLINE_NAMESPACE_REGEX.sub("::", self.name)
+
+
+def _parse_node(
+    typename: str, tokens: List[Tuple[str, int, int]], pos: int
+) -> Tuple[TemplateType, int]:
+    """
+    Parse a single type starting at tokens[pos].
+
+    Stops on the first ',' or '>' that does not belong to the type, and returns
+    the parsed type and the position of this token
+    """
+    start = tokens[pos][1] if pos < len(tokens) else len(typename)
+    name_end = -1
+    args_end = -1
+    args: List[TemplateType] = []
+    brackets = 0
+
+    while pos < len(tokens):
+        token, token_start, _ = tokens[pos]
+        if token in ("(", "["):
+            # Function parameters and array sizes are kept as opaque text
+            brackets += 1
+        elif token in (")", "]"):
+            brackets -= 1
+            if brackets < 0:
+                raise ValueError(f"{typename} is not a valid template")
+        elif brackets > 0:
+            pass
+        elif token == "<":
+            # On nested templates (Outer<int>::Inner<float>) the last list wins
+            name_end = token_start
+            args = []
+            pos += 1
+            while True:
+                arg, pos = _parse_node(typename, tokens, pos)
+                if pos >= len(tokens):
+                    raise ValueError(f"{typename} is not a valid template")
+                token, _, args_end = tokens[pos]
+                if arg.text or token != ">" or args:
+                    args.append(arg)
+                if token == ">":
+                    break
+                pos += 1
+        elif token in (",", ">"):
+            break
+        pos += 1
+
+    if brackets != 0:
+        raise ValueError(f"{typename} is not a valid template")
+
+    end = tokens[pos][1] if pos < len(tokens) else len(typename)
+    text = typename[start:end].strip()
+    if name_end < 0:
+        return (TemplateType(text, text, (), ""), pos)
+
+    name = typename[start:name_end].strip()
+    suffix = typename[args_end:end].strip()
+    return (TemplateType(text, name, tuple(args), suffix), pos)
+
+
+@lru_cache(maxsize=4096)
+def parse_type(typename: str) -> TemplateType:
+    """
+    Parse a C++/Rust typename into a tree of its template parameters.
+
+    This is a single pass over the typename, results are memoized by typename
+    since the debuggers keep asking for the same types.
+
+    Parameters
+    ----------
+    typename : str
+        The typename to parse, as returned by the debugger
+
+    Returns
+    -------
+    TemplateType
+        The parsed type. Non-template types have no args and their name is the
+        full typename
+
+    Raises
+    ------
+    ValueError
+        If the template brackets are not balanced
+    """
+    tokens = [
+        (match.group(), match.start(), match.end())
+        for match in _TOKEN_REGEX.finditer(typename)
+    ]
+    parsed, pos = _parse_node(typename, tokens, 0)
+    if pos != len(tokens):
+        raise ValueError(f"{typename} is not a valid template")
+    return parsed
 
 
 def parse_template(typename: str) -> List[str]:
@@ -14,7 +138,7 @@ def parse_template(typename: str) -> List[str]:
     Parse a C++/Rust instantiated template class or struct.
 
     This function parses the template name and parameters. Parameters themselves
-    could be templates.
+    could be templates. See parse_type to get the full tree.
 
     This function only works on instantiated template typenames as returned by the
     debugger.
@@ -43,50 +167,17 @@ def parse_template(typename: str) -> List[str]:
     List[str]
         A list containing all the types in the template. The first value is the
         name of the templated class itself. The following values are, in order,
-        the template parameters.
+        the template parameters, without whitespaces.
 
     Raises
     ------
     ValueError
         If it fails to parse the template
     """
-    starts = find_all(typename, "<")
-    ends = find_all(typename, ">")
-    if len(starts) != len(ends):
-        raise ValueError(f"{typename} is not a valid template")
-
-    if len(starts) == 0:
+    parsed = parse_type(typename)
+    if not parsed.is_template:
         return [typename]
 
-    template_name = typename[: starts[0]]
-    template_parameters = typename[starts[0] + 1 : ends[-1]]
-    template_parameters_starts = [start - (starts[0] + 1) for start in starts[1:]]
-    template_parameters_ends = [end - (starts[0] + 1) for end in ends[:-1]]
-
-    if "," not in template_parameters:
-        return [template_name, template_parameters]
-
-    ret = [template_name + typename[ends[-1] + 1 :]]
-    commas = find_all(template_parameters, ",")
-    prev_i_comma = -1
-    for i_comma in commas:
-        # count how many < and > between the last comma and this one
-        starts_count = sum(
-            [
-                1 if prev_i_comma < i_start < i_comma else 0
-                for i_start in template_parameters_starts
-            ]
-        )
-        ends_count = sum(
-            [
-                1 if prev_i_comma < i_end < i_comma else 0
-                for i_end in template_parameters_ends
-            ]
-        )
-
-        if starts_count == ends_count:
-            ret.append(template_parameters[prev_i_comma + 1 : i_comma].replace(" ", ""))
-            prev_i_comma = i_comma
-
-    ret.append(template_parameters[prev_i_comma + 1 :].replace(" ", ""))
-    return ret
+    return [parsed.name + parsed.suffix] + [
+        arg.text.replace(" ", "") for arg in parsed.args
+    ]
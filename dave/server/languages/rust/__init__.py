@@ -1,2 +1,15 @@
-from .std_1D import *
-from .std_2D import *
+import importlib
+
+# Submodules are imported on demand, either by the EntityFactory or when accessing
+# one of their classes from this package (eg: rust.RustVector1D)
+__SUBMODULES = ("std_1D", "std_2D")
+
+
+def __getattr__(name: str):
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__} has no attribute {name}")
+    for submodule in __SUBMODULES:
+        module = importlib.import_module(f"{__name__}.{submodule}")
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise AttributeError(f"module {__name__} has no attribute {name}")
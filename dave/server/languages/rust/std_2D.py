@@ -12,7 +12,6 @@ from ...entity_factory import EntityFactory
 from ...debuggers.value import AbstractValue, DebuggerMemoryError
 
 from .std_base import RustSlice, RustVector
-from ..c_cpp.template_parser import parse_template
 
 
 class RustArrayArray2D(Container2D):
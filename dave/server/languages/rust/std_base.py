@@ -1,5 +1,4 @@
 from ...debuggers.value import AbstractValue
-from ..c_cpp.template_parser import parse_template
 
 import dave.common.server_type as st
 
@@ -0,0 +1,232 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from itertools import filterfalse
+import math
+import os
+from typing import List, Union
+
+from dave.common.sample_type import SampleType
+
+# numpy is not always available in the debugger's python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WAVEFORM = "_⎽⎼—⎻⎺‾"
+
+# Maximum number of buckets of a sparkline, so its length doesn't grow with the
+# number of samples
+SPARKLINE_WIDTH = int(os.environ.get("DAVE_SPARKLINE_WIDTH", "64"))
+
+# for some reason sys.float_info.epsilon is nowhere near the rounding error
+# introduced by lldb when importing float values to python
+_OUT_OF_BOUNDS = 1.0 + 0.00000015
+
+
+@dataclass
+class _Buckets:
+    """
+    The reduction of a channel into consecutive buckets of samples
+    """
+
+    # The lowest and highest samples, NaNs excluded, 0 if there are none.
+    # Infinite values are only used for the sign of the bucket
+    mins: List[float]
+    maxs: List[float]
+    sizes: List[int]
+    zeros: List[int]
+    has_nan: List[bool]
+    has_inf: List[bool]
+    # True if the sign changed between two consecutive samples of the bucket, or
+    # between the last sample of the previous bucket and its first one. A NaN
+    # hides the crossings around it
+    crosses: List[bool]
+
+
+def _edges(num_samples: int, width: int) -> List[int]:
+    num_buckets = min(width, num_samples)
+    return [(i * num_samples) // num_buckets for i in range(num_buckets)]
+
+
+def _bucketize_numpy(samples: np.ndarray, width: int) -> _Buckets:
+    edges = np.asarray(_edges(samples.size, width))
+    is_nan = np.isnan(samples)
+    is_inf = np.isinf(samples)
+    not_nan = np.where(is_nan, 0.0, samples)
+    sizes = np.diff(np.append(edges, samples.size))
+    nonzeros = np.add.reduceat(samples != 0.0, edges)
+    negative = samples < 0.0
+    changes = np.zeros(samples.size, dtype=bool)
+    changes[1:] = (negative[1:] != negative[:-1]) & ~is_nan[1:] & ~is_nan[:-1]
+    return _Buckets(
+        np.minimum.reduceat(not_nan, edges).tolist(),
+        np.maximum.reduceat(not_nan, edges).tolist(),
+        sizes.tolist(),
+        (sizes - nonzeros).tolist(),
+        np.logical_or.reduceat(is_nan, edges).tolist(),
+        np.logical_or.reduceat(is_inf, edges).tolist(),
+        np.logical_or.reduceat(changes, edges).tolist(),
+    )
+
+
+def _bucketize_python(samples: List[float], width: int) -> _Buckets:
+    edges = _edges(len(samples), width)
+    changes = [False] + [
+        (previous < 0.0) is not (sample < 0.0)
+        and not (math.isnan(previous) or math.isnan(sample))
+        for previous, sample in zip(samples, samples[1:])
+    ]
+    buckets = _Buckets([], [], [], [], [], [], [])
+    for start, end in zip(edges, edges[1:] + [len(samples)]):
+        bucket = samples[start:end]
+        has_nan = any(map(math.isnan, bucket))
+        has_inf = any(map(math.isinf, bucket))
+        if has_nan:
+            bucket = list(filterfalse(math.isnan, bucket)) or [0.0]
+        buckets.mins.append(min(bucket))
+        buckets.maxs.append(max(bucket))
+        buckets.sizes.append(end - start)
+        buckets.zeros.append(bucket.count(0.0) if not (has_nan or has_inf) else 0)
+        buckets.has_nan.append(has_nan)
+        buckets.has_inf.append(has_inf)
+        buckets.crosses.append(any(changes[start:end]))
+    return buckets
+
+
+def _render(buckets: _Buckets) -> str:
+    peaks = [
+        high if abs(high) >= abs(low) else low
+        for low, high in zip(buckets.mins, buckets.maxs)
+    ]
+    scale = max(filter(math.isfinite, map(abs, peaks)), default=0.0)
+    if scale <= 0.0:
+        scale = 1.0
+
+    output = "["
+    num_zeros = 0
+    for peak, size, zeros, has_nan, has_inf, crosses in zip(
+        peaks,
+        buckets.sizes,
+        buckets.zeros,
+        buckets.has_nan,
+        buckets.has_inf,
+        buckets.crosses,
+    ):
+        if zeros == size:
+            if num_zeros == 0:
+                output += "0"
+            num_zeros += zeros
+            continue
+
+        if num_zeros > 1:
+            output += "(" + str(num_zeros) + ")"
+        num_zeros = 0
+
+        if has_inf:
+            output += "I"
+        elif abs(peak) > _OUT_OF_BOUNDS:
+            output += "E"
+        elif has_nan:
+            output += "N"
+        elif crosses:
+            output += "x"  # zero crossing
+        else:
+            # All the samples have the sign of the peak. Normalize so we can see
+            # detail, then make it a positive number that varies from 0 to 6
+            character = WAVEFORM[int((peak / scale + 1) / 2.0 * 6.99)]
+            if output[-1] != character:
+                output += character
+
+    if num_zeros > 1:
+        output += "(" + str(num_zeros) + ")"
+
+    return output + "]"
+
+
+def compute_sparkline(
+    data: Union[bytes, bytearray, memoryview],
+    sample_type: SampleType,
+    channels: int,
+    interleaved: bool,
+    channel: int,
+    width: int = SPARKLINE_WIDTH,
+) -> str:
+    """
+    Compute the ascii representation of a single channel of a real audio buffer.
+
+    Each channel is reduced to at most width buckets, keeping their min, max and
+    whether they crossed zero. A bucket follows the same rules as a single
+    sample :
+    - "I" if it contains an Inf
+    - "E" if its peak is out of the [-1, 1] bounds
+    - "N" if it contains a NaN
+    - "x" if it crossed zero, within the bucket or since the previous one
+    - "0" for a run of zeros, followed by the number of zeros in the run
+    - one of the waveform glyphs otherwise, scaled to the peak of the channel
+
+    Parameters
+    ----------
+    data : Union[bytes, bytearray, memoryview]
+        The raw content of the buffer, as read from the debugger
+    sample_type : SampleType
+        The type of the samples in the buffer, must be real
+    channels : int
+        The number of channels in the buffer
+    interleaved : bool
+        True if the channels are interleaved in the buffer
+    channel : int
+        The channel to represent
+    width : int, optional
+        The maximum number of buckets of the sparkline
+
+    Returns
+    -------
+    str
+        The sparkline of the channel
+    """
+    assert not sample_type.is_complex()
+    assert 0 <= channel < channels
+    width = max(1, width)
+    fmt = sample_type.struct_fmt()
+    view = memoryview(data).cast("B")
+    view = view[: len(view) - len(view) % sample_type.byte_size()].cast(fmt)
+    block_size = len(view) // channels
+
+    # Strided views, no copy until the values are extracted
+    if interleaved:
+        samples = view[channel : channels * block_size : channels]
+    else:
+        samples = view[channel * block_size : (channel + 1) * block_size]
+
+    if block_size == 0:
+        buckets = _Buckets([], [], [], [], [], [], [])
+    elif np is not None:
+        values = np.asarray(samples, dtype=np.float64)
+        buckets = _bucketize_numpy(values, width)
+    else:
+        buckets = _bucketize_python(samples.tolist(), width)
+    return _render(buckets)
+
+
+def compute_sparklines(
+    data: Union[bytes, bytearray, memoryview],
+    sample_type: SampleType,
+    channels: int,
+    interleaved: bool,
+    width: int = SPARKLINE_WIDTH,
+) -> List[str]:
+    """
+    Compute the ascii representation of each channel of a real audio buffer.
+
+    See compute_sparkline
+
+    Returns
+    -------
+    List[str]
+        One sparkline per channel
+    """
+    return [
+        compute_sparkline(data, sample_type, channels, interleaved, channel, width)
+        for channel in range(channels)
+    ]
@@ -0,0 +1,268 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from itertools import compress, filterfalse
+import math
+from operator import mul
+import sys
+from typing import Union
+
+from dave.common.sample_type import SampleType
+
+# numpy is not always available in the debugger's python
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Smallest normal value, anything smaller but non-zero is a denormal
+_FLOAT_TINY = 1.1754943508222875e-38
+_DOUBLE_TINY = sys.float_info.min
+
+# Number of samples processed at once, bounds the memory used on big buffers
+CHUNK_SIZE = 1 << 16
+
+
+@dataclass
+class SummaryStatistics:
+    """
+    Statistics of an audio buffer, computed by compute_statistics
+
+    For complex data min, max, peak and rms are computed on the magnitude of the
+    samples, dc is the complex mean.
+
+    min and max account for every sample but NaNs, so they can be infinite. peak,
+    rms and dc only account for finite samples. Each one is None when there are
+    no samples to compute it from
+    """
+
+    is_complex: bool = False
+    count: int = 0
+    finite: int = 0
+    min: Union[float, None] = None
+    max: Union[float, None] = None
+    peak: Union[float, None] = None
+    rms: Union[float, None] = None
+    dc: Union[float, complex, None] = None
+    nans: int = 0
+    infs: int = 0
+    denormals: int = 0
+
+    def describe(self) -> str:
+        """
+        A short human readable description of the statistics, used by the
+        debugger formatters
+        """
+        parts = []
+        if self.min is not None:
+            prefix = "|{}|" if self.is_complex else "{}"
+            parts.append(f"{prefix.format('min')} {self.min:.4E}")
+            parts.append(f"{prefix.format('max')} {self.max:.4E}")
+        if self.finite != 0:
+            if self.is_complex:
+                parts.append(f"rms {self.rms:.4E}")
+                parts.append(f"dc {self.dc.real:.4E}{self.dc.imag:+.4E}j")
+            else:
+                parts.append(f"peak {self.peak:.4E}")
+                parts.append(f"rms {self.rms:.4E}")
+                parts.append(f"dc {self.dc:.4E}")
+
+        for count, label in (
+            (self.nans, "NaN"),
+            (self.infs, "Inf"),
+            (self.denormals, "denormal"),
+        ):
+            if count != 0:
+                parts.append(f"{count} {label}")
+
+        return ", ".join(parts)
+
+
+class _Accumulator:
+    """
+    Accumulates the statistics of successive chunks
+    """
+
+    def __init__(self, cpx: bool) -> None:
+        self.__cpx = cpx
+        self.__stats = SummaryStatistics(is_complex=cpx)
+        self.__sum = 0.0
+        self.__sum_imag = 0.0
+        self.__sum_squares = 0.0
+
+    def add(
+        self,
+        count: int,
+        finite: int,
+        min_: Union[float, None],
+        max_: Union[float, None],
+        peak: float,
+        sum_: float,
+        sum_imag: float,
+        sum_squares: float,
+        nans: int,
+        infs: int,
+        denormals: int,
+    ):
+        stats = self.__stats
+        stats.count += count
+        stats.nans += nans
+        stats.infs += infs
+        stats.denormals += denormals
+        if min_ is not None:
+            stats.min = min_ if stats.min is None else min(stats.min, min_)
+            stats.max = max_ if stats.max is None else max(stats.max, max_)
+        if finite == 0:
+            return
+
+        stats.finite += finite
+        stats.peak = peak if stats.peak is None else max(stats.peak, peak)
+        self.__sum += sum_
+        self.__sum_imag += sum_imag
+        self.__sum_squares += sum_squares
+
+    def result(self) -> SummaryStatistics:
+        stats = self.__stats
+        if stats.finite != 0:
+            stats.rms = math.sqrt(self.__sum_squares / stats.finite)
+            if self.__cpx:
+                stats.dc = complex(self.__sum, self.__sum_imag) / stats.finite
+            else:
+                stats.dc = self.__sum / stats.finite
+        return stats
+
+
+def _add_chunk_numpy(acc: _Accumulator, chunk: memoryview, sample_type: SampleType):
+    dtype = {
+        SampleType.FLOAT: np.float32,
+        SampleType.DOUBLE: np.float64,
+        SampleType.CPX_F: np.complex64,
+        SampleType.CPX_D: np.complex128,
+    }[sample_type]
+    tiny = np.finfo(dtype).tiny
+    samples = np.frombuffer(chunk, dtype=dtype)
+    count = samples.size
+
+    if sample_type.is_complex():
+        components = samples.view(samples.real.dtype)
+        denormals = np.count_nonzero((np.abs(components) < tiny) & (components != 0.0))
+        values = np.abs(samples.astype(np.complex128))
+    else:
+        values = samples.astype(np.float64)
+        denormals = np.count_nonzero((np.abs(samples) < tiny) & (samples != 0.0))
+
+    nans = np.count_nonzero(np.isnan(values))
+    infs = np.count_nonzero(np.isinf(values))
+    not_nan = values[~np.isnan(values)] if nans != 0 else values
+    min_ = float(not_nan.min()) if not_nan.size != 0 else None
+    max_ = float(not_nan.max()) if not_nan.size != 0 else None
+    if nans != 0 or infs != 0:
+        finite_mask = np.isfinite(values)
+        values = values[finite_mask]
+        samples = samples[finite_mask]
+    if values.size == 0:
+        acc.add(count, 0, min_, max_, 0.0, 0.0, 0.0, 0.0, nans, infs, denormals)
+        return
+
+    if sample_type.is_complex():
+        total = samples.astype(np.complex128).sum()
+        sum_, sum_imag = float(total.real), float(total.imag)
+    else:
+        sum_, sum_imag = float(values.sum()), 0.0
+
+    acc.add(
+        count,
+        values.size,
+        min_,
+        max_,
+        float(np.abs(values).max()),
+        sum_,
+        sum_imag,
+        float(np.dot(values, values)),
+        nans,
+        infs,
+        denormals,
+    )
+
+
+def _add_chunk_python(acc: _Accumulator, chunk: memoryview, sample_type: SampleType):
+    # Every loop below runs in C through builtins, map and compress
+    components = chunk.cast("f" if sample_type.struct_fmt()[0] == "f" else "d")
+    components = components.tolist()
+    tiny = _FLOAT_TINY if sample_type.struct_fmt()[0] == "f" else _DOUBLE_TINY
+    denormals = sum(map(tiny.__gt__, map(abs, components))) - components.count(0.0)
+
+    if sample_type.is_complex():
+        real, imag = components[0::2], components[1::2]
+        values = list(map(math.hypot, real, imag))
+    else:
+        real, imag = components, []
+        values = components
+    count = len(values)
+
+    nans = sum(map(math.isnan, values))
+    infs = sum(map(math.isinf, values))
+    not_nan = values
+    if nans != 0:
+        not_nan = list(filterfalse(math.isnan, values))
+    min_ = min(not_nan) if not_nan else None
+    max_ = max(not_nan) if not_nan else None
+    if nans != 0 or infs != 0:
+        finite_mask = list(map(math.isfinite, values))
+        values = list(compress(values, finite_mask))
+        real = list(compress(real, finite_mask))
+        imag = list(compress(imag, finite_mask))
+    if len(values) == 0:
+        acc.add(count, 0, min_, max_, 0.0, 0.0, 0.0, 0.0, nans, infs, denormals)
+        return
+
+    acc.add(
+        count,
+        len(values),
+        min_,
+        max_,
+        max(map(abs, values)),
+        math.fsum(real),
+        math.fsum(imag),
+        math.fsum(map(mul, values, values)),
+        nans,
+        infs,
+        denormals,
+    )
+
+
+def compute_statistics(
+    data: Union[bytes, bytearray, memoryview],
+    sample_type: SampleType,
+    chunk_size: int = CHUNK_SIZE,
+) -> SummaryStatistics:
+    """
+    Compute the statistics of an audio buffer in a single pass.
+
+    The buffer is processed in chunks of chunk_size samples, using numpy when
+    it's available, or the array protocol of memoryview otherwise.
+
+    Parameters
+    ----------
+    data : Union[bytes, bytearray, memoryview]
+        The raw content of the buffer, as read from the debugger
+    sample_type : SampleType
+        The type of the samples in the buffer
+    chunk_size : int, optional
+        The maximum number of samples to process at once
+
+    Returns
+    -------
+    SummaryStatistics
+        The statistics of the buffer. Trailing bytes that don't form a complete
+        sample are ignored
+    """
+    add_chunk = _add_chunk_python if np is None else _add_chunk_numpy
+    byte_size = sample_type.byte_size()
+    view = memoryview(data).cast("B")
+    usable = len(view) - len(view) % byte_size
+    chunk_bytes = max(1, chunk_size) * byte_size
+
+    acc = _Accumulator(sample_type.is_complex())
+    for start in range(0, usable, chunk_bytes):
+        add_chunk(acc, view[start : min(start + chunk_bytes, usable)], sample_type)
+    return acc.result()
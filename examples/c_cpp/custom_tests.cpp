@@ -1,3 +1,5 @@
+#include <array>
+
 #include "custom_containers.hpp"
 #include "numerics.hpp"
 
@@ -117,11 +119,29 @@ static void scope() {
   BREAKABLE_END;
 }
 
+// Both functions declare a local type with the same name, they must not be
+// mistaken for one another
+static void localTypesFloat() {
+  using Samples = std::array<float, 3>;
+  auto samples  = Samples{1.F, -1.F, 0.F};
+  //// localTypesFloat::0
+  BREAKABLE_END;
+}
+
+static void localTypesDouble() {
+  using Samples = std::array<double, 5>;
+  auto samples  = Samples{1.0, -1.0, 0.0, 0.0, 0.0};
+  //// localTypesDouble::0
+  BREAKABLE_END;
+}
+
 int main() {
   containerPrettyPrinters();
   containerPrettyPrintersInterleaved();
   daveCommands();
   scope();
+  localTypesFloat();
+  localTypesDouble();
 
   return 0;
 }
\ No newline at end of file
@@ -0,0 +1,134 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from PySide6.QtCore import QCoreApplication, QObject
+import shiboken6
+
+from dave.client.entity.compute_scheduler import ComputeScheduler
+from dave.common.singleton import SingletonMeta
+
+
+class Owner:
+    pass
+
+
+class SchedulerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.results = []
+        SingletonMeta._instances.pop(ComputeScheduler, None)
+
+    def tearDown(self) -> None:
+        SingletonMeta._instances.pop(ComputeScheduler, None)
+
+    def done(self, result):
+        self.results.append(result)
+
+    def wait_results(self, count: int, timeout: float = 5.0):
+        """
+        Process the deliveries of the workers until count results were given
+        """
+        deadline = time.monotonic() + timeout
+        while len(self.results) < count and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+        self.assertEqual(len(self.results), count)
+
+
+class TestSynchronous(SchedulerTestCase):
+    def test_run_on_caller(self):
+        scheduler = ComputeScheduler(0)
+        scheduler.submit(Owner(), "psd", threading.get_ident, self.done)
+        self.assertEqual(self.results, [threading.get_ident()])
+
+
+class TestWorkers(SchedulerTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.scheduler = ComputeScheduler(2)
+
+    def test_result_on_ui_thread(self):
+        owner = Owner()
+        self.scheduler.submit(
+            owner,
+            "psd",
+            threading.get_ident,
+            lambda worker: self.done((worker, threading.get_ident())),
+        )
+        self.wait_results(1)
+        worker, ui = self.results[0]
+        self.assertNotEqual(worker, threading.get_ident())
+        self.assertEqual(ui, threading.get_ident())
+
+    def test_superseded(self):
+        owner = Owner()
+        started, release = threading.Event(), threading.Event()
+
+        def blocked():
+            started.set()
+            release.wait(5.0)
+            return "first"
+
+        self.scheduler.submit(owner, "spectrogram", blocked, self.done)
+        self.assertTrue(started.wait(5.0))
+        # The running job is superseded, its result is discarded
+        self.scheduler.submit(owner, "spectrogram", lambda: "second", self.done)
+        release.set()
+        self.wait_results(1)
+        time.sleep(0.05)
+        self.app.processEvents()
+        self.assertEqual(self.results, ["second"])
+
+    def test_cancelled_before_start(self):
+        SingletonMeta._instances.pop(ComputeScheduler, None)
+        scheduler = ComputeScheduler(1)
+        owner = Owner()
+        release = threading.Event()
+        calls = []
+        # Keep the single worker busy
+        scheduler.submit(Owner(), "busy", lambda: release.wait(5.0), lambda _: None)
+        scheduler.submit(owner, "psd", lambda: calls.append(1), self.done)
+        scheduler.submit(owner, "psd", lambda: "last", self.done)
+        release.set()
+        self.wait_results(1)
+        self.assertEqual(self.results, ["last"])
+        self.assertEqual(calls, [])
+
+    def test_independent_keys_and_owners(self):
+        first, second = Owner(), Owner()
+        self.scheduler.submit(first, "psd", lambda: 1, self.done)
+        self.scheduler.submit(first, "spectrogram", lambda: 2, self.done)
+        self.scheduler.submit(second, "psd", lambda: 3, self.done)
+        self.wait_results(3)
+        self.assertEqual(sorted(self.results), [1, 2, 3])
+
+    def test_error(self):
+        def failing():
+            raise RuntimeError("boom")
+
+        owner = Owner()
+        with mock.patch("dave.client.entity.compute_scheduler.Logger") as logger:
+            self.scheduler.submit(owner, "psd", failing, self.done)
+            self.scheduler.submit(Owner(), "psd", lambda: "other", self.done)
+            self.wait_results(1)
+        self.assertEqual(self.results, ["other"])
+        logger().warning.assert_called_once()
+
+    def test_deleted_owner(self):
+        owner = QObject()
+        release = threading.Event()
+        self.scheduler.submit(owner, "psd", lambda: release.wait(5.0), self.done)
+        self.scheduler.submit(Owner(), "psd", lambda: release.wait(5.0), self.done)
+        # Deleted while computing, its callback is not called
+        shiboken6.delete(owner)
+        release.set()
+        self.wait_results(1)
+        time.sleep(0.05)
+        self.app.processEvents()
+        self.assertEqual(len(self.results), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
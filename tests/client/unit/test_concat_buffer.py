@@ -0,0 +1,130 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from dave.client.container import concat_buffer
+from dave.client.container.concat_buffer import (
+    ConcatBuffer,
+    concat_capacity,
+    parse_capacity,
+)
+
+
+class TestCapacity(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_capacity("480000", 48000), 480000)
+        self.assertEqual(parse_capacity(" 60s ", 48000), 60 * 48000)
+        self.assertEqual(parse_capacity("0.5s", 48000), 24000)
+        for capacity in ("", "s", "-1", "0", "0.1", "10ms", "1e3"):
+            with self.assertRaises(ValueError, msg=capacity):
+                parse_capacity(capacity, 48000)
+
+    def test_invalid_setting(self):
+        with mock.patch.object(concat_buffer, "CONCAT_CAPACITY", "forever"):
+            self.assertEqual(concat_capacity(100), 6000)
+
+
+class TestConcatBuffer(unittest.TestCase):
+    def test_empty(self):
+        buffer = ConcatBuffer()
+        self.assertIsNone(buffer.data)
+        self.assertEqual(buffer.length, 0)
+
+    def test_unbounded(self):
+        buffer = ConcatBuffer()
+        expected = np.empty((2, 0))
+        for i in range(50):
+            chunk = np.full((2, i % 7 + 1), float(i))
+            self.assertEqual(buffer.append(chunk), 0)
+            expected = np.concatenate((expected, chunk), axis=-1)
+            np.testing.assert_array_equal(buffer.data, expected)
+
+    def test_eviction(self):
+        buffer = ConcatBuffer()
+        samples = np.arange(1000, dtype=np.float32)
+        start = 0
+        stored = 0
+        for length in (10, 30, 1, 99, 7, 100, 250, 3, 500):
+            evicted = buffer.append(samples[start : start + length], capacity=100)
+            # Oldest samples go first, the capacity is never exceeded
+            self.assertEqual(evicted, max(0, stored + length - 100))
+            start += length
+            stored = min(100, stored + length)
+            self.assertEqual(buffer.length, stored)
+            np.testing.assert_array_equal(buffer.data, samples[start - stored : start])
+
+    def test_capacity_change(self):
+        buffer = ConcatBuffer()
+        samples = np.arange(100, dtype=np.float64)
+        buffer.append(samples[:80], capacity=100)
+        # A smaller capacity evicts down to it
+        self.assertEqual(buffer.append(samples[80:90], capacity=50), 40)
+        np.testing.assert_array_equal(buffer.data, samples[40:90])
+        # Bigger than the capacity, only its last samples are kept
+        self.assertEqual(buffer.append(samples, capacity=30), 50 + 70)
+        np.testing.assert_array_equal(buffer.data, samples[70:])
+
+    def test_incompatible_data(self):
+        buffer = ConcatBuffer()
+        buffer.append(np.zeros((2, 10)))
+        # Other channel count, the stored data is evicted
+        self.assertEqual(buffer.append(np.ones((3, 5))), 10)
+        np.testing.assert_array_equal(buffer.data, np.ones((3, 5)))
+        # Other type
+        self.assertEqual(buffer.append(np.ones((3, 20), np.float32), capacity=8), 17)
+        self.assertEqual(buffer.data.dtype, np.float32)
+        self.assertEqual(buffer.length, 8)
+
+    def test_snapshots_stay_valid(self):
+        buffer = ConcatBuffer()
+        samples = np.arange(10000, dtype=np.int64)
+        snapshots = []
+        start = 0
+        for length in (5, 17, 100, 3, 999, 64, 2000, 1, 4000):
+            buffer.append(samples[start : start + length], capacity=1000)
+            start += length
+            snapshots.append((buffer.data, start))
+        # Views handed out are never written by later appends
+        for snapshot, end in snapshots:
+            np.testing.assert_array_equal(
+                snapshot, samples[end - snapshot.shape[-1] : end]
+            )
+
+    def test_amortized_growth(self):
+        buffer = ConcatBuffer()
+        buffers = set()
+        for i in range(10000):
+            buffer.append(np.array([i], dtype=np.int32), capacity=100)
+            buffers.add(id(buffer.data.base))
+        np.testing.assert_array_equal(buffer.data, np.arange(9900, 10000))
+        # The window is moved to a new buffer every capacity samples at most
+        self.assertLessEqual(len(buffers), 10000 // 100 + 1)
+
+    def test_drop(self):
+        buffer = ConcatBuffer()
+        buffer.append(np.arange(10))
+        buffer.drop(3)
+        np.testing.assert_array_equal(buffer.data, np.arange(3, 10))
+        buffer.drop(-1)
+        self.assertEqual(buffer.length, 7)
+        buffer.drop(100)
+        self.assertEqual(buffer.length, 0)
+        buffer.append(np.arange(2))
+        np.testing.assert_array_equal(buffer.data, np.arange(2))
+
+    def test_reset(self):
+        buffer = ConcatBuffer()
+        data = np.arange(6, dtype=np.float64)
+        buffer.reset(data)
+        np.testing.assert_array_equal(buffer.data, data)
+        buffer.append(np.array([6.0, 7.0]), capacity=4)
+        np.testing.assert_array_equal(buffer.data, [4, 5, 6, 7])
+        # The initial data is only read
+        np.testing.assert_array_equal(data, np.arange(6))
+        buffer.reset()
+        self.assertIsNone(buffer.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from dave.client.container import concat_buffer
+from dave.client.container.container_model import ContainerModel
+from dave.client.container.min_max_pyramid import MinMaxPyramid
+from dave.client.container.stft import PsdChannel, StftChannel
+from dave.common.raw_container import RawContainer
+from dave.common.sample_type import SampleType
+
+Layout = RawContainer.Layout
+
+
+def make_model(data: np.ndarray, interleaved: bool = False) -> ContainerModel:
+    raw = RawContainer(
+        1,
+        "buffer",
+        True,
+        Layout.REAL_2D,
+        [Layout.REAL_2D],
+        bytearray(data.tobytes()),
+        data.shape,
+        False,
+        interleaved,
+        SampleType.FLOAT,
+    )
+    return ContainerModel(raw)
+
+
+def update(model: ContainerModel, data: np.ndarray):
+    model.update_data(
+        RawContainer.InScopeUpdate(1, bytearray(data.tobytes()), data.shape)
+    )
+
+
+class TestConcatEviction(unittest.TestCase):
+    """
+    Once the concat buffer is full, every update evicts the oldest samples
+    """
+
+    CAPACITY = 1000
+
+    def setUp(self) -> None:
+        patcher = mock.patch.object(
+            concat_buffer, "CONCAT_CAPACITY", str(TestConcatEviction.CAPACITY)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        rng = np.random.default_rng(5)
+        self.capture = rng.standard_normal((2, 6000)).astype(np.float32)
+        self.model = make_model(self.capture[:, :300])
+        self.model.concat = True
+
+    def updates(self):
+        """
+        Concatenate the capture, 300 samples at a time, yields the samples kept
+        """
+        for end in range(600, self.capture.shape[1] + 1, 300):
+            update(self.model, self.capture[:, end - 300 : end])
+            yield self.capture[:, max(0, end - TestConcatEviction.CAPACITY) : end]
+
+    def test_pyramids_extended(self):
+        self.model.update_view_type("Waveform")
+        pyramids = self.model._channel_render_data(None, False)
+        self.assertIsInstance(pyramids[0], MinMaxPyramid)
+        for kept in self.updates():
+            # Updated in place, never built again
+            current = self.model._channel_render_data(None, False)
+            self.assertEqual(len(current), 2)
+            for channel, pyramid in enumerate(current):
+                self.assertIs(pyramid, pyramids[channel])
+                np.testing.assert_array_equal(pyramid.samples, kept[channel])
+                self.assertEqual(
+                    pyramid.bounds(), (kept[channel].min(), kept[channel].max())
+                )
+
+    def test_spectrograms_extended(self):
+        self.model.update_view_type("Spectrogram")
+        channels = self.model._channel_render_data(None, False)
+        self.assertIsInstance(channels[0], StftChannel)
+        for kept in self.updates():
+            current = self.model._channel_render_data(None, False)
+            self.assertIs(current[0], channels[0])
+            np.testing.assert_array_equal(current[1].samples, kept[1])
+
+    def test_psd_rebuilt(self):
+        # The PSD averages all the frames kept, it is computed again on update
+        self.model.update_view_type("PSD")
+        previous = self.model._channel_render_data(None, False)
+        self.assertIsInstance(previous[0], PsdChannel)
+        for kept in self.updates():
+            current = self.model._channel_render_data(None, False)
+            self.assertIsNot(current[0], previous[0])
+            np.testing.assert_array_equal(current[0].samples, kept[0])
+            previous = current
+
+
+class TestSpecialValuesSpan(unittest.TestCase):
+    def test_none(self):
+        self.assertIsNone(make_model(np.zeros((2, 10), np.float32)).special_values_span)
+
+    def test_channel_rows(self):
+        data = np.zeros((2, 100), np.float32)
+        data[0, 20] = np.nan
+        data[1, 5] = np.inf
+        self.assertEqual(make_model(data).special_values_span, (5, 20))
+
+    def test_channels_in_a_row(self):
+        # Two channels one after the other in a single row
+        data = np.zeros((2, 100), np.float32)
+        data[0, 10] = data[0, 20] = np.nan
+        data[1, 5] = np.inf
+        model = make_model(data.reshape(1, -1))
+        self.assertTrue(model.validate_and_update_channel(2))
+        self.assertEqual(model.special_values_span, (5, 20))
+
+        data[...] = 0.0
+        data[0, 99] = data[1, 0] = np.nan
+        model = make_model(data.reshape(1, -1))
+        model.validate_and_update_channel(2)
+        self.assertEqual(model.special_values_span, (0, 99))
+
+    def test_channels_across_rows(self):
+        # Each channel spans two rows
+        data = np.zeros((2, 100), np.float32)
+        data[0, 70] = np.nan
+        data[1, 30] = np.nan
+        model = make_model(data.reshape(4, 50))
+        model.validate_and_update_channel(2)
+        self.assertEqual(model.special_values_span, (30, 70))
+
+    def test_interleaved(self):
+        frames = np.zeros((100, 2), np.float32)
+        frames[40, 0] = np.nan
+        frames[10, 1] = np.inf
+        model = make_model(frames.reshape(1, -1), interleaved=True)
+        self.assertTrue(model.validate_and_update_channel(2))
+        self.assertEqual(model.special_values_span, (10, 40))
+
+        model = make_model(frames, interleaved=True)
+        self.assertEqual(model.channels, 2)
+        self.assertEqual(model.special_values_span, (10, 40))
+
+
+if __name__ == "__main__":
+    unittest.main()
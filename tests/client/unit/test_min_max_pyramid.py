@@ -0,0 +1,200 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from dave.client.container.min_max_pyramid import MinMaxPyramid
+
+FACTOR = MinMaxPyramid.FACTOR
+
+
+def reference_level(samples: np.ndarray, level: int, offset: int = 0):
+    """
+    The min and max of the blocks of a level, reduced straight from the samples,
+    samples[0] being the sample offset of the capture
+    """
+    block = FACTOR**level
+    finite = np.where(np.isfinite(samples), samples, np.nan)
+    first, last = offset // block, -(-(offset + samples.shape[0]) // block)
+    edges = np.maximum(np.arange(first, last) * block, offset) - offset
+    with np.errstate(invalid="ignore"):
+        return (np.fmin.reduceat(finite, edges), np.fmax.reduceat(finite, edges))
+
+
+class TestMinMaxPyramid(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rng = np.random.default_rng(1234)
+
+    def assertPyramidEqual(
+        self, pyramid: MinMaxPyramid, samples: np.ndarray, offset: int = 0
+    ):
+        self.assertEqual(pyramid.size, samples.shape[0])
+        for level in range(1, pyramid.levels + 1):
+            mins, maxs = reference_level(samples, level, offset)
+            np.testing.assert_array_equal(pyramid.mins(level), mins)
+            np.testing.assert_array_equal(pyramid.maxs(level), maxs)
+
+    def test_levels(self):
+        for size, levels in ((0, 0), (1, 0), (8, 0), (9, 1), (64, 1), (65, 2)):
+            pyramid = MinMaxPyramid(np.zeros(size))
+            self.assertEqual(pyramid.levels, levels, size)
+
+    def test_full_build(self):
+        samples = self.rng.standard_normal(5000)
+        self.assertPyramidEqual(MinMaxPyramid(samples), samples)
+
+    def test_incremental_matches_full_rebuild(self):
+        samples = self.rng.standard_normal(20000).astype(np.float32)
+        samples[self.rng.integers(0, samples.shape[0], 50)] = np.nan
+        samples[self.rng.integers(0, samples.shape[0], 50)] = np.inf
+
+        size = 3
+        pyramid = MinMaxPyramid(samples[:size])
+        # Chunks smaller and bigger than the blocks, ending inside and on the
+        # edge of the blocks
+        for chunk in (1, 5, 8, 60, 64, 100, 511, 512, 4093, 14000, 643):
+            size += chunk
+            self.assertTrue(pyramid.extend(samples[:size]))
+            full = MinMaxPyramid(samples[:size])
+            self.assertEqual(pyramid.levels, full.levels)
+            for level in range(1, full.levels + 1):
+                np.testing.assert_array_equal(pyramid.mins(level), full.mins(level))
+                np.testing.assert_array_equal(pyramid.maxs(level), full.maxs(level))
+            self.assertPyramidEqual(pyramid, samples[:size])
+        self.assertEqual(size, samples.shape[0])
+
+    def test_extend_without_new_samples(self):
+        samples = self.rng.standard_normal(100)
+        pyramid = MinMaxPyramid(samples)
+        self.assertTrue(pyramid.extend(samples))
+        self.assertPyramidEqual(pyramid, samples)
+
+    def test_eviction(self):
+        samples = self.rng.standard_normal(100000)
+        samples[self.rng.integers(0, samples.shape[0], 100)] = np.nan
+        capacity = 6000
+        pyramid = MinMaxPyramid(samples[:capacity])
+        start, end = 0, capacity
+        for appended in (1, 7, 8, 100, 513, 4096, 5999, 6000, 7000, 64, 3):
+            previous_end = end
+            end += appended
+            evicted = max(0, end - capacity - start)
+            start += evicted
+            self.assertTrue(pyramid.extend(samples[start:end], evicted))
+            self.assertPyramidEqual(pyramid, samples[start:end], start)
+            self.assertEqual(
+                pyramid.bounds(),
+                (np.nanmin(samples[start:end]), np.nanmax(samples[start:end])),
+            )
+        self.assertGreater(previous_end, capacity)
+
+    def test_eviction_is_incremental(self):
+        samples = self.rng.standard_normal(200000).astype(np.float32)
+        capacity = 48000
+        pyramid = MinMaxPyramid(samples[:capacity])
+        reduced = []
+        source = MinMaxPyramid._MinMaxPyramid__finite
+
+        def finite(values):
+            reduced.append(values.shape[0])
+            return source(values)
+
+        start, end = 0, capacity
+        with mock.patch.object(
+            MinMaxPyramid, "_MinMaxPyramid__finite", staticmethod(finite)
+        ):
+            for _ in range(50):
+                reduced.clear()
+                end += 1024
+                start += 1024
+                self.assertTrue(pyramid.extend(samples[start:end], 1024))
+                # Only the new samples and the first block are reduced again,
+                # never the whole capture
+                self.assertLessEqual(sum(reduced), 1024 + 2 * FACTOR)
+        self.assertPyramidEqual(pyramid, samples[start:end], start)
+
+    def test_evict_everything(self):
+        samples = self.rng.standard_normal(1000)
+        pyramid = MinMaxPyramid(samples[:100])
+        self.assertTrue(pyramid.extend(samples[500:700], 500))
+        self.assertPyramidEqual(pyramid, samples[500:700], 500)
+        self.assertTrue(pyramid.extend(samples[999:], 199))
+        self.assertEqual(pyramid.levels, 0)
+        self.assertEqual(pyramid.bounds(), (samples[999], samples[999]))
+
+    def test_new_type(self):
+        pyramid = MinMaxPyramid(np.zeros(100))
+        self.assertFalse(pyramid.extend(np.zeros(100, dtype=np.float32)))
+
+    def test_non_finite_blocks(self):
+        samples = np.arange(32, dtype=np.float64)
+        samples[8:16] = np.nan
+        samples[16:24] = np.inf
+        samples[25] = -np.inf
+        pyramid = MinMaxPyramid(samples)
+        np.testing.assert_array_equal(pyramid.mins(1), [0, np.nan, np.nan, 24])
+        np.testing.assert_array_equal(pyramid.maxs(1), [7, np.nan, np.nan, 31])
+        self.assertEqual(pyramid.bounds(), (0.0, 31.0))
+
+    def test_bounds(self):
+        self.assertTrue(np.all(np.isnan(MinMaxPyramid(np.empty(0)).bounds())))
+        self.assertTrue(np.all(np.isnan(MinMaxPyramid(np.full(100, np.nan)).bounds())))
+        self.assertEqual(MinMaxPyramid(np.array([2.0, -1.0, 3.0])).bounds(), (-1, 3))
+        samples = self.rng.standard_normal(1000)
+        self.assertEqual(
+            MinMaxPyramid(samples).bounds(), (samples.min(), samples.max())
+        )
+
+    def test_blocks(self):
+        samples = self.rng.standard_normal(1000)
+        pyramid = MinMaxPyramid(samples)
+
+        block, first, lows, highs = pyramid.blocks(10, 20, 100)
+        self.assertEqual((block, first), (1, 10))
+        np.testing.assert_array_equal(lows, samples[10:20])
+        np.testing.assert_array_equal(highs, samples[10:20])
+
+        # The coarsest level needed to stay under max_blocks
+        block, first, lows, highs = pyramid.blocks(100, 900, 20)
+        self.assertEqual((block, first), (64, 64))
+        np.testing.assert_array_equal(lows, reference_level(samples, 2)[0][1:15])
+        np.testing.assert_array_equal(highs, reference_level(samples, 2)[1][1:15])
+
+    def test_envelope(self):
+        samples = self.rng.standard_normal(1000).astype(np.float32)
+        pyramid = MinMaxPyramid(samples)
+
+        x, y = pyramid.envelope(-5, 50, 100)
+        np.testing.assert_array_equal(x, np.arange(50))
+        np.testing.assert_array_equal(y, samples[:50])
+
+        x, y = pyramid.envelope(0, 2000, 200)
+        self.assertEqual(y.dtype, np.float32)
+        mins, maxs = reference_level(samples, 1)
+        np.testing.assert_array_equal(x[0::2], (np.arange(mins.shape[0]) + 0.5) * 8)
+        np.testing.assert_array_equal(y[0::2], mins)
+        np.testing.assert_array_equal(y[1::2], maxs)
+
+        self.assertEqual(pyramid.envelope(500, 500, 100)[0].size, 0)
+
+    def test_envelope_after_eviction(self):
+        samples = self.rng.standard_normal(3000)
+        pyramid = MinMaxPyramid(samples[:1000])
+        pyramid.extend(samples[1007:3000], 1007)
+
+        block, first, lows, highs = pyramid.blocks(0, 1993, 300)
+        self.assertEqual((block, first), (8, -7))
+        # Only the last sample of the first block was kept
+        self.assertEqual((lows[0], highs[0]), (samples[1007], samples[1007]))
+        x, y = pyramid.envelope(0, 1993, 300)
+        mins, maxs = reference_level(samples[1007:], 1, 1007)
+        np.testing.assert_array_equal(y[0::2], mins)
+        np.testing.assert_array_equal(y[1::2], maxs)
+        # Blocks are aligned on the whole capture, the first one isn't drawn
+        # before the data
+        self.assertEqual(x[0], 0.0)
+        np.testing.assert_array_equal(x[2::2], np.arange(1, mins.shape[0]) * 8 - 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
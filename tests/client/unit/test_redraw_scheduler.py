@@ -0,0 +1,89 @@
+import time
+import unittest
+from typing import FrozenSet, List
+
+from PySide6.QtCore import QCoreApplication, QObject
+import shiboken6
+
+from dave.client.redraw_scheduler import RedrawScheduler
+from dave.common.singleton import SingletonMeta
+
+
+class Target(QObject):
+    def __init__(self) -> None:
+        super().__init__()
+        self.redraws: List[FrozenSet[str]] = []
+
+    def redraw(self, reasons: FrozenSet[str]):
+        self.redraws.append(reasons)
+
+
+class TestRedrawScheduler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        SingletonMeta._instances.pop(RedrawScheduler, None)
+
+    def tearDown(self) -> None:
+        SingletonMeta._instances.pop(RedrawScheduler, None)
+
+    def process_frames(self, duration: float = 0.1):
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.001)
+
+    def test_deferred(self):
+        target = Target()
+        RedrawScheduler().request(target, "data")
+        # Never redrawn synchronously
+        self.assertEqual(target.redraws, [])
+        self.process_frames()
+        self.assertEqual(target.redraws, [frozenset({"data"})])
+
+    def test_coalesced(self):
+        first, second = Target(), Target()
+        scheduler = RedrawScheduler()
+        scheduler.request(first, "data")
+        scheduler.request(first, "setting:colormap")
+        scheduler.request(second, "view")
+        scheduler.request(first, "data")
+        self.process_frames()
+        self.assertEqual(first.redraws, [frozenset({"data", "setting:colormap"})])
+        self.assertEqual(second.redraws, [frozenset({"view"})])
+
+    def test_requests_after_a_frame(self):
+        target = Target()
+        scheduler = RedrawScheduler()
+        scheduler.request(target, "data")
+        self.process_frames()
+        scheduler.request(target, "view")
+        self.process_frames()
+        self.assertEqual(target.redraws, [frozenset({"data"}), frozenset({"view"})])
+
+    def test_frame_rate(self):
+        target = Target()
+        scheduler = RedrawScheduler()
+        redraw_times = []
+        target.redraw = lambda _: redraw_times.append(time.monotonic())
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            scheduler.request(target, "data")
+            self.app.processEvents()
+        self.process_frames(0.05)
+        # At most one redraw per frame, with some slack for the timer precision
+        intervals = [b - a for a, b in zip(redraw_times, redraw_times[1:])]
+        self.assertGreater(len(redraw_times), 1)
+        self.assertGreaterEqual(min(intervals), 0.8 * RedrawScheduler.FRAME_MS / 1000)
+
+    def test_deleted_target(self):
+        deleted, kept = Target(), Target()
+        scheduler = RedrawScheduler()
+        scheduler.request(deleted, "data")
+        scheduler.request(kept, "data")
+        shiboken6.delete(deleted)
+        self.process_frames()
+        self.assertEqual(kept.redraws, [frozenset({"data"})])
+
+
+if __name__ == "__main__":
+    unittest.main()
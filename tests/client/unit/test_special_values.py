@@ -0,0 +1,116 @@
+import unittest
+
+import numpy as np
+
+from dave.client.container.concat_buffer import ConcatBuffer
+from dave.client.container.special_values import SpecialValueCounts, find_runs
+
+
+def reference_counts(data: np.ndarray):
+    rows = data.reshape(-1, data.shape[-1])
+    bad_columns = np.flatnonzero(np.any(~np.isfinite(rows), axis=0))
+    span = None
+    if bad_columns.size > 0:
+        span = (int(bad_columns[0]), int(bad_columns[-1]))
+    return (
+        np.count_nonzero(np.isnan(rows), axis=1),
+        np.count_nonzero(np.isinf(rows), axis=1),
+        span,
+    )
+
+
+class TestFindRuns(unittest.TestCase):
+    def test_runs(self):
+        for mask, starts, stops in (
+            ([], [], []),
+            ([False, False], [], []),
+            ([True], [0], [1]),
+            ([True, True, False, True], [0, 3], [2, 4]),
+            ([False, True, True, True, False], [1], [4]),
+        ):
+            runs = find_runs(np.array(mask, dtype=bool))
+            np.testing.assert_array_equal(runs[0], starts)
+            np.testing.assert_array_equal(runs[1], stops)
+
+
+class TestSpecialValueCounts(unittest.TestCase):
+    def assertCountsEqual(self, counts: SpecialValueCounts, data: np.ndarray):
+        nan, inf, span = reference_counts(data)
+        np.testing.assert_array_equal(counts.nan_per_row, nan)
+        np.testing.assert_array_equal(counts.inf_per_row, inf)
+        self.assertEqual(counts.nan, int(np.sum(nan)))
+        self.assertEqual(counts.inf, int(np.sum(inf)))
+        self.assertEqual(counts.span(), span)
+
+    def test_reset(self):
+        data = np.zeros((2, 10))
+        counts = SpecialValueCounts()
+        counts.reset(data)
+        self.assertCountsEqual(counts, data)
+        self.assertIsNone(counts.span())
+
+        data[0, 3] = np.nan
+        data[1, 7] = -np.inf
+        data[1, 8] = np.nan
+        counts.reset(data)
+        self.assertEqual((counts.nan, counts.inf), (2, 1))
+        self.assertEqual(counts.span(), (3, 8))
+        self.assertCountsEqual(counts, data)
+
+    def test_incremental_matches_full_count(self):
+        rng = np.random.default_rng(3)
+        buffer = ConcatBuffer()
+        counts = SpecialValueCounts()
+        buffer.append(np.zeros((2, 0)))
+        counts.reset(buffer.data)
+        for i in range(200):
+            chunk = rng.standard_normal((2, int(rng.integers(1, 50))))
+            if i % 3 == 0:
+                chunk[rng.integers(0, 2), rng.integers(0, chunk.shape[1])] = np.nan
+            if i % 7 == 0:
+                chunk[..., -1] = np.inf
+            # Evicts whole and partial chunks
+            evicted = buffer.append(chunk, capacity=120)
+            counts.append(buffer.data, chunk.shape[-1], evicted)
+            self.assertCountsEqual(counts, buffer.data)
+
+    def test_evicted_special_values(self):
+        buffer = ConcatBuffer()
+        counts = SpecialValueCounts()
+        chunk = np.array([[np.nan, 1.0, np.inf, 2.0]])
+        buffer.append(chunk)
+        counts.reset(buffer.data)
+        self.assertEqual(counts.span(), (0, 2))
+
+        # Drops the NaN of a chunk partially evicted
+        evicted = buffer.append(np.array([[3.0]]), capacity=4)
+        counts.append(buffer.data, 1, evicted)
+        self.assertEqual((counts.nan, counts.inf), (0, 1))
+        self.assertEqual(counts.span(), (1, 1))
+
+        evicted = buffer.append(np.array([[4.0, 5.0]]), capacity=4)
+        counts.append(buffer.data, 2, evicted)
+        self.assertEqual((counts.nan, counts.inf), (0, 0))
+        self.assertIsNone(counts.span())
+
+    def test_more_appended_than_kept(self):
+        buffer = ConcatBuffer()
+        counts = SpecialValueCounts()
+        buffer.append(np.array([np.nan, 1.0]))
+        counts.reset(buffer.data)
+        chunk = np.array([np.inf, 2.0, np.nan, 3.0, 4.0])
+        evicted = buffer.append(chunk, capacity=3)
+        counts.append(buffer.data, chunk.shape[-1], evicted)
+        self.assertCountsEqual(counts, buffer.data)
+
+    def test_new_rows(self):
+        counts = SpecialValueCounts()
+        counts.reset(np.full((2, 3), np.nan))
+        # Other row count, counted again from scratch
+        data = np.array([[np.inf], [1.0], [np.nan]])
+        counts.append(data, 1, 0)
+        self.assertCountsEqual(counts, data)
+
+
+if __name__ == "__main__":
+    unittest.main()
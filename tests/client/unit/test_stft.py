@@ -0,0 +1,193 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+
+from dave.client.container.stft import (
+    PsdChannel,
+    StftChannel,
+    StftParameters,
+    get_window,
+)
+
+SAMPLERATE = 1000
+
+
+def reference_db(samples: np.ndarray, parameters: StftParameters) -> np.ndarray:
+    _, _, Sxx = signal.spectrogram(
+        samples,
+        fs=parameters.samplerate,
+        window=get_window(parameters.window, parameters.nfft),
+        nperseg=parameters.nfft,
+        noverlap=parameters.noverlap,
+    )
+    return 10.0 * np.log10(np.maximum(Sxx * parameters.correction, 1e-12))
+
+
+class TestStftChannel(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(42)
+        t = np.arange(8000) / SAMPLERATE
+        self.samples = np.sin(2 * np.pi * 50 * t) + 0.1 * rng.standard_normal(8000)
+
+    def assertSpectrogramClose(self, actual: np.ndarray, expected: np.ndarray):
+        self.assertEqual(actual.shape, expected.shape)
+        np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-6)
+
+    def test_matches_scipy(self):
+        for nfft, noverlap, window in (
+            (256, 128, "hann"),
+            (255, 0, "hamming"),
+            (128, 127, "blackman"),
+            (64, 16, "boxcar"),
+        ):
+            parameters = StftParameters(nfft, noverlap, window, SAMPLERATE)
+            spectrogram = StftChannel(self.samples).compute(parameters)
+            self.assertEqual(spectrogram.first_frame, 0)
+            self.assertSpectrogramClose(
+                spectrogram.power_db, reference_db(self.samples, parameters)
+            )
+            expected_levels = reference_db(self.samples, parameters)
+            self.assertAlmostEqual(spectrogram.levels[0], expected_levels.min(), 5)
+            self.assertAlmostEqual(spectrogram.levels[1], expected_levels.max(), 5)
+
+    def test_single_precision(self):
+        samples = self.samples.astype(np.float32)
+        parameters = StftParameters(256, 192, "hann", SAMPLERATE)
+        spectrogram = StftChannel(samples).compute(parameters)
+        self.assertEqual(spectrogram.power_db.dtype, np.float32)
+        np.testing.assert_allclose(
+            spectrogram.power_db, reference_db(samples, parameters), atol=1e-2
+        )
+
+    def test_correction(self):
+        parameters = StftParameters(256, 128, "hann", SAMPLERATE, correction=2.0)
+        spectrogram = StftChannel(self.samples).compute(parameters)
+        self.assertSpectrogramClose(
+            spectrogram.power_db, reference_db(self.samples, parameters)
+        )
+
+    def test_short_channel(self):
+        # Like scipy, a single frame of the whole channel
+        samples = self.samples[:100]
+        spectrogram = StftChannel(samples).compute(
+            StftParameters(256, 128, "hann", SAMPLERATE)
+        )
+        self.assertEqual(spectrogram.parameters.nfft, 100)
+        self.assertSpectrogramClose(
+            spectrogram.power_db,
+            reference_db(samples, StftParameters(100, 99, "hann", SAMPLERATE)),
+        )
+
+    def test_incremental(self):
+        parameters = StftParameters(256, 64, "hann", SAMPLERATE)
+        channel = StftChannel(self.samples[:300])
+        generation = channel.compute(parameters).generation
+        for size in (300, 301, 700, 1000, 4321, 8000):
+            self.assertTrue(channel.extend(self.samples[:size]))
+            spectrogram = channel.compute(parameters)
+            # Frames already computed are kept
+            self.assertEqual(spectrogram.generation, generation)
+            self.assertSpectrogramClose(
+                spectrogram.power_db, reference_db(self.samples[:size], parameters)
+            )
+
+    def test_eviction(self):
+        parameters = StftParameters(256, 128, "hann", SAMPLERATE)
+        step = parameters.step
+        full = reference_db(self.samples, parameters)
+        channel = StftChannel(self.samples[:2000])
+        channel.compute(parameters)
+        start, end = 0, 2000
+        for evicted, appended in ((100, 500), (128, 0), (1000, 1000), (3000, 3000)):
+            start += evicted
+            end += appended
+            self.assertTrue(channel.extend(self.samples[start:end], evicted))
+            spectrogram = channel.compute(parameters)
+            # Frames starting before the first kept sample are dropped
+            first_frame = -(-start // step)
+            self.assertEqual(spectrogram.first_frame, first_frame)
+            self.assertEqual(spectrogram.offset, start)
+            last_frame = (end - parameters.nfft) // step + 1
+            self.assertSpectrogramClose(
+                spectrogram.power_db, full[:, first_frame:last_frame]
+            )
+            self.assertEqual(
+                spectrogram.frame_time(first_frame),
+                (first_frame * step - start) / SAMPLERATE,
+            )
+
+    def test_new_parameters(self):
+        channel = StftChannel(self.samples)
+        first = channel.compute(StftParameters(256, 128, "hann", SAMPLERATE))
+        parameters = StftParameters(512, 256, "hann", SAMPLERATE)
+        second = channel.compute(parameters)
+        self.assertNotEqual(first.generation, second.generation)
+        self.assertSpectrogramClose(
+            second.power_db, reference_db(self.samples, parameters)
+        )
+
+    def test_empty(self):
+        spectrogram = StftChannel(np.empty(0)).compute(
+            StftParameters(256, 128, "hann", SAMPLERATE)
+        )
+        self.assertEqual(spectrogram.power_db.shape, (129, 0))
+        self.assertTrue(np.all(np.isnan(spectrogram.levels)))
+
+
+class TestPsdChannel(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(7)
+        self.samples = rng.standard_normal(10000)
+
+    def test_matches_scipy(self):
+        for parameters in (
+            StftParameters(256, 128, "hann", SAMPLERATE),
+            StftParameters(1000, 0, "blackman", 48000, correction=1.5),
+        ):
+            f, psd = PsdChannel(self.samples).compute(parameters)
+            expected_f, Pxx = signal.welch(
+                self.samples,
+                fs=parameters.samplerate,
+                window=parameters.window,
+                nperseg=parameters.nfft,
+                noverlap=parameters.noverlap,
+            )
+            np.testing.assert_allclose(f, expected_f)
+            np.testing.assert_allclose(
+                psd, 10 * np.log10(Pxx * parameters.correction + 1e-12), rtol=1e-9
+            )
+
+    def test_cached_per_parameters(self):
+        channel = PsdChannel(self.samples)
+        parameters = StftParameters(256, 128, "hann", SAMPLERATE)
+        first = channel.compute(parameters)
+        self.assertIs(
+            channel.compute(StftParameters(256, 128, "hann", SAMPLERATE)), first
+        )
+        other = channel.compute(StftParameters(512, 128, "hann", SAMPLERATE))
+        self.assertIsNot(other, first)
+        self.assertEqual(other[0].shape, (257,))
+
+    def test_not_extended(self):
+        # New samples rebuild the channel
+        self.assertFalse(PsdChannel(self.samples).extend(self.samples, 0))
+
+    def test_finite(self):
+        self.assertTrue(PsdChannel(self.samples).finite)
+        samples = self.samples.copy()
+        samples[3] = np.inf
+        self.assertFalse(PsdChannel(samples).finite)
+
+
+class TestGetWindow(unittest.TestCase):
+    def test_shared_read_only(self):
+        window = get_window("hann", 128)
+        self.assertIs(get_window("hann", 128), window)
+        self.assertFalse(window.flags.writeable)
+        np.testing.assert_array_equal(window, signal.get_window("hann", 128))
+        self.assertEqual(get_window("hann", 128, np.float32).dtype, np.float32)
+
+
+if __name__ == "__main__":
+    unittest.main()
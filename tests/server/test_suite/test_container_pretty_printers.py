@@ -15,7 +15,7 @@ class TestContainerPrettyPrinters(TestCaseBase.TYPE):
         with self.failFastSubTestAtLocation():
             self.assertPrettyPrinterEqual(
                 "container",
-                "2 channels 11 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 11 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(11)]"'), ("dSparkline[1]", '"[0(11)]"')],
             )
 
@@ -24,7 +24,7 @@ class TestContainerPrettyPrinters(TestCaseBase.TYPE):
         with self.failFastSubTestAtLocation():
             self.assertPrettyPrinterEqual(
                 "container",
-                "2 channels 11 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 11 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 6.3246E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[‾⎺⎻—x⎼⎽_]"'), ("dSparkline[1]", '"[_⎽⎼—x⎻⎺‾]"')],
             )
 
@@ -33,7 +33,7 @@ class TestContainerPrettyPrinters(TestCaseBase.TYPE):
         with self.failFastSubTestAtLocation():
             self.assertPrettyPrinterEqual(
                 "container",
-                "2 channels 11 samples, min -INF, max INF",
+                "2 channels 11 samples, min -INF, max INF, peak 1.5000E+00, rms 7.2620E-01, dc -7.8427E-09, 1 NaN, 2 Inf",
                 [("dSparkline[0]", '"[IE⎻—N—⎼EI]"'), ("dSparkline[1]", '"[_⎽⎼—x⎻⎺‾]"')],
             )
 
@@ -49,7 +49,7 @@ class TestContainerPrettyPrinters(TestCaseBase.TYPE):
         with self.failFastSubTestAtLocation():
             self.assertPrettyPrinterEqual(
                 "container",
-                "2 channels 11 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 11 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(11)]"'), ("dSparkline[1]", '"[0(11)]"')],
             )
 
@@ -58,7 +58,7 @@ class TestContainerPrettyPrinters(TestCaseBase.TYPE):
         with self.failFastSubTestAtLocation():
             self.assertPrettyPrinterEqual(
                 "container",
-                "2 channels 11 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 11 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 6.3246E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[‾⎺⎻—x⎼⎽_]"'), ("dSparkline[1]", '"[_⎽⎼—x⎻⎺‾]"')],
             )
 
@@ -67,6 +67,30 @@ class TestContainerPrettyPrinters(TestCaseBase.TYPE):
         with self.failFastSubTestAtLocation():
             self.assertPrettyPrinterEqual(
                 "container",
-                "2 channels 11 samples, min -INF, max INF",
+                "2 channels 11 samples, min -INF, max INF, peak 1.5000E+00, rms 7.2620E-01, dc -7.8427E-09, 1 NaN, 2 Inf",
                 [("dSparkline[0]", '"[IE⎻—N—⎼EI]"'), ("dSparkline[1]", '"[_⎽⎼—x⎻⎺‾]"')],
             )
+
+    @patch_client_popen
+    def test_pretty_container_local_types(self, _):
+        # Set the breakpoints
+        self.debugger().set_breakpoints_at_tags("localTypesFloat", [0])
+        self.debugger().set_breakpoints_at_tags("localTypesDouble", [0])
+
+        ################## localTypesFloat::0 - std::array<float, 3> ##################
+        self.debugger().run()
+        with self.failFastSubTestAtLocation():
+            self.assertPrettyPrinterEqual(
+                "samples",
+                "1 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 8.1650E-01, dc 0.0000E+00",
+                [("dSparkline[0]", '"[‾x0]"')],
+            )
+
+        ########### localTypesDouble::0 - same name, std::array<double, 5> ############
+        self.debugger().continue_()
+        with self.failFastSubTestAtLocation():
+            self.assertPrettyPrinterEqual(
+                "samples",
+                "1 channels 5 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 6.3246E-01, dc 0.0000E+00",
+                [("dSparkline[0]", '"[‾x0(3)]"')],
+            )
@@ -44,7 +44,7 @@ class TestCppHart(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0, 0.0, 0.0, 0.0), raw_buffer_f)
             self.assertPrettyPrinterEqual(
                 "buffer_f",
-                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[0(3)]"')],
             )
 
@@ -59,7 +59,7 @@ class TestCppHart(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0, 0.0, 0.0, 0.0), raw_buffer_d)
             self.assertPrettyPrinterEqual(
                 "buffer_d",
-                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[0(3)]"')],
             )
 
@@ -77,7 +77,7 @@ class TestCppHart(TestCaseBase.TYPE):
             )
             self.assertPrettyPrinterEqual(
                 "buffer_f",
-                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 5.7735E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[‾x0]"')],
             )
 
@@ -89,6 +89,6 @@ class TestCppHart(TestCaseBase.TYPE):
             )
             self.assertPrettyPrinterEqual(
                 "buffer_d",
-                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 5.7735E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[‾x0]"')],
             )
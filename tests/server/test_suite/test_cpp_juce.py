@@ -47,7 +47,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0), raw_buffer_f)
             self.assertPrettyPrinterEqual(
                 "buffer_f",
-                "1 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "1 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"')],
             )
 
@@ -62,7 +62,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0), raw_buffer_f_p)
             self.assertPrettyPrinterEqual(
                 "buffer_f_p",
-                "1 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "1 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"')],
             )
 
@@ -77,7 +77,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0), raw_buffer_d)
             self.assertPrettyPrinterEqual(
                 "buffer_d",
-                "1 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "1 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"')],
             )
 
@@ -92,7 +92,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0), raw_buffer_d_p)
             self.assertPrettyPrinterEqual(
                 "buffer_d_p",
-                "1 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "1 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"')],
             )
 
@@ -108,7 +108,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((1.0, -1.0, 0.0), raw_buffer_f, received[0])
             self.assertPrettyPrinterEqual(
                 "buffer_f",
-                "1 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "1 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 8.1650E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[‾x0]"')],
             )
 
@@ -118,7 +118,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((1.0, -1.0, 0.0), raw_buffer_f_p, received[1])
             self.assertPrettyPrinterEqual(
                 "buffer_f_p",
-                "1 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "1 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 8.1650E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[‾x0]"')],
             )
 
@@ -128,7 +128,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((1.0, -1.0, 0.0), raw_buffer_d, received[2])
             self.assertPrettyPrinterEqual(
                 "buffer_d",
-                "1 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "1 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 8.1650E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[‾x0]"')],
             )
 
@@ -138,7 +138,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((1.0, -1.0, 0.0), raw_buffer_d_p, received[3])
             self.assertPrettyPrinterEqual(
                 "buffer_d_p",
-                "1 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "1 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 8.1650E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[‾x0]"')],
             )
 
@@ -169,7 +169,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0, 0.0, 0.0, 0.0), raw_buffer_f)
             self.assertPrettyPrinterEqual(
                 "buffer_f",
-                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[0(3)]"')],
             )
 
@@ -184,7 +184,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0, 0.0, 0.0, 0.0), raw_buffer_f_p)
             self.assertPrettyPrinterEqual(
                 "buffer_f_p",
-                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[0(3)]"')],
             )
 
@@ -199,7 +199,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0, 0.0, 0.0, 0.0), raw_buffer_d)
             self.assertPrettyPrinterEqual(
                 "buffer_d",
-                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[0(3)]"')],
             )
 
@@ -214,7 +214,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0, 0.0, 0.0, 0.0), raw_buffer_d_p)
             self.assertPrettyPrinterEqual(
                 "buffer_d_p",
-                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[0(3)]"')],
             )
 
@@ -232,7 +232,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             )
             self.assertPrettyPrinterEqual(
                 "buffer_f",
-                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 5.7735E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[‾x0]"')],
             )
 
@@ -244,7 +244,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             )
             self.assertPrettyPrinterEqual(
                 "buffer_f_p",
-                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 5.7735E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[‾x0]"')],
             )
 
@@ -256,7 +256,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             )
             self.assertPrettyPrinterEqual(
                 "buffer_d",
-                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 5.7735E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[‾x0]"')],
             )
 
@@ -268,7 +268,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             )
             self.assertPrettyPrinterEqual(
                 "buffer_d_p",
-                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 5.7735E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[‾x0]"')],
             )
 
@@ -297,7 +297,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0, 0.0, 0.0, 0.0), raw_block_f)
             self.assertPrettyPrinterEqual(
                 "block_f",
-                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[0(3)]"')],
             )
 
@@ -312,7 +312,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             self.assertContainerContent((0.0, 0.0, 0.0, 0.0, 0.0, 0.0), raw_block_d)
             self.assertPrettyPrinterEqual(
                 "block_d",
-                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00",
+                "2 channels 3 samples, min 0.0000E+00, max 0.0000E+00, peak 0.0000E+00, rms 0.0000E+00, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[0(3)]"')],
             )
 
@@ -330,7 +330,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             )
             self.assertPrettyPrinterEqual(
                 "block_f",
-                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 5.7735E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[‾x0]"')],
             )
 
@@ -342,7 +342,7 @@ class TestCppJuce(TestCaseBase.TYPE):
             )
             self.assertPrettyPrinterEqual(
                 "block_d",
-                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00",
+                "2 channels 3 samples, min -1.0000E+00, max 1.0000E+00, peak 1.0000E+00, rms 5.7735E-01, dc 0.0000E+00",
                 [("dSparkline[0]", '"[0(3)]"'), ("dSparkline[1]", '"[‾x0]"')],
             )
 
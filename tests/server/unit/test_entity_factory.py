@@ -0,0 +1,223 @@
+import re
+import unittest
+from typing import Callable, Union
+from unittest import mock
+
+from dave.common.singleton import SingletonMeta
+from dave.server import entity_factory
+from dave.server.entity import Entity, EntityBuildError
+from dave.server.entity_factory import EntityFactory
+from dave.server.language_type import LanguageType
+
+
+def make_entity(
+    name: str, matcher: Union[str, Callable[[str], bool]], nested: bool = False
+) -> type[Entity]:
+    """
+    Creates an entity class matching typenames with the given regex or callable
+    """
+
+    class FakeEntity(Entity):
+        def __init__(self, dbg_value, varname: str, dims=[]) -> None:
+            self.dbg_value = dbg_value
+
+        @classmethod
+        def typename_matcher(cls):
+            return re.compile(matcher) if isinstance(matcher, str) else matcher
+
+        @staticmethod
+        def is_nested() -> bool:
+            return nested
+
+        @staticmethod
+        def formatter_compatible() -> bool:
+            return False
+
+        @staticmethod
+        def supports_concat() -> bool:
+            return False
+
+        def as_raw(self):
+            pass
+
+        def as_empty_raw(self):
+            pass
+
+    FakeEntity.__name__ = FakeEntity.__qualname__ = name
+    return FakeEntity
+
+
+class FakeValue:
+    def __init__(self, language: LanguageType = LanguageType.CPP) -> None:
+        self.__language = language
+
+    def language(self) -> LanguageType:
+        return self.__language
+
+
+class FactoryTestCase(unittest.TestCase):
+    """
+    Each test runs on its own factory, the global one is restored afterwards
+    """
+
+    def setUp(self) -> None:
+        self.__global_factory = SingletonMeta._instances.pop(EntityFactory, None)
+
+    def tearDown(self) -> None:
+        SingletonMeta._instances.pop(EntityFactory, None)
+        if self.__global_factory is not None:
+            SingletonMeta._instances[EntityFactory] = self.__global_factory
+
+
+class TestLazyModules(FactoryTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.imported = []
+        self.modules = {
+            "fake.core": lambda: EntityFactory().register(
+                make_entity("CoreVector", r"^core::vector<float>$"), LanguageType.CPP
+            ),
+            "fake.lib": lambda: EntityFactory().register(
+                make_entity("LibBuffer", r"^lib::Buffer<float>$"), LanguageType.CPP
+            ),
+            "fake.rust": lambda: EntityFactory().register(
+                make_entity("RustVec", r"^Vec<f32>$"), LanguageType.RUST
+            ),
+        }
+        patcher = mock.patch.object(
+            entity_factory.importlib, "import_module", self.__import_module
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        EntityFactory().register_module("fake.core", LanguageType.C)
+        EntityFactory().register_module("fake.lib", LanguageType.CPP, ("lib::",))
+        EntityFactory().register_module("fake.rust", LanguageType.RUST)
+
+    def __import_module(self, name: str):
+        self.imported.append(name)
+        self.modules[name]()
+
+    def test_not_imported_on_registration(self):
+        self.assertEqual(self.imported, [])
+
+    def test_language_modules(self):
+        entity = EntityFactory().build(FakeValue(), "core::vector<float>", "v")
+        self.assertEqual(type(entity).__name__, "CoreVector")
+        # Only the modules of the value's language without hints
+        self.assertEqual(self.imported, ["fake.core"])
+
+        EntityFactory().build(FakeValue(), "core::vector<float>", "v")
+        self.assertEqual(self.imported, ["fake.core"])
+
+    def test_hinted_modules(self):
+        cls = EntityFactory().check_valid(LanguageType.CPP, "lib::Buffer<float>")
+        self.assertEqual(cls.__name__, "LibBuffer")
+        self.assertEqual(self.imported, ["fake.core", "fake.lib"])
+
+    def test_hinted_modules_not_imported(self):
+        self.assertIsNone(EntityFactory().check_valid(LanguageType.CPP, "int"))
+        self.assertNotIn("fake.lib", self.imported)
+
+    def test_check_valid_simple(self):
+        # Without language, only the hinted modules are imported
+        self.assertIsNone(EntityFactory().check_valid_simple("core::vector<float>"))
+        self.assertEqual(self.imported, [])
+        self.assertIsNotNone(EntityFactory().check_valid_simple("lib::Buffer<float>"))
+        self.assertEqual(self.imported, ["fake.lib"])
+
+    def test_get_entities_cls_set(self):
+        names = {cls.__name__ for cls in EntityFactory().get_entities_cls_set()}
+        self.assertEqual(names, {"CoreVector", "LibBuffer", "RustVec"})
+        self.assertCountEqual(self.imported, ["fake.core", "fake.lib", "fake.rust"])
+
+
+class CountingMatcher:
+    def __init__(self, typename: str) -> None:
+        self.typename = typename
+        self.calls = 0
+
+    def __call__(self, typename: str) -> bool:
+        self.calls += 1
+        return typename == self.typename
+
+
+class TestDispatch(FactoryTestCase):
+    def test_registration_order(self):
+        first = make_entity("First", r"^Buffer<.*>$")
+        second = make_entity("Second", r"^Buffer<float>$")
+        EntityFactory().register(first, LanguageType.CPP)
+        EntityFactory().register(second, LanguageType.CPP)
+        self.assertIs(
+            EntityFactory().check_valid(LanguageType.CPP, "Buffer<float>"), first
+        )
+
+    def test_regex_and_callable(self):
+        by_regex = make_entity("ByRegex", r"^Buffer<float>$")
+        by_callable = make_entity("ByCallable", CountingMatcher("Special"))
+        EntityFactory().register(by_regex, LanguageType.CPP)
+        EntityFactory().register(by_callable, LanguageType.CPP)
+        factory = EntityFactory()
+        self.assertIs(factory.check_valid(LanguageType.CPP, "Buffer<float>"), by_regex)
+        self.assertIs(factory.check_valid(LanguageType.CPP, "Special"), by_callable)
+        self.assertIsNone(factory.check_valid(LanguageType.CPP, "Buffer<int>"))
+
+    def test_match_caches(self):
+        matcher = CountingMatcher("Special")
+        EntityFactory().register(make_entity("Special", matcher), LanguageType.CPP)
+        factory = EntityFactory()
+
+        for _ in range(3):
+            self.assertIsNone(factory.check_valid(LanguageType.CPP, "int"))
+            self.assertIsNotNone(factory.check_valid(LanguageType.CPP, "Special"))
+        # Once per typename, later lookups hit the match caches
+        self.assertEqual(matcher.calls, 2)
+
+    def test_languages(self):
+        cpp = make_entity("Cpp", r"^Buffer<float>$")
+        rust = make_entity("Rust", r"^Buffer<float>$")
+        EntityFactory().register(cpp, LanguageType.C)
+        EntityFactory().register(rust, LanguageType.RUST)
+        factory = EntityFactory()
+        self.assertIs(factory.check_valid(LanguageType.C, "Buffer<float>"), cpp)
+        self.assertIs(factory.check_valid(LanguageType.CPP, "Buffer<float>"), cpp)
+        self.assertIs(factory.check_valid(LanguageType.RUST, "Buffer<float>"), rust)
+        # Across languages, the first registered wins
+        self.assertIs(factory.check_valid_simple("Buffer<float>"), cpp)
+
+    def test_nested(self):
+        simple = make_entity("Simple", r"^float\*$")
+        nested = make_entity("Nested", r"^.*\*$", nested=True)
+        EntityFactory().register(simple, LanguageType.CPP)
+        EntityFactory().register(nested, LanguageType.CPP)
+        factory = EntityFactory()
+        self.assertIs(factory.check_valid(LanguageType.CPP, "float*"), simple)
+        self.assertIs(factory.check_valid(LanguageType.CPP, "Buffer*"), nested)
+        self.assertIsNone(factory.check_valid_simple("Buffer*"))
+        self.assertIsInstance(factory.build(FakeValue(), "Buffer*", "b"), nested)
+        with self.assertRaises(EntityBuildError):
+            factory.build_simple(FakeValue(), "Buffer*", "b")
+
+    def test_register_resets_caches(self):
+        factory = EntityFactory()
+        self.assertIsNone(factory.check_valid(LanguageType.CPP, "Buffer<float>"))
+        buffer = make_entity("Buffer", r"^Buffer<float>$")
+        factory.register(buffer, LanguageType.CPP)
+        self.assertIs(factory.check_valid(LanguageType.CPP, "Buffer<float>"), buffer)
+
+        # A class registered later has a lower priority, but is matched once the
+        # negative cache is reset
+        other = make_entity("Other", r"^Other$")
+        factory.register(other, LanguageType.CPP)
+        self.assertIs(factory.check_valid(LanguageType.CPP, "Buffer<float>"), buffer)
+        self.assertIs(factory.check_valid(LanguageType.CPP, "Other"), other)
+
+    def test_register_twice(self):
+        buffer = make_entity("Buffer", r"^Buffer<float>$")
+        EntityFactory().register(buffer, LanguageType.CPP)
+        with self.assertRaises(EntityBuildError):
+            EntityFactory().register(buffer, LanguageType.CPP)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+import re
+import struct
+import unittest
+from typing import Tuple
+
+from dave.common.sample_type import SampleType
+from dave.common.singleton import SingletonMeta
+from dave.server import formatter_cache
+from dave.server.container import Container2D
+from dave.server.debuggers.value import ReadBudget
+from dave.server.entity_factory import EntityFactory
+from dave.server.formatter_cache import FormatterCache
+from dave.server.language_type import LanguageType
+
+
+class FakeValue:
+    """
+    The subset of AbstractValue used by the formatter cache
+    """
+
+    def __init__(self, typename: str, address: int, memory: "FakeMemory") -> None:
+        self.__typename = typename
+        self.__address = address
+        self.memory = memory
+        self.address_calls = 0
+
+    def language(self) -> LanguageType:
+        return LanguageType.CPP
+
+    def typename(self) -> str:
+        return self.__typename
+
+    def address(self) -> int:
+        self.address_calls += 1
+        return self.__address
+
+
+class FakeMemory:
+    def __init__(self, channels: int, samples: int, interleaved: bool = False):
+        self.channels = channels
+        self.samples = samples
+        self.interleaved = interleaved
+        self.data = bytearray(
+            struct.pack(f"{channels * samples}f", *([0.5] * channels * samples))
+        )
+
+    def readmemory(self, addr: int, bytesize: int) -> bytearray:
+        budget = ReadBudget.active()
+        if budget is not None:
+            return budget.read(addr, bytesize, self.__read_range)
+        return self.__read_range(addr, bytesize)
+
+    def __read_range(self, addr: int, bytesize: int) -> bytearray:
+        return self.data[addr : addr + bytesize]
+
+
+class FakeBuffer(Container2D):
+    __REGEX = rf"^dave_test::Buffer<{SampleType.regex()}>$"
+
+    builds = 0
+
+    def __init__(self, dbg_value: FakeValue, name: str, _=[]):
+        FakeBuffer.builds += 1
+        self.__memory = dbg_value.memory
+        super().__init__(
+            dbg_value, name, SampleType.FLOAT, dbg_value.memory.interleaved
+        )
+
+    @classmethod
+    def typename_matcher(cls) -> re.Pattern:
+        return re.compile(cls.__REGEX)
+
+    @classmethod
+    def _parse_typename(cls, typename: str, **kwargs):
+        return (SampleType.FLOAT, None, None)
+
+    def shape(self) -> Tuple[int, int]:
+        memory = self.__memory
+        if memory.interleaved:
+            return (memory.samples, memory.channels)
+        return (memory.channels, memory.samples)
+
+    def read_from_debugger(self) -> bytearray:
+        # One read per channel, like most planar containers
+        memory = self.__memory
+        reads = 1 if memory.interleaved else memory.channels
+        size = len(memory.data) // reads
+        return b"".join(
+            memory.readmemory(channel * size, size) for channel in range(reads)
+        )
+
+
+if FakeBuffer not in EntityFactory().get_entities_cls_set():
+    FakeBuffer.register(LanguageType.CPP)
+
+TYPENAME = "dave_test::Buffer<float>"
+
+
+def build(value: FakeValue):
+    return lambda: EntityFactory().build(value, value.typename(), "")
+
+
+class TestFormatterCache(unittest.TestCase):
+    def setUp(self) -> None:
+        SingletonMeta._instances.pop(FormatterCache, None)
+        FakeBuffer.builds = 0
+
+    def tearDown(self) -> None:
+        SingletonMeta._instances.pop(FormatterCache, None)
+
+    def test_unmatched_types(self):
+        value = FakeValue("std::string", 0x1000, FakeMemory(1, 1))
+        self.assertIsNone(FormatterCache().get(value, build(value)))
+        # Rejected by the factory match, before asking for the address
+        self.assertEqual(value.address_calls, 0)
+
+    def test_same_stop(self):
+        FormatterCache().track_memory()
+        memory = FakeMemory(2, 16)
+        value = FakeValue(TYPENAME, 0x1000, memory)
+        first = FormatterCache().get(value, build(value))
+        second = FormatterCache().get(value, build(value))
+        self.assertIs(first, second)
+        self.assertEqual(FakeBuffer.builds, 1)
+        self.assertTrue(
+            first.summary.startswith("2 channels 16 samples, min 5.0000E-01")
+        )
+        self.assertEqual(first.sparklines(), ["[‾]"] * 2)
+
+    def test_new_stop(self):
+        memory = FakeMemory(2, 16)
+        value = FakeValue(TYPENAME, 0x1000, memory)
+        first = FormatterCache().get(value, build(value))
+
+        # Same content, the entry is reused
+        FormatterCache().new_stop()
+        self.assertIs(FormatterCache().get(value, build(value)), first)
+        self.assertEqual(FakeBuffer.builds, 2)
+
+        # Modified content
+        FormatterCache().new_stop()
+        memory.data[:4] = struct.pack("f", -1.0)
+        modified = FormatterCache().get(value, build(value))
+        self.assertIsNot(modified, first)
+        self.assertIn("min -1.0000E+00", modified.summary)
+
+    def test_memory_written_within_stop(self):
+        # Without memory write events (lldb), values are read on every call
+        memory = FakeMemory(1, 16)
+        value = FakeValue(TYPENAME, 0x1000, memory)
+        first = FormatterCache().get(value, build(value))
+        self.assertIs(FormatterCache().get(value, build(value)), first)
+        self.assertEqual(FakeBuffer.builds, 2)
+
+        # eg. "memory write" or "expr buf[0] = NAN"
+        memory.data[:4] = struct.pack("f", float("nan"))
+        modified = FormatterCache().get(value, build(value))
+        self.assertIsNot(modified, first)
+        self.assertIn("1 NaN", modified.summary)
+
+    def test_memory_write_events(self):
+        # With memory write events (gdb), values are read once per stop until
+        # the memory is written
+        FormatterCache().track_memory()
+        memory = FakeMemory(1, 16)
+        value = FakeValue(TYPENAME, 0x1000, memory)
+        first = FormatterCache().get(value, build(value))
+        self.assertIs(FormatterCache().get(value, build(value)), first)
+        self.assertEqual(FakeBuffer.builds, 1)
+
+        memory.data[:4] = struct.pack("f", float("nan"))
+        FormatterCache().new_stop()
+        self.assertIn("1 NaN", FormatterCache().get(value, build(value)).summary)
+
+    def test_shape_in_key(self):
+        # Same bytes and size, but different shapes
+        memory = FakeMemory(2, 16)
+        value = FakeValue(TYPENAME, 0x1000, memory)
+        stereo = FormatterCache().get(value, build(value))
+
+        FormatterCache().new_stop()
+        memory.channels, memory.samples = 4, 8
+        quad = FormatterCache().get(value, build(value))
+        self.assertIsNot(quad, stereo)
+        self.assertEqual(quad.channels, 4)
+
+        FormatterCache().new_stop()
+        memory.interleaved = True
+        interleaved = FormatterCache().get(value, build(value))
+        self.assertIsNot(interleaved, quad)
+        self.assertTrue(interleaved.summary.startswith("4 channels 8 samples"))
+
+    def test_null_address(self):
+        value = FakeValue(TYPENAME, 0, FakeMemory(1, 4))
+        first = FormatterCache().get(value, build(value))
+        second = FormatterCache().get(value, build(value))
+        self.assertIsNot(first, second)
+        self.assertEqual(first.summary, second.summary)
+        self.assertEqual(FakeBuffer.builds, 2)
+
+    def test_eviction(self):
+        SingletonMeta._instances.pop(FormatterCache, None)
+        cache = FormatterCache(3 * (1024 + 512))
+        entries = []
+        for i in range(4):
+            value = FakeValue(TYPENAME, 0x1000 * (i + 1), FakeMemory(1, 256))
+            entries.append(cache.get(value, build(value)))
+
+        cache.new_stop()
+        # The oldest entry was evicted, the most recent one is still there
+        value = FakeValue(TYPENAME, 0x4000, FakeMemory(1, 256))
+        self.assertIs(cache.get(value, build(value)), entries[3])
+        value = FakeValue(TYPENAME, 0x1000, FakeMemory(1, 256))
+        self.assertIsNot(cache.get(value, build(value)), entries[0])
+
+    def test_decimated(self):
+        budget = formatter_cache.FORMATTER_READ_BUDGET
+        formatter_cache.FORMATTER_READ_BUDGET = 1024
+        try:
+            memory = FakeMemory(2, 4096)
+            value = FakeValue(TYPENAME, 0x1000, memory)
+            first = FormatterCache().get(value, build(value))
+            self.assertTrue(first.summary.endswith(" (approximate)"))
+            self.assertIs(FormatterCache().get(value, build(value)), first)
+
+            # Read parts written within the stop
+            memory.data[:4] = struct.pack("f", -1.0)
+            modified = FormatterCache().get(value, build(value))
+            self.assertIsNot(modified, first)
+            memory.data[:4] = struct.pack("f", 0.5)
+            first = FormatterCache().get(value, build(value))
+
+            # The unread parts might have changed, decimated entries are not
+            # reused across stops
+            FormatterCache().new_stop()
+            self.assertIsNot(FormatterCache().get(value, build(value)), first)
+        finally:
+            formatter_cache.FORMATTER_READ_BUDGET = budget
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+import struct
+import unittest
+from unittest import mock
+
+from dave.common.sample_type import SampleType
+from dave.server.debuggers import value
+from dave.server.debuggers.value import ReadBudget
+from dave.server.sparkline import compute_sparklines
+
+FLOAT_SIZE = SampleType.FLOAT.byte_size()
+
+
+class Memory:
+    """
+    A fake process memory, where each float holds its own index
+    """
+
+    def __init__(self, size: int) -> None:
+        self.data = bytearray(struct.pack(f"{size}f", *range(size)))
+        self.reads = []
+
+    def read(self, addr: int, bytesize: int) -> bytearray:
+        self.reads.append((addr, bytesize))
+        return self.data[addr : addr + bytesize]
+
+
+def floats(data: bytearray):
+    return struct.unpack(f"{len(data) // FLOAT_SIZE}f", data)
+
+
+class TestReadBudget(unittest.TestCase):
+    def test_within_budget(self):
+        memory = Memory(1000)
+        with ReadBudget(4096, 4000, FLOAT_SIZE) as budget:
+            data = budget.read(0, 4000, memory.read)
+        self.assertEqual(data, memory.data)
+        self.assertFalse(budget.decimated)
+        self.assertIsNone(ReadBudget.active())
+
+    def test_decimated_regions(self):
+        memory = Memory(10000)
+        with ReadBudget(4000, 40000, FLOAT_SIZE, region_size=400) as budget:
+            self.assertIs(ReadBudget.active(), budget)
+            data = budget.read(0, 40000, memory.read)
+        self.assertTrue(budget.decimated)
+        self.assertLessEqual(len(data), 4000)
+        self.assertEqual(len(memory.reads), 10)
+        for addr, bytesize in memory.reads:
+            self.assertEqual(bytesize, 400)
+            self.assertLessEqual(addr + bytesize, 40000)
+        samples = floats(data)
+        self.assertEqual(list(samples[:100]), list(range(100)))
+        self.assertEqual(list(samples), sorted(samples))
+
+    def test_frame_alignment(self):
+        # Interleaved stereo, regions never split a frame
+        memory = Memory(10000)
+        with ReadBudget(4000, 40000, 2 * FLOAT_SIZE, region_size=401) as budget:
+            data = budget.read(0, 40000, memory.read)
+        for addr, bytesize in memory.reads:
+            self.assertEqual(addr % 8, 0)
+            self.assertEqual(bytesize % 8, 0)
+        self.assertTrue(all(int(sample) % 2 == 0 for sample in floats(data)[::2]))
+
+    def test_planar_channels(self):
+        # A single read of 3 contiguous channels, each one is decimated on its own
+        channels, samples = 3, 3000
+        memory = Memory(channels * samples)
+        total = channels * samples * FLOAT_SIZE
+        with ReadBudget(total // 10, total, FLOAT_SIZE, channels, region_size=400):
+            data = ReadBudget.active().read(0, total, memory.read)
+
+        self.assertEqual(len(data) % channels, 0)
+        channel_size = len(data) // channels
+        per_channel = [
+            floats(data[i * channel_size : (i + 1) * channel_size])
+            for i in range(channels)
+        ]
+        for channel, channel_samples in enumerate(per_channel):
+            # Regions stay within the channel, at the same offsets in every channel
+            self.assertTrue(
+                all(
+                    channel * samples <= sample < (channel + 1) * samples
+                    for sample in channel_samples
+                )
+            )
+            self.assertEqual(
+                [sample - channel * samples for sample in channel_samples],
+                list(per_channel[0]),
+            )
+
+    def test_planar_sparklines(self):
+        # Channel 0 is silent, channel 1 is full scale : a region crossing the
+        # boundary would leak channel 1 into the sparkline of channel 0
+        samples = 10000
+        data = struct.pack(f"{2 * samples}f", *([0.0] * samples + [1.0] * samples))
+        memory = bytearray(data)
+        total = len(memory)
+        with ReadBudget(total // 7, total, FLOAT_SIZE, 2, region_size=4000) as budget:
+            read = budget.read(0, total, lambda addr, size: memory[addr : addr + size])
+        sparklines = compute_sparklines(read, SampleType.FLOAT, 2, False)
+        self.assertTrue(sparklines[0].startswith("[0("))
+        self.assertNotIn("0", sparklines[1])
+
+    def test_timeout_equalizes_channels(self):
+        samples = 10000
+        channel_size = samples * FLOAT_SIZE
+        memory = Memory(2 * samples)
+        clock = iter(range(100))
+
+        # Each region takes 1s, the first channel reads 3 regions before the deadline
+        with mock.patch.object(value.time, "monotonic", lambda: next(clock)):
+            budget = ReadBudget(channel_size, 2 * channel_size, FLOAT_SIZE, 2, 2.5, 400)
+            with budget:
+                data = budget.read(0, channel_size, memory.read)
+                data += budget.read(channel_size, channel_size, memory.read)
+
+        self.assertTrue(budget.decimated)
+        self.assertEqual(len(data), 2 * 3 * 400)
+        self.assertEqual(budget.equalize(data), data)
+        first, second = floats(data[:1200]), floats(data[1200:])
+        self.assertEqual(len(first), len(second))
+        self.assertEqual([sample + samples for sample in first], list(second))
+
+    def test_equalize(self):
+        memory = Memory(20000)
+        clock = iter(range(100))
+        with mock.patch.object(value.time, "monotonic", lambda: next(clock)):
+            # 10 regions per channel, the deadline passes while reading the
+            # 4th region of the second channel
+            budget = ReadBudget(8000, 80000, FLOAT_SIZE, 2, 12.5, 400)
+            with budget:
+                data = budget.read(0, 80000, memory.read)
+        self.assertEqual(len(data), (10 + 4) * 400)
+
+        equalized = budget.equalize(data)
+        self.assertEqual(len(equalized), 2 * 4 * 400)
+        first, second = floats(equalized[:1600]), floats(equalized[1600:])
+        self.assertEqual(list(first), list(floats(data[:1600])))
+        self.assertEqual([sample + 10000 for sample in first], list(second))
+
+    def test_other_ranges(self):
+        # Ranges that are not whole channels are read entirely
+        memory = Memory(10000)
+        with ReadBudget(4000, 40000, FLOAT_SIZE, 2, region_size=400) as budget:
+            data = budget.read(0, 12, memory.read)
+        self.assertEqual(data, memory.data[:12])
+        self.assertFalse(budget.decimated)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import math
+import random
+import struct
+import unittest
+from typing import List
+from unittest import mock
+
+from dave.common.sample_type import SampleType
+from dave.server import sparkline
+from dave.server.sparkline import compute_sparkline, compute_sparklines
+
+INF = float("inf")
+NAN = float("nan")
+
+
+def pack(samples: List[float], sample_type: SampleType = SampleType.DOUBLE) -> bytes:
+    return struct.pack(f"{len(samples)}{sample_type.struct_fmt()}", *samples)
+
+
+def reference_sparkline(samples: List[float]) -> str:
+    """
+    The sample by sample sparkline the buckets must reproduce when they hold a
+    single sample
+    """
+    finite = [abs(s) for s in samples if math.isfinite(s)]
+    scale = max(finite, default=0.0) or 1.0
+    output = "["
+    num_zeros = 0
+    for i, sample in enumerate(samples):
+        if sample == 0.0:
+            if num_zeros == 0:
+                output += "0"
+            num_zeros += 1
+            continue
+        if num_zeros > 1:
+            output += f"({num_zeros})"
+        num_zeros = 0
+        if math.isinf(sample):
+            output += "I"
+        elif abs(sample) - 0.00000015 > 1.0:
+            output += "E"
+        elif math.isnan(sample):
+            output += "N"
+        elif (
+            i > 0
+            and not math.isnan(samples[i - 1])
+            and ((sample < 0) is not (samples[i - 1] < 0))
+        ):
+            output += "x"
+        else:
+            character = "_⎽⎼—⎻⎺‾"[int((sample / scale + 1) / 2.0 * 6.99)]
+            if output[-1] != character:
+                output += character
+    if num_zeros > 1:
+        output += f"({num_zeros})"
+    return output + "]"
+
+
+def random_samples(rng: random.Random, size: int) -> List[float]:
+    choices = [0.0, 0.0, 0.0, NAN, INF, -INF, 1.5, -2.0]
+    return [
+        rng.choice(choices) if rng.random() < 0.2 else rng.uniform(-1.0, 1.0)
+        for _ in range(size)
+    ]
+
+
+class SparklineTestCase(unittest.TestCase):
+    def assertSparkline(self, samples, expected, width=sparkline.SPARKLINE_WIDTH):
+        """
+        Checks both the numpy and the pure-python paths
+        """
+        data = pack(samples)
+        self.assertEqual(
+            compute_sparkline(data, SampleType.DOUBLE, 1, False, 0, width), expected
+        )
+        with mock.patch.object(sparkline, "np", None):
+            self.assertEqual(
+                compute_sparkline(data, SampleType.DOUBLE, 1, False, 0, width),
+                expected,
+            )
+
+
+class TestSparklineGlyphs(SparklineTestCase):
+    def test_glyphs(self):
+        self.assertSparkline([], "[]")
+        self.assertSparkline([1.0, -1.0, 0.0], "[‾x0]")
+        self.assertSparkline([0.5, 1.0, 0.5], "[⎺‾⎺]")
+        self.assertSparkline([INF, 1.5, NAN, -1.5, -INF], "[IENEI]")
+
+    def test_zero_runs(self):
+        # Runs are counted when they end, not only at the end of the buffer
+        self.assertSparkline([0.0, 0.0, 0.0, 1.0], "[0(3)‾]")
+        self.assertSparkline([1.0, 0.0, 0.0, 1.0, 0.0, 0.0], "[‾0(2)‾0(2)]")
+        # A single zero has no count
+        self.assertSparkline([1.0, 0.0, 1.0], "[‾0‾]")
+
+    def test_reference(self):
+        # With one sample per bucket, the output is the sample by sample one
+        rng = random.Random(0)
+        for i in range(200):
+            samples = random_samples(rng, rng.randint(1, 64))
+            with self.subTest(i=i):
+                self.assertSparkline(samples, reference_sparkline(samples), width=64)
+
+
+class TestSparklineBuckets(SparklineTestCase):
+    def test_width(self):
+        samples = [math.sin(i / 10) for i in range(10000)]
+        for width in (1, 8, 64):
+            with self.subTest(width=width):
+                line = compute_sparkline(
+                    pack(samples), SampleType.DOUBLE, 1, False, 0, width
+                )
+                self.assertLessEqual(len(line), width + 2)
+
+    def test_numpy_and_python(self):
+        rng = random.Random(1)
+        for i in range(100):
+            samples = random_samples(rng, rng.randint(1, 2000))
+            width = rng.choice([1, 7, 64, 128])
+            data = pack(samples)
+            expected = compute_sparkline(data, SampleType.DOUBLE, 1, False, 0, width)
+            with self.subTest(i=i):
+                self.assertSparkline(samples, expected, width)
+
+    def test_bucket_peak(self):
+        # A bucket without crossing is represented by its signed peak
+        self.assertSparkline([-0.1, -1.0, 0.2, 0.5, 1.0, 0.3], "[_x‾]", width=3)
+
+    def test_bucket_crossings(self):
+        # Crossings inside a bucket, a zero mean signal isn't drawn one-sided
+        self.assertSparkline([0.5, -0.5] * 64, "[xxxxxxxx]", width=8)
+        self.assertSparkline([0.1, -1.0, 0.2, 0.5, 1.0, 0.3], "[xx‾]", width=3)
+        # Crossings between buckets
+        self.assertSparkline([0.5, 0.5, -0.5, -0.5], "[‾x]", width=2)
+        # A NaN hides the crossings around it
+        self.assertSparkline([0.5, NAN, -0.5, -0.5], "[N_]", width=2)
+        self.assertSparkline([0.5, -0.5, NAN, 0.5], "[xN]", width=2)
+
+    def test_special_buckets(self):
+        # A bucket with an Inf or NaN shows it, a zero run counts its samples
+        self.assertSparkline([0.5, NAN, 0.5, 0.5, INF, 0.5], "[N‾I]", width=3)
+        self.assertSparkline([0.0] * 6 + [1.0] * 2, "[0(6)‾]", width=4)
+
+    def test_float(self):
+        samples = [math.sin(i / 10) for i in range(1000)]
+        self.assertEqual(
+            compute_sparkline(
+                pack(samples, SampleType.FLOAT), SampleType.FLOAT, 1, False, 0
+            ),
+            compute_sparkline(pack(samples), SampleType.DOUBLE, 1, False, 0),
+        )
+
+
+class TestSparklineChannels(unittest.TestCase):
+    def test_interleaved(self):
+        rng = random.Random(2)
+        left = random_samples(rng, 500)
+        right = random_samples(rng, 500)
+        planar = compute_sparklines(pack(left + right), SampleType.DOUBLE, 2, False)
+        interleaved = [sample for frame in zip(left, right) for sample in frame]
+        self.assertEqual(
+            compute_sparklines(pack(interleaved), SampleType.DOUBLE, 2, True), planar
+        )
+        with mock.patch.object(sparkline, "np", None):
+            self.assertEqual(
+                compute_sparklines(pack(interleaved), SampleType.DOUBLE, 2, True),
+                planar,
+            )
+
+    def test_channels(self):
+        data = pack([0.0] * 4 + [1.0, -1.0, 0.0, 0.0])
+        self.assertEqual(
+            compute_sparklines(data, SampleType.DOUBLE, 2, False),
+            ["[0(4)]", "[‾x0(2)]"],
+        )
+
+    def test_trailing_bytes(self):
+        data = pack([1.0, -1.0]) + b"\x00\x00"
+        self.assertEqual(
+            compute_sparklines(data, SampleType.DOUBLE, 1, False), ["[‾x]"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
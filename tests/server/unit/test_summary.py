@@ -0,0 +1,126 @@
+import math
+import random
+import struct
+import unittest
+from unittest import mock
+
+from dave.common.sample_type import SampleType
+from dave.server import summary
+from dave.server.summary import SummaryStatistics, compute_statistics
+
+INF = float("inf")
+NAN = float("nan")
+
+
+def pack(values, sample_type: SampleType) -> bytes:
+    fmt = sample_type.struct_fmt()[0]
+    if sample_type.is_complex():
+        values = [part for value in values for part in (value.real, value.imag)]
+    return struct.pack(f"{len(values)}{fmt}", *values)
+
+
+def compute_python(data: bytes, sample_type: SampleType, **kwargs):
+    with mock.patch.object(summary, "np", None):
+        return compute_statistics(data, sample_type, **kwargs)
+
+
+@unittest.skipIf(summary.np is None, "numpy is not available")
+class TestComputeStatistics(unittest.TestCase):
+    def assertSameStatistics(self, lhs: SummaryStatistics, rhs: SummaryStatistics):
+        for field in ("is_complex", "count", "finite", "nans", "infs", "denormals"):
+            self.assertEqual(getattr(lhs, field), getattr(rhs, field), field)
+        for field in ("min", "max", "peak", "rms", "dc"):
+            lhs_value, rhs_value = getattr(lhs, field), getattr(rhs, field)
+            if lhs_value is None or rhs_value is None:
+                self.assertIs(lhs_value, rhs_value, field)
+            elif isinstance(lhs_value, complex) or math.isfinite(lhs_value):
+                self.assertLess(
+                    abs(lhs_value - rhs_value), 1e-12 + 1e-9 * abs(rhs_value), field
+                )
+            else:
+                self.assertEqual(lhs_value, rhs_value, field)
+        self.assertEqual(lhs.describe(), rhs.describe())
+
+    def assertSamePaths(self, values, sample_type: SampleType, **kwargs):
+        data = pack(values, sample_type)
+        numpy_stats = compute_statistics(data, sample_type, **kwargs)
+        python_stats = compute_python(data, sample_type, **kwargs)
+        self.assertSameStatistics(numpy_stats, python_stats)
+        return numpy_stats
+
+    def test_real(self):
+        rng = random.Random(0)
+        values = [rng.uniform(-1.0, 1.0) for _ in range(1000)]
+        for sample_type in (SampleType.FLOAT, SampleType.DOUBLE):
+            with self.subTest(sample_type=sample_type):
+                self.assertSamePaths(values, sample_type)
+
+    def test_complex(self):
+        rng = random.Random(1)
+        values = [complex(rng.gauss(0, 1), rng.gauss(0, 1)) for _ in range(1000)]
+        for sample_type in (SampleType.CPX_F, SampleType.CPX_D):
+            with self.subTest(sample_type=sample_type):
+                stats = self.assertSamePaths(values, sample_type)
+                self.assertIsInstance(stats.dc, complex)
+                self.assertTrue(stats.describe().startswith("|min| "))
+
+    def test_chunks(self):
+        rng = random.Random(2)
+        values = [rng.uniform(-1.0, 1.0) for _ in range(1000)]
+        values[10], values[500], values[999] = NAN, INF, 1e-40
+        data = pack(values, SampleType.FLOAT)
+        whole = compute_statistics(data, SampleType.FLOAT)
+        for chunk_size in (1, 7, 64, 999):
+            with self.subTest(chunk_size=chunk_size):
+                chunked = self.assertSamePaths(
+                    values, SampleType.FLOAT, chunk_size=chunk_size
+                )
+                self.assertSameStatistics(whole, chunked)
+
+    def test_special_values(self):
+        for sample_type, denormal in (
+            (SampleType.FLOAT, 1e-40),
+            (SampleType.DOUBLE, 1e-310),
+        ):
+            with self.subTest(sample_type=sample_type):
+                values = [INF, 1.5, 0.25, NAN, -1.5, -INF, denormal, 0.0]
+                stats = self.assertSamePaths(values, sample_type)
+                self.assertEqual(stats.count, 8)
+                self.assertEqual(stats.finite, 5)
+                self.assertEqual(stats.nans, 1)
+                self.assertEqual(stats.infs, 2)
+                self.assertEqual(stats.denormals, 1)
+                # min and max keep the infinities, the other stats ignore them
+                self.assertEqual(stats.min, -INF)
+                self.assertEqual(stats.max, INF)
+                self.assertEqual(stats.peak, 1.5)
+                self.assertTrue(
+                    stats.describe().startswith("min -INF, max INF, peak 1.5000E+00")
+                )
+                self.assertTrue(stats.describe().endswith("1 NaN, 2 Inf, 1 denormal"))
+
+    def test_only_nans(self):
+        stats = self.assertSamePaths([NAN, NAN], SampleType.DOUBLE)
+        self.assertIsNone(stats.min)
+        self.assertIsNone(stats.rms)
+        self.assertEqual(stats.describe(), "2 NaN")
+
+    def test_only_infs(self):
+        stats = self.assertSamePaths([-INF, INF], SampleType.DOUBLE)
+        self.assertEqual(stats.finite, 0)
+        self.assertIsNone(stats.peak)
+        self.assertEqual(stats.describe(), "min -INF, max INF, 2 Inf")
+
+    def test_empty(self):
+        stats = self.assertSamePaths([], SampleType.FLOAT)
+        self.assertEqual(stats.count, 0)
+        self.assertEqual(stats.describe(), "")
+
+    def test_trailing_bytes(self):
+        data = pack([1.0, -1.0], SampleType.FLOAT) + b"\x00\x00"
+        self.assertEqual(compute_statistics(data, SampleType.FLOAT).count, 2)
+        self.assertEqual(compute_python(data, SampleType.FLOAT).count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
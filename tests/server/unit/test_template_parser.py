@@ -0,0 +1,113 @@
+import unittest
+
+import dave.common.server_type as st
+
+# The languages package needs to know which debugger it runs in
+if st.SERVER_TYPE is None:
+    st.SERVER_TYPE = st.ServerType.GDB
+
+from dave.server.languages.c_cpp.template_parser import (
+    TemplateType,
+    parse_template,
+    parse_type,
+)
+
+
+class TestParseType(unittest.TestCase):
+    def test_not_template(self):
+        parsed = parse_type("float")
+        self.assertFalse(parsed.is_template)
+        self.assertEqual(parsed, TemplateType("float", "float", (), ""))
+
+    def test_tree(self):
+        parsed = parse_type("std::__1::vector<float, std::__1::allocator<float> >")
+        self.assertTrue(parsed.is_template)
+        self.assertEqual(parsed.name, "std::__1::vector")
+        self.assertEqual(parsed.base_name, "std::vector")
+        self.assertEqual(
+            [arg.text for arg in parsed.args], ["float", "std::__1::allocator<float>"]
+        )
+        allocator = parsed.args[1]
+        self.assertEqual(allocator.name, "std::__1::allocator")
+        self.assertEqual(allocator.args, (TemplateType("float", "float", (), ""),))
+
+    def test_suffix(self):
+        parsed = parse_type("const std::vector<float> &")
+        self.assertEqual(parsed.name, "const std::vector")
+        self.assertEqual(parsed.suffix, "&")
+
+    def test_nested_template(self):
+        # The last argument list wins
+        parsed = parse_type("Outer<int>::Inner<float>")
+        self.assertEqual(parsed.name, "Outer<int>::Inner")
+        self.assertEqual([arg.text for arg in parsed.args], ["float"])
+
+    def test_opaque_brackets(self):
+        parsed = parse_type("std::function<float (int, std::pair<int, int>)>")
+        self.assertEqual(
+            [arg.text for arg in parsed.args], ["float (int, std::pair<int, int>)"]
+        )
+        parsed = parse_type("Foo<float[2], 3>")
+        self.assertEqual([arg.text for arg in parsed.args], ["float[2]", "3"])
+
+    def test_rust(self):
+        parsed = parse_type(
+            "alloc::boxed::Box<dyn Fn(f32) -> f32, alloc::alloc::Global>"
+        )
+        self.assertEqual(
+            [arg.text for arg in parsed.args],
+            ["dyn Fn(f32) -> f32", "alloc::alloc::Global"],
+        )
+
+    def test_empty_args(self):
+        self.assertEqual(parse_type("Foo<>").args, ())
+
+    def test_invalid(self):
+        for typename in (
+            "std::vector<float",
+            "std::vector<float>>",
+            "Foo<float(>",
+            "Foo)",
+        ):
+            with self.subTest(typename=typename):
+                with self.assertRaises(ValueError):
+                    parse_type(typename)
+
+    def test_memoized(self):
+        typename = "std::array<double, 32ul>"
+        first = parse_type(typename)
+        hits = parse_type.cache_info().hits
+        self.assertIs(parse_type(typename), first)
+        self.assertEqual(parse_type.cache_info().hits, hits + 1)
+
+
+class TestParseTemplate(unittest.TestCase):
+    def test_parse_template(self):
+        for typename, expected in (
+            ("float", ["float"]),
+            ("std::array<float, 16ul>", ["std::array", "float", "16ul"]),
+            (
+                "alloc::vec::Vec<f32, alloc::alloc::Global>",
+                ["alloc::vec::Vec", "f32", "alloc::alloc::Global"],
+            ),
+            (
+                "std::vector<std::array<float, 2ul>, std::allocator<std::array<float, 2ul> > >",
+                [
+                    "std::vector",
+                    "std::array<float,2ul>",
+                    "std::allocator<std::array<float,2ul>>",
+                ],
+            ),
+            ("std::vector<float>*", ["std::vector*", "float"]),
+            ("Outer<int>::Inner<float>::type", ["Outer<int>::Inner::type", "float"]),
+        ):
+            with self.subTest(typename=typename):
+                self.assertEqual(parse_template(typename), expected)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_template("std::vector<float")
+
+
+if __name__ == "__main__":
+    unittest.main()